@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends, status, Body
 from squirrel.squirrel_manager import SquirrelManager, SquirrelType
 from squirrel.squirrels import SquirrelException
 from squirrel.models.jobs_models import JobPosting, JobSearchQuery, Resume
+from squirrel.utils import track_cache_lookups
 from api.schemas import (
     ApiResponse, JobSearchRequest, JobFilterRequest, ResumeMatchRequest, CoverLetterRequest
 )
@@ -48,7 +49,8 @@ async def search_jobs(
         )
         
         # Search for jobs
-        jobs = squirrel.search_jobs(query)
+        with track_cache_lookups() as lookups:
+            jobs = await squirrel.asearch_jobs(query)
         
         # Apply filters if requested
         if apply_filters:
@@ -58,7 +60,7 @@ async def search_jobs(
             success=True,
             data=[job.to_dict() for job in jobs],
             source="jsearch",
-            cached=False  # Could track this from cache
+            cached=lookups.cached
         )
         
     except SquirrelException as e:
@@ -296,7 +298,7 @@ async def run_job_pipeline(
         }
         
         # Step 1: Search for jobs
-        jobs = squirrel.search_jobs(query)
+        jobs = await squirrel.asearch_jobs(query)
         results['jobs'] = [job.to_dict() for job in jobs]
         
         # Step 2: Filter jobs
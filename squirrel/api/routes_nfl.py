@@ -1,8 +1,13 @@
+import json
 import logging
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, Depends, status
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from squirrel.squirrel_manager import SquirrelManager, SquirrelType
 from squirrel.squirrels import SquirrelException, DataNotFoundException
+from squirrel.utils import track_cache_lookups
+from squirrel.config import SCOREBOARD_HEARTBEAT, PLAYER_SEARCH_MAX_LIMIT
 from api.schemas import (ApiResponse)
 from .dependencies import get_squirrel_manager
 
@@ -23,13 +28,14 @@ async def get_teams(
     """Get all NFL teams."""
     try:
         squirrel = manager.get_squirrel(SquirrelType.FOOLSBALL, source)
-        teams = squirrel.get_teams()
+        with track_cache_lookups() as lookups:
+            teams = await squirrel.aget_teams()
         
         return ApiResponse(
             success=True,
             data=[team.dict() for team in teams],
             source=squirrel.source,
-            cached=False  # Could track this from cache
+            cached=lookups.cached
         )
     except SquirrelException as e:
         logger.error(f"Error fetching teams: {e}")
@@ -43,7 +49,7 @@ async def get_teams(
     "/teams/{team_id}",
     response_model=ApiResponse,
     summary="Get specific team",
-    description="Fetches details for a specific NFL team."
+    description="Fetches details for a specific NFL team from the indexed team list."
 )
 async def get_team(
     team_id: str,
@@ -53,20 +59,17 @@ async def get_team(
     """Get specific team by ID."""
     try:
         squirrel = manager.get_squirrel(SquirrelType.FOOLSBALL, source)
-        teams = squirrel.get_teams()
-        
-        # Find the specific team
-        team = next((t for t in teams if t.id == team_id), None)
-        if not team:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Team {team_id} not found")
+        with track_cache_lookups() as lookups:
+            team = await squirrel.aget_team(team_id)
         
         return ApiResponse(
             success=True,
             data=team.dict(),
-            source=squirrel.source
+            source=squirrel.source,
+            cached=lookups.cached
         )
-    except HTTPException:
-        raise
+    except DataNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except SquirrelException as e:
         logger.error(f"Error fetching team {team_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -77,22 +80,39 @@ async def get_team(
     "/players",
     response_model=ApiResponse,
     summary="Get NFL players",
-    description="Fetches NFL players, optionally filtered by team. Data is cached for 5 minutes."
+    description=(
+        "Fetches NFL players, optionally filtered by team, position and name, "
+        "and paginated with limit/offset. Name search matches a prefix of the "
+        "full name or any word in it, plus close spellings with fuzzy=true. "
+        "Data is cached for 5 minutes."
+    )
 )
 async def get_players(
     team_id: Optional[str] = Query(None, description="Filter by team ID"),
+    name: Optional[str] = Query(None, min_length=1, description="Filter by name prefix (e.g. 'mahom')"),
+    position: Optional[str] = Query(None, description="Filter by position (e.g. QB)"),
+    fuzzy: bool = Query(False, description="Also match names close to `name` (typos, spelling variants)"),
+    limit: Optional[int] = Query(None, ge=1, le=PLAYER_SEARCH_MAX_LIMIT, description="Page size (all matches if not set)"),
+    offset: int = Query(0, ge=0, description="Number of matches to skip"),
     source: Optional[str] = Query(None, description="Data source to use"),
     manager: SquirrelManager = Depends(get_squirrel_manager)
 ):
     """Get NFL players."""
     try:
         squirrel = manager.get_squirrel(SquirrelType.FOOLSBALL, source)
-        players = squirrel.get_players(team_id)
+        with track_cache_lookups() as lookups:
+            if name or position:
+                players = await squirrel.asearch_players(name, team_id, position, fuzzy)
+            else:
+                players = await squirrel.aget_players(team_id)
         
+        page = players[offset:offset + limit if limit else None]
         return ApiResponse(
             success=True,
-            data=[player.dict() for player in players],
-            source=squirrel.source
+            data=[player.dict() for player in page],
+            source=squirrel.source,
+            cached=lookups.cached,
+            total=len(players)
         )
     except SquirrelException as e:
         logger.error(f"Error fetching players: {e}")
@@ -113,12 +133,14 @@ async def get_player(
     """Get specific player by ID."""
     try:
         squirrel = manager.get_squirrel(SquirrelType.FOOLSBALL, source)
-        player = squirrel.get_player(player_id)
+        with track_cache_lookups() as lookups:
+            player = await squirrel.aget_player(player_id)
         
         return ApiResponse(
             success=True,
             data=player.dict(),
-            source=squirrel.source
+            source=squirrel.source,
+            cached=lookups.cached
         )
     except DataNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -142,12 +164,14 @@ async def get_player_stats(
     """Get player statistics."""
     try:
         squirrel = manager.get_squirrel(SquirrelType.FOOLSBALL, source)
-        stats = squirrel.get_player_stats(player_id, season)
+        with track_cache_lookups() as lookups:
+            stats = await squirrel.aget_player_stats(player_id, season)
         
         return ApiResponse(
             success=True,
             data=stats.dict(),
-            source=squirrel.source
+            source=squirrel.source,
+            cached=lookups.cached
         )
     except DataNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -161,7 +185,10 @@ async def get_player_stats(
     "/scores",
     response_model=ApiResponse,
     summary="Get live scores",
-    description="Fetches live NFL game scores. Not cached - always returns fresh data."
+    description=(
+        "Fetches live NFL game scores. Scoreboards are reused for at most a few seconds "
+        "(per-source micro-cache) and concurrent requests share one upstream call."
+    )
 )
 async def get_scores(
     source: Optional[str] = Query(None, description="Data source to use"),
@@ -170,7 +197,8 @@ async def get_scores(
     """Get live game scores."""
     try:
         squirrel = manager.get_squirrel(SquirrelType.FOOLSBALL, source)
-        scores = squirrel.get_live_scores()
+        with track_cache_lookups() as lookups:
+            scores = await squirrel.aget_live_scores()
         
         # Convert GameScore objects to dictionaries (compatible with both Pydantic v1 and v2)
         scores_data = []
@@ -186,10 +214,66 @@ async def get_scores(
             success=True,
             data=scores_data,
             source=squirrel.source,
-            cached=False
+            cached=lookups.cached
         )
     except SquirrelException as e:
         logger.error(f"Error fetching scores: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.get(
+    "/scores/stream",
+    summary="Stream live scores (SSE)",
+    description=(
+        "Server-sent events: a 'snapshot' event with every game, then 'update' events "
+        "with only the games that changed. All clients share one upstream poller per source."
+    )
+)
+async def stream_scores(
+    request: Request,
+    source: Optional[str] = Query(None, description="Data source to use"),
+    manager: SquirrelManager = Depends(get_squirrel_manager)
+):
+    """Stream live game score changes as server-sent events."""
+    scoreboard = manager.get_scoreboard(source)
+    
+    async def events():
+        async with scoreboard.subscribe() as subscription:
+            while not subscription.closed:
+                message = await subscription.get(timeout=SCOREBOARD_HEARTBEAT)
+                if await request.is_disconnected():
+                    break
+                if message is None:
+                    # Comment line, keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(jsonable_encoder(message))}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/scores/ws")
+async def scores_websocket(
+    websocket: WebSocket,
+    source: Optional[str] = Query(None, description="Data source to use"),
+    manager: SquirrelManager = Depends(get_squirrel_manager)
+):
+    """Push live game score changes over a WebSocket (same messages as /scores/stream)."""
+    await websocket.accept()
+    scoreboard = manager.get_scoreboard(source)
+    try:
+        async with scoreboard.subscribe() as subscription:
+            while not subscription.closed:
+                message = await subscription.get(timeout=SCOREBOARD_HEARTBEAT)
+                if message is None:
+                    if not subscription.closed:
+                        await websocket.send_json({"type": "heartbeat"})
+                    continue
+                await websocket.send_json(jsonable_encoder(message))
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug("Scoreboard WebSocket client disconnected")
@@ -73,11 +73,15 @@ async def invalidate_cache(
     """Invalidate cache."""
     try:
         squirrel_type = SquirrelType(request.squirrel_type) if request.squirrel_type else None
-        manager.invalidate_cache(squirrel_type, request.source, request.cache_key)
+        manager.invalidate_cache(
+            squirrel_type, request.source, request.cache_key, request.tags
+        )
         
         message = "Cache invalidated"
         if request.cache_key:
             message += f" for key: {request.cache_key}"
+        elif request.tags:
+            message += f" for tags: {', '.join(request.tags)}"
         elif request.squirrel_type:
             message += f" for {request.squirrel_type}"
             if request.source:
@@ -18,6 +18,7 @@ class CacheInvalidationRequest(BaseModel):
     squirrel_type: Optional[str] = Field(None, description="Squirrel type to invalidate (all if not specified)")
     source: Optional[str] = Field(None, description="Specific source to invalidate")
     cache_key: Optional[str] = Field(None, description="Specific cache key to invalidate")
+    tags: Optional[List[str]] = Field(None, description="Only invalidate entries with any of these tags (e.g. team:12)")
 
 
 class PlayerStatsRequest(BaseModel):
@@ -35,6 +36,7 @@ class ApiResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now, description="Response timestamp")
     cached: bool = Field(False, description="Whether data was served from cache")
     source: Optional[str] = Field(None, description="Data source used")
+    total: Optional[int] = Field(None, description="Total matching items, for paginated lists")
 
 
 class TeamResponse(BaseModel):
@@ -0,0 +1,129 @@
+"""
+Stress the in-memory cache backends from many threads.
+
+Each worker thread hammers get/set/delete/invalidate_tags on a shared key
+space with short TTLs, while a reaper thread runs cleanup_expired, the way
+the event loop, threadpool and background refresh threads share a cache in
+the service. After every run the backend's bookkeeping (byte count, budget,
+tag index, expiry index) is checked, and throughput is reported relative to
+a single thread.
+
+On a GIL build of CPython only one thread runs Python code at a time, so
+expect throughput to stay roughly flat as threads are added; striping
+pays off on free-threaded builds, where the single lock is the bottleneck.
+
+Usage (from the squirrel service directory):
+    python -m benchmarks.bench_cache_concurrency
+"""
+import random
+import sys
+import threading
+import time
+
+from squirrel.utils.cache import InMemoryCache, StripedInMemoryCache
+
+
+def worker(cache, keys, duration, counts, errors, seed):
+    """Run a mixed workload until the deadline."""
+    rng = random.Random(seed)
+    ops = 0
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            for _ in range(100):
+                key = rng.choice(keys)
+                roll = rng.random()
+                if roll < 0.75:
+                    cache.get(key)
+                elif roll < 0.93:
+                    # Mix of TTLs so entries expire during the run
+                    ttl = rng.choice((0.001, 0.05, 5))
+                    cache.set(key, {"key": key, "payload": "x" * 64}, ttl, [f"team:{hash(key) % 32}"])
+                elif roll < 0.97:
+                    cache.get_many(rng.sample(keys, 8))
+                elif roll < 0.995:
+                    cache.delete(key)
+                else:
+                    cache.invalidate_tags([f"team:{rng.randrange(32)}"])
+            ops += 100
+    except Exception as e:
+        errors.append(e)
+    counts.append(ops)
+
+
+def reaper(cache, stop):
+    """Reap expired entries in small batches, like the service's reaper task."""
+    while not stop.is_set():
+        cache.cleanup_expired(max_items=500)
+        time.sleep(0.005)
+
+
+def check_invariants(cache):
+    """Verify a backend's bookkeeping survived concurrent use."""
+    shards = cache._shards if isinstance(cache, StripedInMemoryCache) else [cache]
+    for shard in shards:
+        entries = shard._cache
+        assert shard._bytes == sum(e["size"] for e in entries.values()), "byte count drifted"
+        if shard.max_entries is not None:
+            assert len(entries) <= shard.max_entries, "entry budget exceeded"
+        for tag, tagged in shard._tags.items():
+            for key in tagged:
+                assert key in entries and tag in entries[key]["tags"], f"stale tag index: {tag}"
+        heap_keys = {key for _, key in shard._expiry_heap}
+        assert set(entries) <= heap_keys, "entry missing from expiry index"
+
+
+def run(factory, threads, duration, key_space):
+    """Run one configuration and return (ops/s, stats)."""
+    cache = factory()
+    keys = [f"foolsball:player:{i}" for i in range(key_space)]
+    counts, errors = [], []
+    stop = threading.Event()
+    
+    reaper_thread = threading.Thread(target=reaper, args=(cache, stop), daemon=True)
+    workers = [
+        threading.Thread(target=worker, args=(cache, keys, duration, counts, errors, seed))
+        for seed in range(threads)
+    ]
+    reaper_thread.start()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    reaper_thread.join()
+    
+    if errors:
+        raise errors[0]
+    check_invariants(cache)
+    return sum(counts) / elapsed, cache.get_stats()
+
+
+def main(duration: float = 1.0, key_space: int = 5000, max_entries: int = 2000):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]} ({'GIL' if gil else 'free-threaded'})")
+    print(f"{key_space} keys, {max_entries} max entries, {duration}s per run\n")
+    
+    backends = {
+        "InMemoryCache": lambda: InMemoryCache(max_entries=max_entries),
+        "Striped (8 shards)": lambda: StripedInMemoryCache(8, max_entries=max_entries),
+        "Striped (32 shards)": lambda: StripedInMemoryCache(32, max_entries=max_entries),
+    }
+    for label, factory in backends.items():
+        print(label)
+        baseline = None
+        for threads in (1, 2, 4, 8, 16):
+            ops, stats = run(factory, threads, duration, key_space)
+            baseline = baseline or ops
+            print(
+                f"  {threads:>2} threads  {ops:>12,.0f} ops/s  x{ops / baseline:4.2f}  "
+                f"entries {stats['entries']:>5}  evictions {stats['evictions']:>7}  "
+                f"expirations {stats['expirations']:>7}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
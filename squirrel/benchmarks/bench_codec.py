@@ -0,0 +1,128 @@
+"""
+Benchmark cache codecs on realistic squirrel payloads.
+
+Compares the previous RedisCache serialization (json.dumps(default=str))
+with the typed msgpack codec, with and without compression.
+
+Usage (from the squirrel service directory):
+    python -m benchmarks.bench_codec
+"""
+import json
+import time
+from datetime import datetime
+
+from squirrel.models.foolsball_models import Player, Team
+from squirrel.models.jobs_models import JobPosting
+from squirrel.utils.codec import JsonCodec, create_codec
+
+
+def build_players(teams: int = 32, per_team: int = 53):
+    """Build a full-league roster payload."""
+    return [
+        Player(
+            id=f"{team}{n:03d}",
+            name=f"Player {team}-{n}",
+            display_name=f"P. {team}-{n}",
+            first_name="Player",
+            last_name=f"{team}-{n}",
+            team_id=str(team),
+            position=["QB", "RB", "WR", "TE", "OL", "DL", "LB", "CB", "S", "K"][n % 10],
+            jersey_number=str(n % 99),
+            headshot_url=f"https://a.espncdn.com/i/headshots/nfl/players/full/{team}{n:03d}.png"
+        )
+        for team in range(1, teams + 1)
+        for n in range(per_team)
+    ]
+
+
+def build_teams(count: int = 32):
+    """Build a teams payload."""
+    return [
+        Team(
+            id=str(i),
+            name=f"Team {i}",
+            abbreviation=f"T{i}",
+            display_name=f"City Team {i}",
+            location=f"City {i}",
+            color="000000",
+            alternate_color="ffffff",
+            logo_url=f"https://a.espncdn.com/i/teamlogos/nfl/500/t{i}.png"
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def build_jobs(count: int = 100):
+    """Build a job search payload."""
+    description = " ".join(["Build and operate Python services at scale."] * 40)
+    return [
+        JobPosting(
+            title=f"Python Developer {i}",
+            company=f"Company {i}",
+            description=description,
+            url=f"https://www.linkedin.com/jobs/view/{i}",
+            location="Chicago",
+            salary="$120,000 - $160,000",
+            date_posted=datetime.now().isoformat(),
+            employment_type="FULLTIME"
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_json_roundtrip(value):
+    """The serialization RedisCache used before codecs were pluggable."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def bench(label, encode, decode, value, iterations):
+    """Time encode/decode round trips and report payload size."""
+    payload = encode(value)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        payload = encode(value)
+    encode_time = (time.perf_counter() - start) / iterations
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = decode(payload)
+    decode_time = (time.perf_counter() - start) / iterations
+    
+    sample = result[0] if isinstance(result, list) and result else result
+    print(
+        f"  {label:<22} {len(payload):>10,} B  "
+        f"encode {encode_time * 1000:8.2f} ms  decode {decode_time * 1000:8.2f} ms  "
+        f"-> {type(sample).__name__}"
+    )
+
+
+def main(iterations: int = 20):
+    payloads = {
+        "players (all teams)": build_players(),
+        "teams": build_teams(),
+        "job search": build_jobs(),
+    }
+    codecs = {
+        "json (default=str)": (
+            lambda v: json.dumps(v, default=str).encode("utf-8"),
+            json.loads
+        ),
+        "json codec": JsonCodec(),
+        "msgpack": create_codec("msgpack"),
+        "msgpack + zstd": create_codec("msgpack", compression="zstd"),
+        "msgpack + zlib": create_codec("msgpack", compression="zlib"),
+    }
+    
+    for name, value in payloads.items():
+        print(f"{name} ({len(value)} items)")
+        for label, codec in codecs.items():
+            if isinstance(codec, tuple):
+                encode, decode = codec
+            else:
+                encode, decode = codec.encode, codec.decode
+            bench(label, encode, decode, value, iterations)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark the cold all-players fetch with and without roster fan-out.
+
+A cold ESPN get_players() makes one roster request per team. This runs
+it against a simulated upstream (fixed latency per request, no network)
+through the real cache, rate limiter and fan-out code, with the rosters
+fetched serially (max_concurrency 1) and fanned out at several limits,
+for both the blocking and the async accessors. It then checks that the
+fan-out never exceeds a tight rate limit and that a few failing teams
+only drop their own rosters.
+
+Usage (from the squirrel service directory):
+    python -m benchmarks.bench_fanout
+"""
+import asyncio
+import json
+import time
+
+from squirrel.squirrels import FoolsballSquirrel
+from squirrel.squirrels.base_squirrel import SquirrelException
+from squirrel.utils.rate_limiter import RateLimiter
+
+TEAMS = 32
+PLAYERS_PER_TEAM = 53
+
+
+class Response:
+    """Just enough of a response for the ESPN parsers."""
+    
+    def __init__(self, data):
+        self._data = data
+        self.status_code = 200
+        self.headers = {}
+        self.content = json.dumps(data).encode()
+    
+    def json(self):
+        return self._data
+
+
+class SimulatedSquirrel(FoolsballSquirrel):
+    """ESPN squirrel whose requests sleep for `latency` instead of going out."""
+    
+    def __init__(self, latency: float, max_concurrency: int, max_calls: int = 10_000,
+                 period: float = 1.0, failing=()):
+        super().__init__(source="espn")
+        self.latency = latency
+        self.failing = set(failing)
+        self.fanout.max_concurrency = max_concurrency
+        # One generous (or deliberately tight) limiter for every host
+        limiter = RateLimiter(max_calls, period)
+        for host in list(self.rate_limiters):
+            self.rate_limiters[host] = limiter
+        self.rate_limiter = limiter
+        self.request_times = []
+    
+    def _respond(self, url: str):
+        self.request_times.append(time.time())
+        if url.endswith('/teams'):
+            teams = [
+                {'team': {'id': str(i), 'displayName': f"Team {i}", 'abbreviation': f"T{i}"}}
+                for i in range(1, TEAMS + 1)
+            ]
+            return Response({'sports': [{'leagues': [{'teams': teams}]}]})
+        team_id = url.rstrip('/').split('/')[-2]
+        if team_id in self.failing:
+            raise SquirrelException(f"Request failed: simulated outage for team {team_id}")
+        athletes = [
+            {'id': f"{team_id}-{j}", 'fullName': f"Player {team_id}-{j}",
+             'position': {'abbreviation': 'WR'}}
+            for j in range(PLAYERS_PER_TEAM)
+        ]
+        return Response({'athletes': [{'items': athletes}]})
+    
+    def _send_request(self, url, method, headers, params, data, timeout):
+        time.sleep(self.latency)
+        return self._respond(url)
+    
+    async def _asend_request(self, url, method, headers, params, data, timeout):
+        await asyncio.sleep(self.latency)
+        return self._respond(url)
+
+
+async def aget_players(squirrel: SimulatedSquirrel):
+    try:
+        return await squirrel.aget_players()
+    finally:
+        # The async client can only be closed on the loop asyncio.run is about to close
+        await squirrel.async_http.aclose()
+
+
+def cold_fetch(squirrel: SimulatedSquirrel, use_async: bool):
+    squirrel.invalidate_cache()
+    start = time.perf_counter()
+    if use_async:
+        players = asyncio.run(aget_players(squirrel))
+    else:
+        players = squirrel.get_players()
+    return time.perf_counter() - start, players
+
+
+def speedup_benchmark(latency: float = 0.05, limits=(1, 4, 8, 16), rounds: int = 3):
+    print(f"Cold get_players(): {TEAMS} rosters, {latency * 1000:.0f} ms per request")
+    for use_async in (False, True):
+        baseline = None
+        for limit in limits:
+            squirrel = SimulatedSquirrel(latency, limit)
+            times = []
+            for _ in range(rounds):
+                elapsed, players = cold_fetch(squirrel, use_async)
+                times.append(elapsed)
+            squirrel.close()
+            best = min(times)
+            baseline = baseline or best
+            label = f"{'async' if use_async else 'sync'} {'serial' if limit == 1 else f'fan-out {limit}'}"
+            print(
+                f"  {label:<16} {best:6.3f}s  x{baseline / best:5.1f}  "
+                f"{len(players)} players  peak in flight {squirrel.fanout.peak_in_flight}"
+            )
+    print()
+
+
+def rate_limit_benchmark(latency: float = 0.02, max_calls: int = 8, period: float = 0.5):
+    print(f"Rate limit: fan-out 16 through {max_calls} calls / {period}s")
+    squirrel = SimulatedSquirrel(latency, 16, max_calls, period)
+    elapsed, players = cold_fetch(squirrel, use_async=False)
+    squirrel.close()
+    sent = sorted(squirrel.request_times)
+    worst = 0
+    start = 0
+    for end, sent_at in enumerate(sent):
+        # Requests are stamped after the simulated latency, so allow a little slack
+        while sent_at - sent[start] >= period - latency:
+            start += 1
+        worst = max(worst, end - start + 1)
+    ideal = (len(sent) - max_calls) / max_calls * period
+    print(f"  {len(sent)} requests in {elapsed:.2f}s (ideal {ideal:.2f}s), {len(players)} players")
+    print(f"  max requests in any {period}s window: {worst} (limit {max_calls}) "
+          f"{'OK' if worst <= max_calls else 'EXCEEDED'}")
+    print()
+
+
+def partial_failure_benchmark(latency: float = 0.02, failing=("3", "17", "30")):
+    print(f"Partial failure: rosters for teams {list(failing)} fail")
+    for use_async in (False, True):
+        squirrel = SimulatedSquirrel(latency, 8, failing=failing)
+        elapsed, players = cold_fetch(squirrel, use_async)
+        squirrel.close()
+        teams = {player.team_id for player in players}
+        expected = TEAMS - len(failing)
+        print(
+            f"  {'async' if use_async else 'sync':<6} {elapsed:6.3f}s  {len(players)} players "
+            f"from {len(teams)} teams (expected {expected}) "
+            f"{'OK' if len(teams) == expected else 'WRONG'}"
+        )
+    print()
+
+
+def main():
+    speedup_benchmark()
+    rate_limit_benchmark()
+    partial_failure_benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Benchmark the rate limiter under throttling.
+
+Measures event-loop lag (how late a 5 ms ticker wakes up) while many tasks
+are throttled, waiting with the blocking wait_if_needed() on the loop (what
+the async routes used to do) versus the non-blocking acquire(). Then, for
+each algorithm, checks that a mix of threads and tasks stays within the
+limit and that tasks are granted slots in the order they asked for them,
+compares the per-call cost and memory of each algorithm at a large
+max_calls, and measures how long live and interactive calls wait while a
+background flood saturates the limiter, with and without priority lanes.
+
+Usage (from the squirrel service directory):
+    python -m benchmarks.bench_rate_limiter
+"""
+import asyncio
+import threading
+import time
+import tracemalloc
+
+from squirrel.utils.rate_limiter import (
+    ALGORITHMS, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_LIVE, RateLimiter
+)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+
+async def measure_lag(workload, tick: float = 0.005):
+    """Run a workload while sampling how late a periodic ticker wakes up."""
+    lags = []
+    done = asyncio.Event()
+    
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(tick)
+            lags.append(time.perf_counter() - start - tick)
+    
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await workload()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return elapsed, lags
+
+
+def lag_benchmark(tasks: int = 50, max_calls: int = 10, period: float = 1.0):
+    print(f"Event-loop lag: {tasks} tasks through {max_calls} calls / {period}s")
+    
+    async def blocking():
+        limiter = RateLimiter(max_calls, period)
+        
+        async def call():
+            limiter.wait_if_needed()
+            await asyncio.sleep(0)
+        await asyncio.gather(*(call() for _ in range(tasks)))
+    
+    async def non_blocking():
+        limiter = RateLimiter(max_calls, period)
+        
+        async def call():
+            await limiter.acquire()
+            await asyncio.sleep(0)
+        await asyncio.gather(*(call() for _ in range(tasks)))
+    
+    for label, workload in (("wait_if_needed", blocking), ("acquire", non_blocking)):
+        elapsed, lags = asyncio.run(measure_lag(workload))
+        print(
+            f"  {label:<15} {elapsed:6.2f}s  ticks {len(lags):>4}  "
+            f"lag p50 {percentile(lags, 50) * 1000:8.2f} ms  "
+            f"p99 {percentile(lags, 99) * 1000:8.2f} ms  max {max(lags) * 1000:8.2f} ms"
+        )
+    print()
+
+
+def check_limit(grants, max_calls, period):
+    """Largest number of grants inside any window of the given length."""
+    grants = sorted(grants)
+    worst = 0
+    start = 0
+    for end, grant in enumerate(grants):
+        # Tolerance for the clock reads around a reservation, which drift
+        # apart by a few ms when threads contend for the GIL
+        while grant - grants[start] >= period - 0.01:
+            start += 1
+        worst = max(worst, end - start + 1)
+    return worst
+
+
+def correctness_benchmark(algorithm: str, threads: int = 8, tasks: int = 40,
+                          calls_each: int = 5, max_calls: int = 20, period: float = 0.5):
+    total = (threads + tasks) * calls_each
+    print(f"Correctness ({algorithm}): {threads} threads + {tasks} tasks, {total} calls "
+          f"through {max_calls} calls / {period}s")
+    limiter = RateLimiter(max_calls, period, algorithm)
+    # Slot start times (request time plus time waited), free of wake-up jitter
+    grants = []
+    grants_lock = threading.Lock()
+    task_slots = []
+    
+    def thread_worker():
+        for _ in range(calls_each):
+            requested = time.time()
+            waited = limiter.wait_if_needed()
+            with grants_lock:
+                grants.append(requested + waited)
+    
+    async def task_worker():
+        for _ in range(calls_each):
+            requested = time.time()
+            waited = await limiter.acquire()
+            with grants_lock:
+                grants.append(requested + waited)
+            task_slots.append((requested, requested + waited))
+    
+    async def run_tasks():
+        await asyncio.gather(*(task_worker() for _ in range(tasks)))
+    
+    start = time.perf_counter()
+    workers = [threading.Thread(target=thread_worker) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    asyncio.run(run_tasks())
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    
+    worst = check_limit(grants, max_calls, period)
+    expected = (total - max_calls) / max_calls * period
+    # Bucket algorithms allow a burst on top of the average rate
+    limit = max_calls if algorithm == 'sliding_window' else 2 * max_calls - 1
+    
+    # A task that asked earlier must never get a later slot
+    task_slots.sort()
+    fifo = all(
+        earlier[1] <= later[1] + 1e-3
+        for earlier, later in zip(task_slots, task_slots[1:])
+    )
+    
+    print(f"  {len(grants)} calls in {elapsed:.2f}s (ideal {expected:.2f}s)")
+    print(f"  max calls in any {period}s window: {worst} (limit {limit}) "
+          f"{'OK' if worst <= limit else 'EXCEEDED'}")
+    print(f"  tasks granted in request order: {'OK' if fifo else 'NO'}")
+    print(f"  stats: {limiter.get_stats()}")
+    print()
+
+
+def cost_benchmark(max_calls: int = 100_000, period: float = 3600, calls: int = 100_000):
+    print(f"Cost: {calls:,} calls through {max_calls:,} calls / {period:.0f}s (never throttled)")
+    for algorithm in ALGORITHMS:
+        limiter = RateLimiter(max_calls, period, algorithm)
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(calls):
+            limiter.wait_if_needed()
+            limiter.can_proceed()
+        elapsed = time.perf_counter() - start
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"  {algorithm:<15} {elapsed / calls * 1e6:8.2f} us/call  "
+            f"state {memory / 1024:10.1f} KiB"
+        )
+    print()
+
+
+def priority_benchmark(algorithm: str, background: int = 60, max_calls: int = 20,
+                       period: float = 1.0, probes: int = 10):
+    print(f"Priority lanes ({algorithm}): {background} background calls flood "
+          f"{max_calls} calls / {period}s, then live and interactive probes arrive")
+    lanes = {PRIORITY_INTERACTIVE: 0.2, PRIORITY_LIVE: 0.3, PRIORITY_BACKGROUND: 0.0}
+    
+    async def run(limiter):
+        waits = {PRIORITY_LIVE: [], PRIORITY_INTERACTIVE: []}
+        
+        async def probe(lane, delay):
+            await asyncio.sleep(delay)
+            waits[lane].append(await limiter.acquire(lane))
+        
+        flood = [limiter.acquire(PRIORITY_BACKGROUND) for _ in range(background)]
+        # Probes arrive after the flood has taken the budget, spread over a period
+        probing = [
+            probe(lane, 0.05 + i * period / probes)
+            for i in range(probes) for lane in waits
+        ]
+        start = time.perf_counter()
+        await asyncio.gather(*flood, *probing)
+        return time.perf_counter() - start, waits
+    
+    for label, lane_config in (("single queue", None), ("lanes", lanes)):
+        elapsed, waits = asyncio.run(run(RateLimiter(max_calls, period, algorithm, lanes=lane_config)))
+        summary = "  ".join(
+            f"{lane} p50 {percentile(values, 50) * 1000:7.1f} ms max {max(values) * 1000:7.1f} ms"
+            for lane, values in waits.items()
+        )
+        print(f"  {label:<13} {elapsed:5.2f}s  {summary}")
+    print()
+
+
+def main():
+    lag_benchmark()
+    for algorithm in ALGORITHMS:
+        correctness_benchmark(algorithm)
+    cost_benchmark()
+    for algorithm in ALGORITHMS:
+        priority_benchmark(algorithm)
+
+
+if __name__ == "__main__":
+    main()
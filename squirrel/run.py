@@ -47,6 +47,8 @@ async def startup_event():
         cache_enabled=True,
         rate_limit_enabled=True
     )
+    squirrel_manager.cache_reaper.start()
+    squirrel_manager.cache_warmer.start()
     logger.info("Squirrel manager initialized")
 
 
@@ -57,7 +59,9 @@ async def shutdown_event():
     
     logger.info("Shutting down squirrel service...")
     if squirrel_manager:
-        squirrel_manager.close_all()
+        await squirrel_manager.cache_reaper.stop()
+        await squirrel_manager.cache_warmer.stop()
+        await squirrel_manager.aclose_all()
     logger.info("Squirrel service shutdown complete")
 
 
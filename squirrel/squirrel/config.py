@@ -13,6 +13,55 @@ RETRY_DELAY = 2  # seconds
 # Rate limiting settings
 RATE_LIMIT_CALLS = 10  # max calls
 RATE_LIMIT_PERIOD = 60  # per period in seconds
+# token_bucket, gcra or sliding_window. The buckets let lower priority lanes use
+# the whole refill rate once the higher lanes' reserve is held back; a sliding
+# window can only hold the reserve by leaving slots idle, so it caps each lower
+# lane at its ceiling per period (e.g. background at 5 of 10 calls per minute)
+RATE_LIMIT_ALGORITHM = os.getenv("RATE_LIMIT_ALGORITHM", "token_bucket").lower()
+
+# Share rate limits across replicas through a Redis token bucket per upstream host
+# (uses REDIS_HOST/REDIS_PORT/REDIS_DB; falls back to local limiting if Redis is down)
+RATE_LIMIT_DISTRIBUTED = os.getenv("RATE_LIMIT_DISTRIBUTED", "false").lower() == "true"
+RATE_LIMIT_KEY_PREFIX = os.getenv("RATE_LIMIT_KEY_PREFIX", "squirrel:ratelimit:")
+RATE_LIMIT_REDIS_TIMEOUT = 0.25  # seconds; keeps requests moving when Redis hangs
+RATE_LIMIT_REDIS_RETRY_INTERVAL = 5  # seconds of local limiting before retrying Redis
+
+# Priority lanes, highest first, with the share of each host's budget reserved
+# for them: lower lanes can never use capacity reserved for higher ones, so
+# bulk work (SWR refreshes, warmup) can't starve user or live-score requests
+# (see RATE_LIMIT_ALGORITHM for how the reserve is held)
+RATE_LIMIT_LANES: Dict[str, float] = {
+    "interactive": 0.2,  # user requests (default)
+    "live": 0.3,  # live score polling
+    "background": 0.0,  # cache refreshes and warmup
+}
+
+# Per-upstream-host budgets. Each host gets its own rate limiter and HTTP
+# connection pool, so a slow or throttled host can't use up another host's
+# budget. Hosts not listed use RATE_LIMIT_CALLS/RATE_LIMIT_PERIOD and
+# HTTP_POOL_MAXSIZE; a host entry may also override "lanes".
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))  # connections kept alive per host
+UPSTREAM_HOSTS: Dict[str, Dict[str, int]] = {
+    "site.api.espn.com": {"max_calls": 10, "period": 60, "pool_maxsize": 10},  # teams, rosters, scoreboard
+    "sports.core.api.espn.com": {"max_calls": 10, "period": 60, "pool_maxsize": 10},  # player stats
+    "api.nfl.com": {"max_calls": 10, "period": 60, "pool_maxsize": 10},
+    "jsearch.p.rapidapi.com": {"max_calls": 5, "period": 60, "pool_maxsize": 4},
+    "api.openai.com": {"max_calls": 20, "period": 60, "pool_maxsize": 4},
+}
+
+# Async HTTP transport (httpx) for async request handlers; falls back to the
+# blocking session in worker threads if disabled or httpx is not installed.
+# Hosts in UPSTREAM_HOSTS are capped at their pool_maxsize requests in flight.
+HTTP_ASYNC_ENABLED = os.getenv("HTTP_ASYNC_ENABLED", "true").lower() == "true"
+HTTP_ASYNC_HTTP2 = os.getenv("HTTP_ASYNC_HTTP2", "true").lower() == "true"  # needs the h2 package
+HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", 100))
+HTTP_ASYNC_MAX_KEEPALIVE = int(os.getenv("HTTP_ASYNC_MAX_KEEPALIVE", 20))  # idle connections kept open
+HTTP_ASYNC_KEEPALIVE_EXPIRY = 30  # seconds
+
+# Multi-key fetches (e.g. every team's roster) run up to this many upstream
+# calls at once. Keep it at or below the host's pool_maxsize so the blocking
+# session doesn't open and discard extra connections.
+FANOUT_MAX_CONCURRENCY = int(os.getenv("FANOUT_MAX_CONCURRENCY", 8))
 
 # Cache settings (TTL in seconds)
 CACHE_TTL_TEAM_DATA = 86400  # 24 hours - team data changes infrequently
@@ -20,12 +69,68 @@ CACHE_TTL_PLAYER_DATA = 300  # 5 minutes - player data updates frequently
 CACHE_TTL_JOB_DATA = 3600  # 1 hour - job data updates regularly
 CACHE_TTL_DEFAULT = 3600  # 1 hour - default cache
 
+# Stale-while-revalidate / stale-if-error windows past the TTL (seconds)
+# Within stale-while-revalidate, stale data is served while a background refresh runs.
+# Within stale-if-error, stale data is served only if the upstream request fails.
+CACHE_STALE_WHILE_REVALIDATE_TEAM_DATA = 3600  # 1 hour
+CACHE_STALE_IF_ERROR_TEAM_DATA = 86400  # 24 hours
+CACHE_STALE_WHILE_REVALIDATE_PLAYER_DATA = 120  # 2 minutes
+CACHE_STALE_IF_ERROR_PLAYER_DATA = 3600  # 1 hour
+CACHE_REFRESH_WORKERS = 4  # background refresh threads per cache
+
+# In-memory cache budget (per Cache instance)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))  # 64 MB
+CACHE_EVICTION_POLICY = os.getenv("CACHE_EVICTION_POLICY", "lru").lower()  # lru or lfu
+CACHE_SHARDS = int(os.getenv("CACHE_SHARDS", 1))  # >1 splits the in-memory tier into locked shards
+
+# Background reaper for expired in-memory cache entries
+CACHE_REAPER_INTERVAL = int(os.getenv("CACHE_REAPER_INTERVAL", 30))  # seconds
+CACHE_REAPER_BATCH_SIZE = 500  # entries per batch before yielding to the event loop
+
+# Cache warmup: prefetch hot key sets on startup and/or on a cron schedule
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+WARMUP_SCHEDULE = os.getenv("WARMUP_SCHEDULE") or None  # cron, e.g. "0 8 * * 0" (Sundays 08:00)
+WARMUP_KEY_SETS = tuple(
+    name.strip() for name in os.getenv("WARMUP_KEY_SETS", "teams,players").split(",") if name.strip()
+)
+WARMUP_RATE_LIMIT_HEADROOM = float(os.getenv("WARMUP_RATE_LIMIT_HEADROOM", 0.2))  # budget kept for live requests
+
+# Live scoreboard streaming: one poller per source, running while clients are subscribed
+SCOREBOARD_LIVE_INTERVAL = float(os.getenv("SCOREBOARD_LIVE_INTERVAL", 10))  # seconds, while a game is in progress
+SCOREBOARD_IDLE_INTERVAL = float(os.getenv("SCOREBOARD_IDLE_INTERVAL", 120))  # seconds, otherwise
+SCOREBOARD_QUEUE_SIZE = 32  # messages buffered per client before it is resynced with a snapshot
+SCOREBOARD_HEARTBEAT = 15  # seconds between keepalives on idle SSE/WebSocket streams
+
 # Redis settings (optional - falls back to in-memory cache)
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
 USE_REDIS = os.getenv("USE_REDIS", "false").lower() == "true"
 
+# Persistent SQLite cache behind the in-memory cache, used when Redis is off.
+# Entries survive restarts and are shared by worker processes on the same host.
+USE_DISK_CACHE = os.getenv("USE_DISK_CACHE", "false").lower() == "true"
+CACHE_DISK_PATH = os.getenv("CACHE_DISK_PATH", ".cache/squirrel.sqlite3")
+
+# Two-tier cache: bounded in-process L1 in front of Redis (requires USE_REDIS)
+CACHE_TIERED = os.getenv("CACHE_TIERED", "false").lower() == "true"
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 1000))
+CACHE_L1_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", 16 * 1024 * 1024))  # 16 MB
+CACHE_L1_MAX_TTL = int(os.getenv("CACHE_L1_MAX_TTL", 60))  # seconds
+CACHE_INVALIDATION_CHANNEL = "squirrel:cache:invalidate"
+
+# Redis value serialization
+CACHE_CODEC = os.getenv("CACHE_CODEC", "msgpack").lower()  # msgpack or json
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zstd").lower() or None  # zstd, lz4, zlib
+CACHE_COMPRESSION_THRESHOLD = 1024  # bytes; smaller payloads are stored uncompressed
+CACHE_CODEC_TRUSTED_MODULES = ("squirrel.models",)  # types the codec may restore
+
+# Redis key layout and tag invalidation
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "squirrel:")
+CACHE_TAG_TTL = int(os.getenv("CACHE_TAG_TTL", "172800"))  # 48 hours; tag sets outlive their keys
+CACHE_REDIS_MAX_CONNECTIONS = int(os.getenv("CACHE_REDIS_MAX_CONNECTIONS", "50"))  # async pool size
+
 # NFL Data sources
 NFL_DATA_SOURCES = {
     "espn": {
@@ -42,6 +147,18 @@ NFL_DATA_SOURCES = {
 # Default data source
 DEFAULT_NFL_SOURCE = "espn"
 
+# Live scores micro-cache per source: a scoreboard is reused for this many
+# seconds (1-3 keeps scores current) and concurrent requests share one
+# upstream call. 0 keeps only the request collapsing.
+SCORES_MICRO_CACHE_TTL: Dict[str, float] = {
+    "espn": float(os.getenv("SCORES_MICRO_CACHE_TTL_ESPN", 2)),
+    "nfl": float(os.getenv("SCORES_MICRO_CACHE_TTL_NFL", 2)),
+}
+
+# Player search over the in-memory roster index
+PLAYER_SEARCH_FUZZY_CUTOFF = float(os.getenv("PLAYER_SEARCH_FUZZY_CUTOFF", 0.75))  # name similarity 0-1
+PLAYER_SEARCH_MAX_LIMIT = 500  # largest page /players returns
+
 # Job Search API settings
 JSEARCH_API_KEY = os.getenv("JSEARCH_API_KEY", "")
 JSEARCH_API_HOST = "jsearch.p.rapidapi.com"
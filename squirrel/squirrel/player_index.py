@@ -0,0 +1,262 @@
+"""
+In-memory player and team index for squirrel service.
+Materializes cached rosters into lookups by ID, team, position and
+normalized name, so team lookups are O(1) and player searches (prefix or
+fuzzy on name) never scan or download every roster per request.
+"""
+import difflib
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from .models.foolsball_models import Team, Player
+
+logger = logging.getLogger(__name__)
+
+# Dropped from names (D'Andre -> dandre, St. Brown -> st brown); other punctuation splits words
+_DROPPED_CHARS = re.compile(r"['’.]")
+_SEPARATORS = re.compile(r"[^\w]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name for matching: lowercase, accents and punctuation stripped.
+    
+    Args:
+        name: Player name or search query
+    
+    Returns:
+        Space-separated lowercase words (e.g. "Amon-Ra St. Brown" -> "amon ra st brown")
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    stripped = _DROPPED_CHARS.sub('', stripped.lower())
+    return ' '.join(_SEPARATORS.sub(' ', stripped).split())
+
+
+def _name_keys(player: Player) -> List[str]:
+    """
+    Search keys for a player: the normalized full name and every word suffix
+    of it, so "mahomes" finds "patrick mahomes" by prefix.
+    """
+    keys = set()
+    for name in (player.display_name, player.name):
+        words = normalize_name(name or '').split()
+        keys.update(' '.join(words[i:]) for i in range(len(words)))
+    return sorted(keys)
+
+
+class _IndexView:
+    """Immutable lookups over one snapshot of the indexed rosters."""
+    
+    def __init__(self, players: List[Player]):
+        self.players = players
+        self.by_id: Dict[str, Player] = {}
+        self.by_team: Dict[str, List[Player]] = {}
+        self.by_position: Dict[str, List[Player]] = {}
+        names: List[Tuple[str, int]] = []
+        
+        for ordinal, player in enumerate(players):
+            self.by_id.setdefault(player.id, player)
+            self.by_team.setdefault(player.team_id or '', []).append(player)
+            if player.position:
+                self.by_position.setdefault(player.position.upper(), []).append(player)
+            names.extend((key, ordinal) for key in _name_keys(player))
+        
+        # Sorted (key, player ordinal) pairs, kept as parallel lists for bisect
+        names.sort()
+        self.name_keys = [key for key, _ in names]
+        self.name_ordinals = [ordinal for _, ordinal in names]
+        self.unique_name_keys = list(dict.fromkeys(self.name_keys))
+    
+    def prefix_matches(self, prefix: str) -> List[int]:
+        """Ordinals of players with a name key starting with prefix, in key order."""
+        matches = []
+        start = bisect_left(self.name_keys, prefix)
+        for position in range(start, len(self.name_keys)):
+            if not self.name_keys[position].startswith(prefix):
+                break
+            matches.append(self.name_ordinals[position])
+        return matches
+    
+    def fuzzy_matches(self, query: str, limit: int, cutoff: float) -> List[int]:
+        """Ordinals of players with a name key close to query, best match first."""
+        matches = []
+        for key in difflib.get_close_matches(query, self.unique_name_keys, limit, cutoff):
+            start = bisect_left(self.name_keys, key)
+            position = start
+            while position < len(self.name_keys) and self.name_keys[position] == key:
+                matches.append(self.name_ordinals[position])
+                position += 1
+        return matches
+
+
+class PlayerIndex:
+    """
+    Player and team lookups materialized from cached rosters.
+    
+    Rosters are indexed as they come out of the cache, keyed by team. A
+    roster whose version (content digest, or the same list object) is
+    unchanged is skipped, so indexing a warm all-players request costs one
+    comparison per team. The lookup structures are rebuilt lazily, on the
+    first query after a roster changed, and swapped in whole so readers
+    always see a consistent snapshot.
+    """
+    
+    def __init__(self, fuzzy_cutoff: float = 0.75, fuzzy_limit: int = 25):
+        """
+        Initialize player index.
+        
+        Args:
+            fuzzy_cutoff: Minimum difflib similarity (0-1) for a fuzzy name match
+            fuzzy_limit: Maximum distinct names a fuzzy search expands to
+        """
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.fuzzy_limit = fuzzy_limit
+        self._lock = threading.Lock()
+        
+        self._teams_source: Optional[List[Team]] = None
+        self._teams: Dict[str, Team] = {}
+        # team ID -> (version, players)
+        self._rosters: Dict[str, Tuple[Any, List[Player]]] = {}
+        self._players_source: Optional[List[Player]] = None
+        self._view: Optional[_IndexView] = None
+        
+        self.builds = 0
+        self.build_time = 0.0
+        self.roster_updates = 0
+    
+    def index_teams(self, teams: List[Team]):
+        """Index the team list (skipped if it is the list already indexed)."""
+        if teams is self._teams_source:
+            return
+        indexed = {team.id: team for team in teams}
+        with self._lock:
+            if list(indexed) != list(self._teams):
+                # Player order follows team order
+                self._view = None
+            self._teams = indexed
+            self._teams_source = teams
+    
+    def team(self, team_id: str) -> Optional[Team]:
+        """Look up an indexed team by ID."""
+        return self._teams.get(team_id)
+    
+    def index_roster(self, team_id: str, players: List[Player], version: Any = None) -> bool:
+        """
+        Index one team's roster.
+        
+        Args:
+            team_id: Team ID
+            players: The team's players
+            version: Roster content version (e.g. digest); None compares by identity
+        
+        Returns:
+            True if the roster changed and was re-indexed
+        """
+        current = self._rosters.get(team_id)
+        if current is not None and (
+            current[1] is players or (version is not None and current[0] == version)
+        ):
+            return False
+        with self._lock:
+            self._rosters[team_id] = (version, players)
+            self._view = None
+            self.roster_updates += 1
+        return True
+    
+    def index_players(self, players: List[Player]):
+        """
+        Index a flat list of every player, replacing all rosters
+        (skipped if it is the list already indexed).
+        """
+        if players is self._players_source:
+            return
+        rosters: Dict[str, List[Player]] = {}
+        for player in players:
+            rosters.setdefault(player.team_id or '', []).append(player)
+        with self._lock:
+            self._rosters = {team_id: (None, roster) for team_id, roster in rosters.items()}
+            self._players_source = players
+            self._view = None
+            self.roster_updates += len(rosters)
+    
+    def _get_view(self) -> _IndexView:
+        view = self._view
+        if view is not None:
+            return view
+        with self._lock:
+            if self._view is None:
+                start = time.perf_counter()
+                team_ids = [team_id for team_id in self._teams if team_id in self._rosters]
+                team_ids.extend(team_id for team_id in self._rosters if team_id not in self._teams)
+                players = [player for team_id in team_ids for player in self._rosters[team_id][1]]
+                self._view = _IndexView(players)
+                self.builds += 1
+                self.build_time += time.perf_counter() - start
+                logger.debug(f"Player index built: {len(players)} players from {len(team_ids)} rosters")
+            return self._view
+    
+    def get(self, player_id: str) -> Optional[Player]:
+        """Look up an indexed player by ID."""
+        return self._get_view().by_id.get(player_id)
+    
+    def search(
+        self,
+        name: Optional[str] = None,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        fuzzy: bool = False
+    ) -> List[Player]:
+        """
+        Search indexed players. Filters combine; with no filters every player is returned.
+        
+        Args:
+            name: Name prefix, matched against the full name or any word in it
+            team_id: Only players on this team
+            position: Only players at this position (case-insensitive, e.g. QB)
+            fuzzy: Also return players whose name is close to `name` (typos,
+                spelling variants), after the prefix matches, best match first
+        
+        Returns:
+            Matching players; by name match if name is given, else in team order
+        """
+        view = self._get_view()
+        position = position.upper() if position else None
+        
+        if name is None:
+            if team_id is not None:
+                candidates: Iterable[Player] = view.by_team.get(team_id, [])
+            elif position is not None:
+                candidates = view.by_position.get(position, [])
+            else:
+                candidates = view.players
+        else:
+            query = normalize_name(name)
+            ordinals = view.prefix_matches(query)
+            if fuzzy and query:
+                ordinals += view.fuzzy_matches(query, self.fuzzy_limit, self.fuzzy_cutoff)
+            candidates = [view.players[ordinal] for ordinal in dict.fromkeys(ordinals)]
+        
+        return [
+            player for player in candidates
+            if (team_id is None or player.team_id == team_id)
+            and (position is None or (player.position or '').upper() == position)
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size and build statistics."""
+        view = self._view
+        return {
+            'teams': len(self._teams),
+            'rosters': len(self._rosters),
+            'players': len(view.players) if view else None,
+            'name_keys': len(view.name_keys) if view else None,
+            'builds': self.builds,
+            'avg_build_time': round(self.build_time / self.builds, 4) if self.builds else None,
+            'roster_updates': self.roster_updates
+        }
@@ -0,0 +1,300 @@
+"""
+Live scoreboard broadcasting for squirrel service.
+One background poller per source fetches the scoreboard and pushes only the
+games that changed to every subscriber, so any number of streaming clients
+cost one upstream poll per interval.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from .models.foolsball_models import GameScore
+from .squirrels import FoolsballSquirrel
+
+logger = logging.getLogger(__name__)
+
+# Statuses (lowercase, without ESPN's "status_" prefix) of games not being played
+_IDLE_STATUSES = frozenset({'', 'scheduled', 'postponed', 'canceled', 'cancelled'})
+
+# Wakes a subscriber blocked on get() when it is closed
+_CLOSED = object()
+
+
+def is_in_progress(score: GameScore) -> bool:
+    """Whether a game is being played (including breaks such as halftime)."""
+    status = score.status.lower().replace('-', '_')
+    if status.startswith('status_'):
+        status = status[len('status_'):]
+    return status not in _IDLE_STATUSES and not status.startswith('final')
+
+
+def _game_state(score: GameScore) -> Tuple:
+    """Fields that make up a game's visible state (updated_at is parse time, not a change)."""
+    return (
+        score.home_team, score.away_team, score.home_score, score.away_score,
+        score.quarter, score.time_remaining, score.status
+    )
+
+
+def diff_scores(
+    previous: Dict[str, GameScore],
+    current: List[GameScore]
+) -> Tuple[List[GameScore], List[str]]:
+    """
+    Compare two scoreboard snapshots.
+    
+    Args:
+        previous: Last snapshot, by game ID
+        current: New scoreboard
+    
+    Returns:
+        Tuple of (games that are new or changed, IDs of games no longer listed)
+    """
+    changed = [
+        score for score in current
+        if score.game_id not in previous or _game_state(previous[score.game_id]) != _game_state(score)
+    ]
+    listed = {score.game_id for score in current}
+    removed = [game_id for game_id in previous if game_id not in listed]
+    return changed, removed
+
+
+class ScoreboardSubscription:
+    """
+    A subscriber's queue of scoreboard messages.
+    
+    Use as an async context manager so the subscription is always released:
+    
+        async with broadcaster.subscribe() as subscription:
+            while not subscription.closed:
+                message = await subscription.get(timeout=15)
+    """
+    
+    def __init__(self, broadcaster: 'ScoreboardBroadcaster', queue_size: int):
+        self._broadcaster = broadcaster
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.closed = False
+    
+    def _put(self, message: Dict[str, Any]) -> bool:
+        """Queue a message without waiting. Returns False if the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    def _resync(self, snapshot: Dict[str, Any]):
+        """Replace a backlog the subscriber can't keep up with by a full snapshot."""
+        self._drain()
+        self._queue.put_nowait(snapshot)
+    
+    def _drain(self):
+        while not self._queue.empty():
+            self._queue.get_nowait()
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next message.
+        
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+        
+        Returns:
+            The message, or None on timeout or once the subscription is closed
+        """
+        if self.closed:
+            return None
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return None if message is _CLOSED else message
+    
+    def close(self):
+        """Stop receiving messages and wake a pending get()."""
+        if self.closed:
+            return
+        self.closed = True
+        self._broadcaster._unsubscribe(self)
+        self._drain()
+        self._queue.put_nowait(_CLOSED)
+    
+    async def __aenter__(self) -> 'ScoreboardSubscription':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ScoreboardBroadcaster:
+    """
+    Polls one source's scoreboard and pushes changes to subscribers.
+    
+    The poller runs only while someone is subscribed. It polls every
+    live_interval seconds while any game is in progress and every
+    idle_interval seconds otherwise. A subscriber first receives a
+    'snapshot' message with every game, then 'update' messages with only
+    the games that changed and the IDs of games that dropped off the
+    scoreboard. A subscriber that falls queue_size messages behind gets a
+    fresh snapshot in place of its backlog.
+    """
+    
+    def __init__(
+        self,
+        get_squirrel: Callable[[], FoolsballSquirrel],
+        source: str,
+        live_interval: float = 10.0,
+        idle_interval: float = 120.0,
+        queue_size: int = 32
+    ):
+        """
+        Initialize scoreboard broadcaster.
+        
+        Args:
+            get_squirrel: Callable returning the squirrel to poll
+            source: Data source name, included in every message
+            live_interval: Seconds between polls while a game is in progress
+            idle_interval: Seconds between polls while no game is in progress
+            queue_size: Messages buffered per subscriber before it is resynced
+        """
+        self.get_squirrel = get_squirrel
+        self.source = source
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.queue_size = queue_size
+        self._subscribers: Set[ScoreboardSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        
+        # Latest snapshot, by game ID (None until the current poller's first poll)
+        self._games: Optional[Dict[str, GameScore]] = None
+        self.live = False
+        
+        self.polls = 0
+        self.errors = 0
+        self.last_poll: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.updates = 0
+        self.games_pushed = 0
+        self.messages = 0
+        self.resyncs = 0
+    
+    @property
+    def interval(self) -> float:
+        """Seconds until the next poll."""
+        return self.live_interval if self.live else self.idle_interval
+    
+    def subscribe(self) -> ScoreboardSubscription:
+        """
+        Subscribe to scoreboard messages, starting the poller if needed.
+        Must be called from the event loop.
+        """
+        subscription = ScoreboardSubscription(self, self.queue_size)
+        self._subscribers.add(subscription)
+        
+        if not self._task or self._task.done():
+            # A new poller starts from scratch: the last snapshot may be long stale
+            self._games = None
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Scoreboard poller started for {self.source}")
+        elif self._games is not None:
+            subscription._put(self._snapshot())
+        return subscription
+    
+    def _unsubscribe(self, subscription: ScoreboardSubscription):
+        self._subscribers.discard(subscription)
+    
+    async def stop(self):
+        """Stop the poller and close every subscription."""
+        for subscription in list(self._subscribers):
+            subscription.close()
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"Scoreboard poller stopped for {self.source}")
+    
+    async def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the scoreboard once and publish what changed.
+        
+        Returns:
+            The published message, or None if nothing changed
+        """
+        scores = await self.get_squirrel().aget_live_scores()
+        self.polls += 1
+        self.last_poll = time.time()
+        self.live = any(is_in_progress(score) for score in scores)
+        
+        first = self._games is None
+        changed, removed = diff_scores(self._games or {}, scores)
+        self._games = {score.game_id: score for score in scores}
+        if not first and not changed and not removed:
+            return None
+        
+        if first:
+            message = self._snapshot()
+        else:
+            message = self._message('update', changed, removed)
+            self.updates += 1
+            self.games_pushed += len(changed)
+        self._publish(message)
+        return message
+    
+    def _message(self, kind: str, games: List[GameScore], removed: List[str]) -> Dict[str, Any]:
+        return {
+            'type': kind,
+            'source': self.source,
+            'live': self.live,
+            'interval': self.interval,
+            'games': games,
+            'removed': removed,
+            'timestamp': time.time()
+        }
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        return self._message('snapshot', list((self._games or {}).values()), [])
+    
+    def _publish(self, message: Dict[str, Any]):
+        """Queue a message for every subscriber, resyncing the ones that fell behind."""
+        snapshot = None
+        for subscription in list(self._subscribers):
+            if not subscription._put(message):
+                snapshot = snapshot or self._snapshot()
+                subscription._resync(snapshot)
+                self.resyncs += 1
+            self.messages += 1
+    
+    async def _run(self):
+        """Poller loop; exits once the last subscriber is gone."""
+        while self._subscribers:
+            try:
+                await self.poll()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                logger.warning(f"Scoreboard poll failed for {self.source}: {e}")
+            await asyncio.sleep(self.interval)
+        logger.info(f"Scoreboard poller for {self.source} idle (no subscribers)")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get poller and subscriber statistics."""
+        return {
+            'running': bool(self._task and not self._task.done()),
+            'subscribers': len(self._subscribers),
+            'live': self.live,
+            'interval': self.interval,
+            'games': len(self._games or {}),
+            'polls': self.polls,
+            'errors': self.errors,
+            'last_poll': self.last_poll,
+            'last_error': self.last_error,
+            'updates': self.updates,
+            'games_pushed': self.games_pushed,
+            'messages': self.messages,
+            'resyncs': self.resyncs
+        }
@@ -7,7 +7,15 @@ from typing import Dict, Optional, Any, List
 from enum import Enum
 
 from .squirrels import BaseSquirrel, FoolsballSquirrel, JobsSquirrel
-from .config import DEFAULT_NFL_SOURCE, NFL_DATA_SOURCES
+from .utils.cache import CacheReaper
+from .warmup import CacheWarmer
+from .scoreboard import ScoreboardBroadcaster
+from .config import (
+    DEFAULT_NFL_SOURCE, NFL_DATA_SOURCES,
+    CACHE_REAPER_INTERVAL, CACHE_REAPER_BATCH_SIZE, WARMUP_ON_STARTUP,
+    WARMUP_SCHEDULE, WARMUP_KEY_SETS, WARMUP_RATE_LIMIT_HEADROOM,
+    SCOREBOARD_LIVE_INTERVAL, SCOREBOARD_IDLE_INTERVAL, SCOREBOARD_QUEUE_SIZE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +55,26 @@ class SquirrelManager:
             SquirrelType.FOOLSBALL: DEFAULT_NFL_SOURCE
         }
         
+        # Background reaper for expired cache entries (started by the app)
+        self.cache_reaper = CacheReaper(
+            self.cleanup_expired_cache,
+            interval=CACHE_REAPER_INTERVAL,
+            batch_size=CACHE_REAPER_BATCH_SIZE,
+            pending=self.has_expired_cache
+        )
+        
+        # Prefetches hot keys of the active foolsball source (started by the app)
+        self.cache_warmer = CacheWarmer(
+            lambda: self.get_squirrel(SquirrelType.FOOLSBALL),
+            key_sets=WARMUP_KEY_SETS,
+            schedule=WARMUP_SCHEDULE,
+            on_startup=WARMUP_ON_STARTUP,
+            headroom=WARMUP_RATE_LIMIT_HEADROOM
+        )
+        
+        # Live scoreboard pollers per foolsball source (started by their first subscriber)
+        self._scoreboards: Dict[str, ScoreboardBroadcaster] = {}
+        
         logger.info("SquirrelManager initialized")
     
     def get_squirrel(
@@ -94,6 +122,27 @@ class SquirrelManager:
         
         return self._squirrels[squirrel_key]
     
+    def get_scoreboard(self, source: Optional[str] = None) -> ScoreboardBroadcaster:
+        """
+        Get or create the live scoreboard broadcaster for a foolsball source.
+        
+        Args:
+            source: Data source (optional, uses active source if not provided)
+        
+        Returns:
+            Scoreboard broadcaster shared by all subscribers of the source
+        """
+        source = source or self._active_sources.get(SquirrelType.FOOLSBALL)
+        if source not in self._scoreboards:
+            self._scoreboards[source] = ScoreboardBroadcaster(
+                lambda: self.get_squirrel(SquirrelType.FOOLSBALL, source),
+                source,
+                live_interval=SCOREBOARD_LIVE_INTERVAL,
+                idle_interval=SCOREBOARD_IDLE_INTERVAL,
+                queue_size=SCOREBOARD_QUEUE_SIZE
+            )
+        return self._scoreboards[source]
+    
     def switch_source(self, squirrel_type: SquirrelType, source: str) -> None:
         """
         Switch the active data source for a squirrel type.
@@ -146,36 +195,73 @@ class SquirrelManager:
         self,
         squirrel_type: Optional[SquirrelType] = None,
         source: Optional[str] = None,
-        cache_key: Optional[str] = None
+        cache_key: Optional[str] = None,
+        tags: Optional[List[str]] = None
     ) -> None:
         """
         Invalidate cache for specific squirrel(s).
+        Each squirrel only drops entries in its own cache namespace, so
+        invalidating one squirrel leaves the others' cached data intact.
         
         Args:
             squirrel_type: Specific squirrel type (None for all)
             source: Specific source (None for all sources of type)
             cache_key: Specific cache key to invalidate
+            tags: Only invalidate entries carrying any of these tags
         """
+        def invalidate(squirrel: BaseSquirrel):
+            if tags:
+                squirrel.invalidate_cache_tags(tags)
+            else:
+                squirrel.invalidate_cache(cache_key)
+        
         if squirrel_type and source:
             # Invalidate specific squirrel
             squirrel_key = f"{squirrel_type}:{source}"
             if squirrel_key in self._squirrels:
-                self._squirrels[squirrel_key].invalidate_cache(cache_key)
+                invalidate(self._squirrels[squirrel_key])
                 logger.info(f"Cache invalidated for {squirrel_key}")
         
         elif squirrel_type:
             # Invalidate all squirrels of this type
             for key, squirrel in self._squirrels.items():
                 if key.startswith(f"{squirrel_type}:"):
-                    squirrel.invalidate_cache(cache_key)
+                    invalidate(squirrel)
             logger.info(f"Cache invalidated for all {squirrel_type} squirrels")
         
         else:
             # Invalidate all squirrels
             for squirrel in self._squirrels.values():
-                squirrel.invalidate_cache(cache_key)
+                invalidate(squirrel)
             logger.info("Cache invalidated for all squirrels")
     
+    def cleanup_expired_cache(self, max_items: Optional[int] = None) -> int:
+        """
+        Remove expired cache entries across all squirrels.
+        
+        Args:
+            max_items: Maximum number of entries to process (None for all)
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for squirrel in list(self._squirrels.values()):
+            if not squirrel.cache:
+                continue
+            remaining = None if max_items is None else max_items - removed
+            if remaining is not None and remaining <= 0:
+                break
+            removed += squirrel.cache.cleanup_expired(remaining)
+        return removed
+    
+    def has_expired_cache(self) -> bool:
+        """Whether any squirrel's cache has expired entries waiting for cleanup."""
+        return any(
+            squirrel.cache.has_expired()
+            for squirrel in list(self._squirrels.values()) if squirrel.cache
+        )
+    
     def get_squirrel_stats(self) -> Dict[str, Any]:
         """
         Get statistics for all active squirrels.
@@ -186,6 +272,11 @@ class SquirrelManager:
         stats = {
             "active_squirrels": len(self._squirrels),
             "active_sources": dict(self._active_sources),
+            "cache_reaper": self.cache_reaper.get_stats(),
+            "cache_warmer": self.cache_warmer.get_stats(),
+            "scoreboards": {
+                source: scoreboard.get_stats() for source, scoreboard in self._scoreboards.items()
+            },
             "squirrels": {}
         }
         
@@ -197,14 +288,44 @@ class SquirrelManager:
                 "rate_limit_enabled": squirrel.rate_limit_enabled,
             }
             
+            # Add cache stats (hit/miss metrics per key type, latency) if available
+            if squirrel.cache:
+                squirrel_stats["cache"] = squirrel.cache.get_stats()
+            if squirrel.async_cache:
+                squirrel_stats["async_cache"] = squirrel.async_cache.get_stats()
+            if squirrel.async_http:
+                squirrel_stats["http"] = squirrel.async_http.get_stats()
+            squirrel_stats["fanout"] = squirrel.fanout.get_stats()
+            squirrel_stats.update(squirrel.get_stats())
+            
             # Add rate limiter stats if available
             if squirrel.rate_limiter:
                 squirrel_stats["rate_limiter"] = squirrel.rate_limiter.get_stats()
+                squirrel_stats["rate_limiters"] = {
+                    host: limiter.get_stats()
+                    for host, limiter in list(squirrel.rate_limiters.items())
+                }
             
             stats["squirrels"][key] = squirrel_stats
         
         return stats
     
+    async def aclose_all(self) -> None:
+        """Stop the scoreboard pollers and close all active squirrels, including their async cache connections."""
+        for scoreboard in self._scoreboards.values():
+            await scoreboard.stop()
+        self._scoreboards.clear()
+        
+        for key, squirrel in self._squirrels.items():
+            try:
+                await squirrel.aclose()
+                logger.info(f"Closed squirrel: {key}")
+            except Exception as e:
+                logger.error(f"Error closing squirrel {key}: {e}")
+        
+        self._squirrels.clear()
+        logger.info("All squirrels closed")
+    
     def close_all(self) -> None:
         """Close all active squirrels and cleanup resources."""
         for key, squirrel in self._squirrels.items():
@@ -2,20 +2,36 @@
 Base squirrel class with common functionality for all squirrels.
 Provides caching, rate limiting, error handling, and retry logic.
 """
+import asyncio
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+from urllib.parse import urlparse
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from ..utils.cache import Cache
+from ..utils.async_cache import AsyncCache
+from ..utils.async_http import AsyncHttpClient
+from ..utils.codec import create_codec
+from ..utils.fanout import FanOut
 from ..utils.rate_limiter import RateLimiter, AdaptiveRateLimiter
 from ..config import (
     USER_AGENT, REQUEST_TIMEOUT, MAX_RETRIES, RETRY_DELAY,
-    RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, USE_REDIS, REDIS_HOST,
-    REDIS_PORT, REDIS_DB, CACHE_TTL_DEFAULT
+    RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, RATE_LIMIT_ALGORITHM, RATE_LIMIT_DISTRIBUTED,
+    RATE_LIMIT_KEY_PREFIX, RATE_LIMIT_REDIS_TIMEOUT, RATE_LIMIT_REDIS_RETRY_INTERVAL, USE_REDIS, REDIS_HOST,
+    REDIS_PORT, REDIS_DB, CACHE_TTL_DEFAULT, CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES, CACHE_EVICTION_POLICY, CACHE_REFRESH_WORKERS,
+    CACHE_TIERED, CACHE_L1_MAX_ENTRIES, CACHE_L1_MAX_BYTES, CACHE_L1_MAX_TTL,
+    CACHE_INVALIDATION_CHANNEL, CACHE_CODEC, CACHE_COMPRESSION,
+    CACHE_COMPRESSION_THRESHOLD, CACHE_CODEC_TRUSTED_MODULES, CACHE_KEY_PREFIX,
+    CACHE_TAG_TTL, CACHE_REDIS_MAX_CONNECTIONS, USE_DISK_CACHE, CACHE_DISK_PATH,
+    CACHE_SHARDS, UPSTREAM_HOSTS, HTTP_POOL_MAXSIZE, RATE_LIMIT_LANES, HTTP_ASYNC_ENABLED,
+    HTTP_ASYNC_HTTP2, HTTP_ASYNC_MAX_CONNECTIONS, HTTP_ASYNC_MAX_KEEPALIVE, HTTP_ASYNC_KEEPALIVE_EXPIRY,
+    FANOUT_MAX_CONCURRENCY
 )
 
 logger = logging.getLogger(__name__)
@@ -42,13 +58,25 @@ class BaseSquirrel(ABC):
     All specific squirrels should inherit from this class.
     """
     
+    _DEFAULT_HEADERS = {
+        'User-Agent': USER_AGENT,
+        'Accept': 'application/json',
+        'Accept-Language': 'en-US,en;q=0.9',
+    }
+    
+    # Statuses retried by the HTTP transports
+    _RETRY_STATUSES = (500, 502, 503, 504)
+    
     def __init__(
         self,
         cache_enabled: bool = True,
         rate_limit_enabled: bool = True,
         adaptive_rate_limit: bool = False,
         max_calls: Optional[int] = None,
-        period: Optional[int] = None
+        period: Optional[int] = None,
+        cache_namespace: Optional[str] = None,
+        rate_limit_algorithm: Optional[str] = None,
+        upstream_host: Optional[str] = None
     ):
         """
         Initialize base squirrel.
@@ -57,11 +85,18 @@ class BaseSquirrel(ABC):
             cache_enabled: Enable caching
             rate_limit_enabled: Enable rate limiting
             adaptive_rate_limit: Use adaptive rate limiter
-            max_calls: Maximum calls per period (overrides config)
-            period: Time period for rate limiting (overrides config)
+            max_calls: Maximum calls per period to upstream_host (overrides config)
+            period: Time period for rate limiting upstream_host (overrides config)
+            cache_namespace: Namespace for this squirrel's cache entries, so they
+                can be invalidated without touching other squirrels' data
+            rate_limit_algorithm: 'sliding_window', 'token_bucket' or 'gcra'
+                (overrides config)
+            upstream_host: Main host this squirrel calls; its limiter is
+                self.rate_limiter. Other hosts get their own limiters on first use
         """
         self.cache_enabled = cache_enabled
         self.rate_limit_enabled = rate_limit_enabled
+        self.upstream_host = upstream_host or self.__class__.__name__
         
         # Initialize cache
         if self.cache_enabled:
@@ -69,54 +104,190 @@ class BaseSquirrel(ABC):
                 use_redis=USE_REDIS,
                 redis_host=REDIS_HOST,
                 redis_port=REDIS_PORT,
-                redis_db=REDIS_DB
+                redis_db=REDIS_DB,
+                max_entries=CACHE_MAX_ENTRIES,
+                max_bytes=CACHE_MAX_BYTES,
+                eviction_policy=CACHE_EVICTION_POLICY,
+                shards=CACHE_SHARDS,
+                refresh_workers=CACHE_REFRESH_WORKERS,
+                tiered=CACHE_TIERED,
+                l1_max_entries=CACHE_L1_MAX_ENTRIES,
+                l1_max_bytes=CACHE_L1_MAX_BYTES,
+                l1_max_ttl=CACHE_L1_MAX_TTL,
+                invalidation_channel=CACHE_INVALIDATION_CHANNEL,
+                namespace=cache_namespace,
+                key_prefix=CACHE_KEY_PREFIX,
+                tag_ttl=CACHE_TAG_TTL,
+                use_disk=USE_DISK_CACHE,
+                disk_path=CACHE_DISK_PATH,
+                codec=create_codec(
+                    CACHE_CODEC,
+                    compression=CACHE_COMPRESSION,
+                    compression_threshold=CACHE_COMPRESSION_THRESHOLD,
+                    trusted_modules=CACHE_CODEC_TRUSTED_MODULES
+                )
             )
+            # Async handlers share the same entries without blocking the event loop
+            self.async_cache = AsyncCache(self.cache, max_connections=CACHE_REDIS_MAX_CONNECTIONS)
             logger.info(f"{self.__class__.__name__}: Cache initialized")
         else:
             self.cache = None
+            self.async_cache = None
         
-        # Initialize rate limiter
+        # Initialize rate limiters, one per upstream host
+        self.adaptive_rate_limit = adaptive_rate_limit
+        self.rate_limit_algorithm = rate_limit_algorithm or RATE_LIMIT_ALGORITHM
+        self.rate_limiters: Dict[str, RateLimiter] = {}
+        self._rate_limiters_lock = threading.Lock()
+        self._rate_limit_redis = None
         if self.rate_limit_enabled:
-            calls = max_calls or RATE_LIMIT_CALLS
-            period_seconds = period or RATE_LIMIT_PERIOD
-            
-            if adaptive_rate_limit:
-                self.rate_limiter = AdaptiveRateLimiter(calls, period_seconds)
-                logger.info(f"{self.__class__.__name__}: Adaptive rate limiter initialized")
-            else:
-                self.rate_limiter = RateLimiter(calls, period_seconds)
-                logger.info(f"{self.__class__.__name__}: Rate limiter initialized")
+            self.rate_limiter = self._create_rate_limiter(self.upstream_host, max_calls, period)
+            self.rate_limiters[self.upstream_host] = self.rate_limiter
         else:
             self.rate_limiter = None
         
         # Initialize HTTP session with retry strategy
         self.session = self._create_session()
+        self.async_http = self._create_async_http() if HTTP_ASYNC_ENABLED else None
+        
+        # Bounds the upstream calls a multi-key fetch makes at once
+        self.fanout = FanOut(FANOUT_MAX_CONCURRENCY)
+    
+    def _create_rate_limiter(
+        self,
+        host: str,
+        max_calls: Optional[int] = None,
+        period: Optional[int] = None
+    ) -> RateLimiter:
+        """Create the rate limiter for an upstream host from UPSTREAM_HOSTS."""
+        host_config = UPSTREAM_HOSTS.get(host, {})
+        calls = max_calls or host_config.get("max_calls", RATE_LIMIT_CALLS)
+        period_seconds = period or host_config.get("period", RATE_LIMIT_PERIOD)
+        lanes = host_config.get("lanes", RATE_LIMIT_LANES)
+        algorithm = self.rate_limit_algorithm
+        
+        if self.adaptive_rate_limit:
+            limiter = AdaptiveRateLimiter(calls, period_seconds, algorithm=algorithm, lanes=lanes)
+            logger.info(
+                f"{self.__class__.__name__}: Adaptive rate limiter initialized for {host} "
+                f"({calls} calls / {period_seconds}s, {algorithm})"
+            )
+        else:
+            limiter = RateLimiter(calls, period_seconds, algorithm=algorithm, lanes=lanes)
+            logger.info(
+                f"{self.__class__.__name__}: Rate limiter initialized for {host} "
+                f"({calls} calls / {period_seconds}s, {algorithm})"
+            )
+        
+        if RATE_LIMIT_DISTRIBUTED:
+            self._distribute_rate_limiter(limiter, host)
+        return limiter
+    
+    def _get_rate_limiter(self, url: str) -> Optional[RateLimiter]:
+        """
+        Get the rate limiter for the host a URL points at.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            The host's rate limiter (created on first use), or None if rate
+            limiting is disabled
+        """
+        if not self.rate_limit_enabled:
+            return None
+        host = urlparse(url).netloc or self.upstream_host
+        limiter = self.rate_limiters.get(host)
+        if limiter is None:
+            with self._rate_limiters_lock:
+                limiter = self.rate_limiters.get(host)
+                if limiter is None:
+                    limiter = self._create_rate_limiter(host)
+                    self.rate_limiters[host] = limiter
+        return limiter
+    
+    def _distribute_rate_limiter(self, limiter: RateLimiter, host: str):
+        """Share a host's rate limiter with other replicas through Redis."""
+        if self._rate_limit_redis is None:
+            try:
+                import redis
+            except ImportError:
+                logger.warning("Redis package not installed. Rate limiting stays local.")
+                return
+            
+            self._rate_limit_redis = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                socket_timeout=RATE_LIMIT_REDIS_TIMEOUT,
+                socket_connect_timeout=RATE_LIMIT_REDIS_TIMEOUT
+            )
+        limiter.distribute(
+            self._rate_limit_redis,
+            f"{RATE_LIMIT_KEY_PREFIX}{host}",
+            retry_interval=RATE_LIMIT_REDIS_RETRY_INTERVAL
+        )
     
     def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
+        """
+        Create a requests session with retry strategy.
+        Each host in UPSTREAM_HOSTS gets its own adapter, and so its own
+        connection pool size; other hosts share the default adapter.
+        """
         session = requests.Session()
         
-        # Configure retry strategy
+        # Configure retry strategy. 429s are not retried here: they reach the
+        # host's rate limiter, which pauses every caller for the Retry-After
         retry_strategy = Retry(
             total=MAX_RETRIES,
             backoff_factor=RETRY_DELAY,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=list(self._RETRY_STATUSES),
             allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=HTTP_POOL_MAXSIZE)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
+        # The longest matching prefix wins, so these take precedence
+        for host, host_config in UPSTREAM_HOSTS.items():
+            host_adapter = HTTPAdapter(
+                max_retries=retry_strategy,
+                pool_connections=1,
+                pool_maxsize=host_config.get("pool_maxsize", HTTP_POOL_MAXSIZE)
+            )
+            session.mount(f"https://{host}/", host_adapter)
+            session.mount(f"http://{host}/", host_adapter)
+        
         # Set default headers
-        session.headers.update({
-            'User-Agent': USER_AGENT,
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-        })
+        session.headers.update(self._DEFAULT_HEADERS)
         
         return session
     
+    def _create_async_http(self) -> Optional[AsyncHttpClient]:
+        """Create the async transport with the same headers, retries and per-host limits."""
+        try:
+            client = AsyncHttpClient(
+                headers=self._DEFAULT_HEADERS,
+                timeout=REQUEST_TIMEOUT,
+                retries=MAX_RETRIES,
+                backoff_factor=RETRY_DELAY,
+                status_forcelist=self._RETRY_STATUSES,
+                max_connections=HTTP_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_ASYNC_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_ASYNC_KEEPALIVE_EXPIRY,
+                http2=HTTP_ASYNC_HTTP2,
+                host_limits={
+                    host: host_config.get("pool_maxsize", HTTP_POOL_MAXSIZE)
+                    for host, host_config in UPSTREAM_HOSTS.items()
+                }
+            )
+        except ImportError:
+            logger.warning("httpx package not installed. Async requests run in worker threads.")
+            return None
+        logger.info(f"{self.__class__.__name__}: Async HTTP client initialized (HTTP/2: {client.http2})")
+        return client
+    
     def _get_cache_key(self, prefix: str, *args, **kwargs) -> str:
         """
         Generate a cache key from arguments.
@@ -160,10 +331,56 @@ class BaseSquirrel(ABC):
         Raises:
             SquirrelException: On request failure
         """
-        # Apply rate limiting
-        if self.rate_limiter:
-            self.rate_limiter.wait_if_needed()
+        # Apply the rate limit of the host being called
+        rate_limiter = self._get_rate_limiter(url)
+        if rate_limiter:
+            rate_limiter.wait_if_needed()
+        
+        return self._send_request(url, method, headers, params, data, timeout)
+    
+    async def _amake_request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[int] = None
+    ) -> Any:
+        """
+        Async variant of _make_request for use from async request handlers.
+        Waits for the rate limiter on the event loop and sends the request
+        with the async transport, so neither throttling nor a slow upstream
+        stalls other requests. Without the async transport the blocking
+        request runs in a worker thread.
+        
+        Returns:
+            httpx.Response (requests.Response in the worker-thread fallback);
+            both provide status_code, headers, text and json()
+        
+        Raises:
+            SquirrelException: On request failure
+        """
+        rate_limiter = self._get_rate_limiter(url)
+        if rate_limiter:
+            await rate_limiter.acquire()
         
+        if self.async_http is None:
+            return await asyncio.to_thread(
+                self._send_request, url, method, headers, params, data, timeout
+            )
+        return await self._asend_request(url, method, headers, params, data, timeout)
+    
+    def _send_request(
+        self,
+        url: str,
+        method: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        timeout: Optional[int]
+    ) -> requests.Response:
+        """Send an HTTP request (already rate limited) and map errors to SquirrelException."""
         # Prepare request
         request_kwargs = {
             'timeout': timeout or REQUEST_TIMEOUT,
@@ -176,78 +393,299 @@ class BaseSquirrel(ABC):
         if data:
             request_kwargs['json'] = data
         
+        rate_limiter = self._get_rate_limiter(url)
         try:
             logger.debug(f"Making {method} request to {url}")
             response = self.session.request(method, url, **request_kwargs)
+        except requests.exceptions.RequestException as e:
+            self._request_failed(url, rate_limiter, e)
+        
+        try:
             response.raise_for_status()
-            
-            # Report success for adaptive rate limiter
-            if isinstance(self.rate_limiter, AdaptiveRateLimiter):
-                self.rate_limiter.report_success()
-            
-            return response
-            
+            error = None
         except requests.exceptions.HTTPError as e:
-            # Report error for adaptive rate limiter
-            if isinstance(self.rate_limiter, AdaptiveRateLimiter):
-                self.rate_limiter.report_error()
-            
-            if e.response.status_code == 429:
-                logger.warning(f"Rate limit exceeded for {url}")
-                raise RateLimitException(f"Rate limit exceeded: {url}")
+            error = e
+        self._check_response(
+            url, rate_limiter, response.status_code, response.headers,
+            response.elapsed.total_seconds(), error
+        )
+        return response
+    
+    async def _asend_request(
+        self,
+        url: str,
+        method: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        timeout: Optional[int]
+    ) -> Any:
+        """Async variant of _send_request using the async transport."""
+        import httpx
+        
+        rate_limiter = self._get_rate_limiter(url)
+        started = time.perf_counter()
+        try:
+            logger.debug(f"Making async {method} request to {url}")
+            response = await self.async_http.request(
+                method, url, headers=headers, params=params, json=data or None,
+                timeout=timeout or REQUEST_TIMEOUT
+            )
+        except httpx.HTTPError as e:
+            self._request_failed(url, rate_limiter, e)
+        
+        error = None
+        # Unlike requests, httpx also raises for 3xx, and a 304 answers a conditional request
+        if response.status_code >= 400:
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                error = e
+        # Includes any retries, which are themselves a sign of a struggling upstream
+        self._check_response(
+            url, rate_limiter, response.status_code, response.headers,
+            time.perf_counter() - started, error
+        )
+        return response
+    
+    def _check_response(
+        self,
+        url: str,
+        rate_limiter: Optional[RateLimiter],
+        status_code: int,
+        headers: Any,
+        latency: float,
+        error: Optional[Exception]
+    ):
+        """
+        Feed a response to the host's rate limiter and raise for HTTP errors.
+        
+        Raises:
+            RateLimitException: On 429
+            SquirrelException: On other HTTP errors
+        """
+        if rate_limiter:
+            # Retry-After and X-RateLimit-* hints
+            rate_limiter.observe_headers(headers)
+        adaptive = isinstance(rate_limiter, AdaptiveRateLimiter)
+        
+        if error is None:
+            # Report success (and latency) for adaptive rate limiter
+            if adaptive:
+                rate_limiter.report_success(latency)
+            return
+        
+        # Only throttling and server errors say the upstream is overloaded
+        if adaptive:
+            if status_code == 429 or status_code >= 500:
+                rate_limiter.report_error(latency, throttled=status_code == 429)
             else:
-                logger.error(f"HTTP error for {url}: {e}")
-                raise SquirrelException(f"HTTP error: {e}")
+                rate_limiter.report_success(latency)
         
-        except requests.exceptions.RequestException as e:
-            if isinstance(self.rate_limiter, AdaptiveRateLimiter):
-                self.rate_limiter.report_error()
-            
-            logger.error(f"Request failed for {url}: {e}")
-            raise SquirrelException(f"Request failed: {e}")
+        if status_code == 429:
+            logger.warning(f"Rate limit exceeded for {url}")
+            raise RateLimitException(f"Rate limit exceeded: {url}")
+        logger.error(f"HTTP error for {url}: {error}")
+        raise SquirrelException(f"HTTP error: {error}")
+    
+    @staticmethod
+    def _request_failed(url: str, rate_limiter: Optional[RateLimiter], error: Exception):
+        """Report a request that got no response and raise SquirrelException."""
+        if isinstance(rate_limiter, AdaptiveRateLimiter):
+            rate_limiter.report_error()
+        
+        logger.error(f"Request failed for {url}: {error}")
+        raise SquirrelException(f"Request failed: {error}")
     
     def fetch_with_cache(
         self,
         cache_key: str,
         fetch_func: Callable,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        stale_while_revalidate: int = 0,
+        stale_if_error: int = 0,
+        tags: Optional[List[str]] = None
     ) -> Any:
         """
         Fetch data with caching support.
+        Concurrent cache misses for the same key are coalesced into a single
+        call to fetch_func whose result is shared by all waiters.
         
         Args:
             cache_key: Cache key
             fetch_func: Function to fetch data if not cached
-            ttl: Cache TTL in seconds
+            ttl: Cache TTL in seconds (soft TTL when stale windows are set)
+            stale_while_revalidate: Seconds past ttl to serve stale data while refreshing in background
+            stale_if_error: Seconds past ttl to serve stale data if fetch_func fails
+            tags: Tags to store the entry under for invalidate_cache_tags()
         
         Returns:
             Fetched or cached data
         """
-        # Try cache first
-        if self.cache:
-            cached_data = self.cache.get(cache_key)
-            if cached_data is not None:
-                logger.debug(f"Cache hit: {cache_key}")
-                return cached_data
-        
-        # Fetch fresh data
-        logger.debug(f"Cache miss: {cache_key}")
-        data = fetch_func()
-        
-        # Store in cache
-        if self.cache and data is not None:
-            cache_ttl = ttl or CACHE_TTL_DEFAULT
-            self.cache.set(cache_key, data, cache_ttl)
-            logger.debug(f"Cached data: {cache_key} (TTL: {cache_ttl}s)")
-        
-        return data
+        if not self.cache:
+            return fetch_func()
+        
+        cache_ttl = ttl or CACHE_TTL_DEFAULT
+        return self.cache.get_or_set(
+            cache_key, fetch_func, cache_ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+            tags=tags
+        )
+    
+    def fetch_with_cache_many(
+        self,
+        cache_keys: List[str],
+        fetch_func: Callable[[str], Any],
+        ttl: Optional[int] = None,
+        stale_while_revalidate: int = 0,
+        stale_if_error: int = 0,
+        tags: Optional[Callable[[str], List[str]]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch multiple keys with caching support.
+        Cached keys are read in a single backend round trip; only the misses
+        are fetched, up to FANOUT_MAX_CONCURRENCY at a time, and written back
+        together.
+        
+        Args:
+            cache_keys: Cache keys
+            fetch_func: Function taking a cache key and fetching its data
+            ttl: Cache TTL in seconds (soft TTL when stale windows are set)
+            stale_while_revalidate: Seconds past ttl to serve stale data while refreshing in background
+            stale_if_error: Seconds past ttl to serve stale data if fetch_func fails
+            tags: Function taking a cache key and returning its tags
+            on_error: Called with (cache_key, error) for keys that failed with no
+                stale data to serve; those keys are left out instead of raising
+        
+        Returns:
+            Mapping of cache key to fetched or cached data
+        """
+        if not self.cache:
+            results, errors = self.fanout.map(cache_keys, fetch_func)
+            return self._merge_fanout(cache_keys, results, errors, on_error)
+        
+        cache_ttl = ttl or CACHE_TTL_DEFAULT
+        return self.cache.get_or_set_many(
+            cache_keys, fetch_func, cache_ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+            tags=tags,
+            fanout=self.fanout,
+            on_error=on_error
+        )
+    
+    async def afetch_with_cache(
+        self,
+        cache_key: str,
+        fetch_func: Callable,
+        ttl: Optional[int] = None,
+        stale_while_revalidate: int = 0,
+        stale_if_error: int = 0,
+        tags: Optional[List[str]] = None
+    ) -> Any:
+        """
+        Async variant of fetch_with_cache for use from async request handlers.
+        Cache lookups are awaited; a blocking fetch_func runs in a worker thread
+        so the event loop keeps serving other requests.
+        
+        Args:
+            cache_key: Cache key
+            fetch_func: Function or coroutine function to fetch data if not cached
+            ttl: Cache TTL in seconds (soft TTL when stale windows are set)
+            stale_while_revalidate: Seconds past ttl to serve stale data while refreshing in background
+            stale_if_error: Seconds past ttl to serve stale data if fetch_func fails
+            tags: Tags to store the entry under for invalidate_cache_tags()
+        
+        Returns:
+            Fetched or cached data
+        """
+        fetch = self._to_coroutine_function(fetch_func)
+        if not self.async_cache:
+            return await fetch()
+        
+        cache_ttl = ttl or CACHE_TTL_DEFAULT
+        return await self.async_cache.get_or_set(
+            cache_key, fetch, cache_ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+            tags=tags
+        )
+    
+    async def afetch_with_cache_many(
+        self,
+        cache_keys: List[str],
+        fetch_func: Callable[[str], Any],
+        ttl: Optional[int] = None,
+        stale_while_revalidate: int = 0,
+        stale_if_error: int = 0,
+        tags: Optional[Callable[[str], List[str]]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of fetch_with_cache_many.
+        
+        Args:
+            cache_keys: Cache keys
+            fetch_func: Function or coroutine function taking a cache key and fetching its data
+            ttl: Cache TTL in seconds (soft TTL when stale windows are set)
+            stale_while_revalidate: Seconds past ttl to serve stale data while refreshing in background
+            stale_if_error: Seconds past ttl to serve stale data if fetch_func fails
+            tags: Function taking a cache key and returning its tags
+            on_error: Called with (cache_key, error) for keys that failed with no
+                stale data to serve; those keys are left out instead of raising
+        
+        Returns:
+            Mapping of cache key to fetched or cached data
+        """
+        fetch = self._to_coroutine_function(fetch_func)
+        if not self.async_cache:
+            results, errors = await self.fanout.amap(cache_keys, fetch)
+            return self._merge_fanout(cache_keys, results, errors, on_error)
+        
+        cache_ttl = ttl or CACHE_TTL_DEFAULT
+        return await self.async_cache.get_or_set_many(
+            cache_keys, fetch, cache_ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+            tags=tags,
+            fanout=self.fanout,
+            on_error=on_error
+        )
+    
+    @staticmethod
+    def _merge_fanout(
+        cache_keys: List[str],
+        results: Dict[str, Any],
+        errors: Dict[str, Exception],
+        on_error: Optional[Callable[[str, Exception], None]]
+    ) -> Dict[str, Any]:
+        """Drop None results and report (or raise the first of) the failed keys."""
+        for key in cache_keys:
+            if key in errors:
+                if on_error is None:
+                    raise errors[key]
+                on_error(key, errors[key])
+        return {key: results[key] for key in cache_keys if results.get(key) is not None}
+    
+    @staticmethod
+    def _to_coroutine_function(func: Callable) -> Callable[..., Awaitable[Any]]:
+        """Wrap a blocking function so awaiting it runs it in a worker thread."""
+        if asyncio.iscoroutinefunction(func):
+            return func
+        
+        async def run(*args):
+            return await asyncio.to_thread(func, *args)
+        return run
     
     def invalidate_cache(self, cache_key: Optional[str] = None):
         """
         Invalidate cache entries.
         
         Args:
-            cache_key: Specific key to invalidate, or None to clear all
+            cache_key: Specific key to invalidate, or None to invalidate every
+                entry in this squirrel's namespace
         """
         if not self.cache:
             return
@@ -256,8 +694,29 @@ class BaseSquirrel(ABC):
             self.cache.delete(cache_key)
             logger.info(f"Cache invalidated: {cache_key}")
         else:
-            self.cache.clear()
-            logger.info("All cache cleared")
+            self.cache.invalidate_namespace()
+            logger.info(f"{self.__class__.__name__}: Cache namespace invalidated")
+    
+    def invalidate_cache_tags(self, tags: List[str]) -> int:
+        """
+        Invalidate every cache entry stored under any of the given tags.
+        
+        Args:
+            tags: Tags passed to fetch_with_cache (e.g. ['team:12'])
+        
+        Returns:
+            Number of entries invalidated
+        """
+        if not self.cache:
+            return 0
+        return self.cache.invalidate_tags(tags)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get squirrel-specific statistics, merged into the manager's stats.
+        Subclasses override this to report their own counters.
+        """
+        return {}
     
     @abstractmethod
     def scrape(self, *args, **kwargs) -> Any:
@@ -269,8 +728,19 @@ class BaseSquirrel(ABC):
         """
         pass
     
+    async def aclose(self):
+        """Close the async cache and HTTP connections, then the squirrel itself."""
+        if self.async_cache:
+            await self.async_cache.close()
+        if self.async_http:
+            await self.async_http.aclose()
+        self.close()
+    
     def close(self):
         """Close the squirrel and cleanup resources."""
+        self.fanout.close()
+        if self.cache:
+            self.cache.close()
         if self.session:
             self.session.close()
             logger.info(f"{self.__class__.__name__}: Session closed")
@@ -3,28 +3,122 @@ NFL (Foolsball) squirrel implementation.
 Inherits from BaseSquirrel to provide real-time NFL player and team data.
 Team data is cached for 24 hours, player data is cached for 5 minutes.
 """
+import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from functools import partial
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from urllib.parse import urlparse
 
 from .base_squirrel import BaseSquirrel, SquirrelException, DataNotFoundException
+from ..player_index import PlayerIndex
+from ..utils.micro_cache import MicroCache
+from ..utils.rate_limiter import PRIORITY_LIVE, use_priority
 from ..models.foolsball_models import (
     Team, Player, PlayerStats, GameScore, SquirrelResponse
 )
 from ..config import (
-    NFL_DATA_SOURCES, DEFAULT_NFL_SOURCE,
-    CACHE_TTL_TEAM_DATA, CACHE_TTL_PLAYER_DATA
+    NFL_DATA_SOURCES, DEFAULT_NFL_SOURCE, SCORES_MICRO_CACHE_TTL, PLAYER_SEARCH_FUZZY_CUTOFF,
+    CACHE_TTL_TEAM_DATA, CACHE_TTL_PLAYER_DATA,
+    CACHE_STALE_WHILE_REVALIDATE_TEAM_DATA, CACHE_STALE_IF_ERROR_TEAM_DATA,
+    CACHE_STALE_WHILE_REVALIDATE_PLAYER_DATA, CACHE_STALE_IF_ERROR_PLAYER_DATA
 )
 
 logger = logging.getLogger(__name__)
 
 
+class _RefreshCycles:
+    """
+    Counts roster revalidations in consecutive windows of the player data
+    TTL, so each window covers about one refresh of every cached roster.
+    First loads of a roster are not counted.
+    """
+    
+    def __init__(self, length: float):
+        self.length = length
+        self._lock = threading.Lock()
+        self._current: Optional[Dict[str, Any]] = None
+        self.last: Optional[Dict[str, Any]] = None
+        self.cycles = 0
+        self.checked = 0
+        self.changed = 0
+        self.not_modified = 0
+    
+    def _roll(self, now: float):
+        """Close the current cycle once its window has passed."""
+        if self._current is not None and now - self._current['started_at'] >= self.length:
+            self.last = self._summary(self._current)
+            self.cycles += 1
+            self._current = None
+    
+    @staticmethod
+    def _summary(cycle: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'started_at': cycle['started_at'],
+            'checked': cycle['checked'],
+            'changed': len(cycle['changed_teams']),
+            'unchanged': cycle['checked'] - len(cycle['changed_teams']),
+            'not_modified': cycle['not_modified'],
+            'changed_teams': sorted(cycle['changed_teams'])
+        }
+    
+    def record(self, team_id: str, not_modified: bool, changed: bool):
+        """Record one revalidation of a cached roster."""
+        now = time.time()
+        with self._lock:
+            self._roll(now)
+            if self._current is None:
+                self._current = {
+                    'started_at': now,
+                    'checked': 0,
+                    'not_modified': 0,
+                    'changed_teams': set()
+                }
+            self._current['checked'] += 1
+            self.checked += 1
+            if not_modified:
+                self._current['not_modified'] += 1
+                self.not_modified += 1
+            if changed:
+                self._current['changed_teams'].add(team_id)
+                self.changed += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current and last completed cycle, plus totals."""
+        with self._lock:
+            self._roll(time.time())
+            return {
+                'cycle_length': self.length,
+                'cycles': self.cycles,
+                'current': self._summary(self._current) if self._current else None,
+                'last': self.last,
+                'checked': self.checked,
+                'changed': self.changed,
+                'not_modified': self.not_modified
+            }
+
+
 class FoolsballSquirrel(BaseSquirrel):
     """
     NFL data squirrel that inherits from BaseSquirrel.
     Provides methods to fetch teams, players, stats, and live scores.
+    Each cached accessor has an awaitable a* variant for async handlers.
     """
     
+    # Cache TTL and stale windows per data type
+    _TEAM_CACHE_POLICY = {
+        'ttl': CACHE_TTL_TEAM_DATA,
+        'stale_while_revalidate': CACHE_STALE_WHILE_REVALIDATE_TEAM_DATA,
+        'stale_if_error': CACHE_STALE_IF_ERROR_TEAM_DATA,
+    }
+    _PLAYER_CACHE_POLICY = {
+        'ttl': CACHE_TTL_PLAYER_DATA,
+        'stale_while_revalidate': CACHE_STALE_WHILE_REVALIDATE_PLAYER_DATA,
+        'stale_if_error': CACHE_STALE_IF_ERROR_PLAYER_DATA,
+    }
+    
     def __init__(
         self,
         source: str = DEFAULT_NFL_SOURCE,
@@ -39,14 +133,22 @@ class FoolsballSquirrel(BaseSquirrel):
             cache_enabled: Enable caching
             rate_limit_enabled: Enable rate limiting
         """
+        api_endpoints = NFL_DATA_SOURCES.get(source, NFL_DATA_SOURCES[DEFAULT_NFL_SOURCE])
         super().__init__(
             cache_enabled=cache_enabled,
             rate_limit_enabled=rate_limit_enabled,
-            adaptive_rate_limit=True  # Use adaptive rate limiting
+            adaptive_rate_limit=True,  # Use adaptive rate limiting
+            cache_namespace=f"foolsball:{source}",
+            upstream_host=urlparse(api_endpoints["teams"]).netloc
         )
         
         self.source = source
-        self.api_endpoints = NFL_DATA_SOURCES.get(source, NFL_DATA_SOURCES[DEFAULT_NFL_SOURCE])
+        self.api_endpoints = api_endpoints
+        self._roster_refresh = _RefreshCycles(CACHE_TTL_PLAYER_DATA)
+        # Shared by every live scores caller, REST and streaming alike
+        self.scores_cache = MicroCache(SCORES_MICRO_CACHE_TTL.get(source, 0))
+        # Teams and rosters as they come out of the cache, for lookups and search
+        self.player_index = PlayerIndex(PLAYER_SEARCH_FUZZY_CUTOFF)
         logger.info(f"FoolsballSquirrel initialized with source: {source}")
     
     def scrape(self, data_type: str, **kwargs) -> SquirrelResponse:
@@ -88,7 +190,7 @@ class FoolsballSquirrel(BaseSquirrel):
                 cached=False,
                 source=self.source
             )
-            
+        
         except Exception as e:
             logger.error(f"Search error: {e}")
             return SquirrelResponse(
@@ -101,42 +203,69 @@ class FoolsballSquirrel(BaseSquirrel):
         """
         Fetch all NFL teams.
         Team data is cached for 24 hours as it changes infrequently.
+        Stale team data is served while it is refreshed in the background,
+        and kept as a fallback if ESPN is unavailable.
         
         Returns:
             List of Team objects
         """
-        cache_key = self._get_cache_key("foolsball", "teams", self.source)
+        # Use cache with 24-hour TTL for team data, serving stale data while refreshing
+        teams = self.fetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "teams", self.source),
+            fetch_func=self._fetch_teams,
+            tags=["type:teams"],
+            **self._TEAM_CACHE_POLICY
+        )
+        self.player_index.index_teams(teams)
+        return teams
+    
+    async def aget_teams(self) -> List[Team]:
+        """Async variant of get_teams for use from async request handlers."""
+        teams = await self.afetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "teams", self.source),
+            fetch_func=self._afetch_teams,
+            tags=["type:teams"],
+            **self._TEAM_CACHE_POLICY
+        )
+        self.player_index.index_teams(teams)
+        return teams
+    
+    def get_team(self, team_id: str) -> Team:
+        """
+        Fetch one NFL team.
+        The cached team list is indexed by ID, so this is a dictionary lookup.
         
-        def fetch_teams():
-            logger.info("Fetching NFL teams from API")
-            url = self.api_endpoints.get("teams")
-            if not url:
-                raise DataNotFoundException("Teams endpoint not configured")
-            
-            response = self._make_request(url)
-            data = response.json()
-            
-            # Parse based on source
-            if self.source == "espn":
-                return self._parse_espn_teams(data)
-            elif self.source == "nfl":
-                return self._parse_nfl_teams(data)
-            else:
-                raise SquirrelException(f"Unknown source: {self.source}")
+        Args:
+            team_id: Team ID
         
-        # Use cache with 24-hour TTL for team data
-        teams_data = self.fetch_with_cache(
-            cache_key=cache_key,
-            fetch_func=fetch_teams,
-            ttl=CACHE_TTL_TEAM_DATA
-        )
+        Returns:
+            Team object
         
-        return teams_data
+        Raises:
+            DataNotFoundException: If there is no team with this ID
+        """
+        self.get_teams()
+        return self._indexed_team(team_id)
+    
+    async def aget_team(self, team_id: str) -> Team:
+        """Async variant of get_team for use from async request handlers."""
+        await self.aget_teams()
+        return self._indexed_team(team_id)
+    
+    def _indexed_team(self, team_id: str) -> Team:
+        team = self.player_index.team(team_id)
+        if team is None:
+            raise DataNotFoundException(f"Team {team_id} not found")
+        return team
     
     def get_players(self, team_id: Optional[str] = None) -> List[Player]:
         """
         Fetch NFL players, optionally filtered by team.
         Player data is cached for 5 minutes for real-time updates.
+        For ESPN each team's roster is cached under its own key, so a warm
+        all-players request is a single bulk cache lookup, and cold rosters
+        are fetched concurrently. Teams whose roster fails to load are left
+        out of an all-players result rather than failing it.
         
         Args:
             team_id: Optional team ID to filter players
@@ -144,45 +273,168 @@ class FoolsballSquirrel(BaseSquirrel):
         Returns:
             List of Player objects
         """
-        cache_key = self._get_cache_key("foolsball", "players", self.source, team_id or "all")
-        
-        def fetch_players():
-            logger.info(f"Fetching NFL players (team: {team_id or 'all'})")
-            
-            # For ESPN, we get players from team rosters
-            if self.source == "espn":
-                if team_id:
-                    return self._fetch_team_roster(team_id)
-                else:
-                    # Fetch all teams and their rosters
-                    teams = self.get_teams()
-                    all_players = []
-                    for team in teams:
-                        players = self._fetch_team_roster(team.id)
-                        all_players.extend(players)
-                    return all_players
-            
-            elif self.source == "nfl":
-                url = self.api_endpoints.get("players")
-                if not url:
-                    raise DataNotFoundException("Players endpoint not configured")
-                
-                params = {"team": team_id} if team_id else {}
-                response = self._make_request(url, params=params)
-                data = response.json()
-                return self._parse_nfl_players(data)
+        # For ESPN, we get players from team rosters
+        if self.source == "espn":
+            if team_id:
+                return self.get_team_rosters([team_id]).get(team_id, [])
             
-            else:
-                raise SquirrelException(f"Unknown source: {self.source}")
+            # Fetch all teams and their rosters
+            teams = self.get_teams()
+            rosters = self.get_team_rosters([team.id for team in teams])
+            return self._merge_rosters(teams, rosters)
         
         # Use cache with 5-minute TTL for player data
-        players_data = self.fetch_with_cache(
-            cache_key=cache_key,
-            fetch_func=fetch_players,
-            ttl=CACHE_TTL_PLAYER_DATA
+        players = self.fetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "players", self.source, team_id or "all"),
+            fetch_func=lambda: self._fetch_players(team_id),
+            tags=self._players_tags(team_id),
+            **self._PLAYER_CACHE_POLICY
+        )
+        self._index_players(team_id, players)
+        return players
+    
+    async def aget_players(self, team_id: Optional[str] = None) -> List[Player]:
+        """Async variant of get_players for use from async request handlers."""
+        if self.source == "espn":
+            if team_id:
+                return (await self.aget_team_rosters([team_id])).get(team_id, [])
+            
+            teams = await self.aget_teams()
+            rosters = await self.aget_team_rosters([team.id for team in teams])
+            return self._merge_rosters(teams, rosters)
+        
+        players = await self.afetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "players", self.source, team_id or "all"),
+            fetch_func=partial(self._afetch_players, team_id),
+            tags=self._players_tags(team_id),
+            **self._PLAYER_CACHE_POLICY
         )
+        self._index_players(team_id, players)
+        return players
+    
+    def _index_players(self, team_id: Optional[str], players: List[Player]):
+        """Index a players result that isn't per-team rosters (non-ESPN sources)."""
+        if team_id:
+            self.player_index.index_roster(team_id, players)
+        else:
+            self.player_index.index_players(players)
+    
+    def search_players(
+        self,
+        name: Optional[str] = None,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        fuzzy: bool = False
+    ) -> List[Player]:
+        """
+        Search players by name, team and position.
+        The players (of team_id, or of every team) are loaded through the
+        cache as in get_players, which keeps the player index current;
+        the search itself runs on the index.
+        
+        Args:
+            name: Name prefix, matched against the full name or any word in it
+                (accents, case and punctuation are ignored)
+            team_id: Only players on this team
+            position: Only players at this position (e.g. QB)
+            fuzzy: Also match names close to `name`, for typos and spelling variants
+        
+        Returns:
+            Matching players; by name match if name is given, else in team order
+        """
+        self.get_players(team_id)
+        return self.player_index.search(name, team_id, position, fuzzy)
+    
+    async def asearch_players(
+        self,
+        name: Optional[str] = None,
+        team_id: Optional[str] = None,
+        position: Optional[str] = None,
+        fuzzy: bool = False
+    ) -> List[Player]:
+        """Async variant of search_players for use from async request handlers."""
+        await self.aget_players(team_id)
+        return self.player_index.search(name, team_id, position, fuzzy)
+    
+    def get_team_rosters(self, team_ids: List[str]) -> Dict[str, List[Player]]:
+        """
+        Fetch rosters for several teams from ESPN.
+        Each roster is cached under its own key with the player data TTL.
+        Uncached rosters are fetched concurrently (up to FANOUT_MAX_CONCURRENCY
+        at a time, within the rate limit); teams that fail are logged and
+        left out. Expired rosters are revalidated with their ETag and
+        Last-Modified validators, so an unchanged roster costs a 304 that
+        extends its TTL rather than a download and parse.
+        
+        Args:
+            team_ids: Team IDs
+        
+        Returns:
+            Mapping of team ID to its list of Player objects
+        
+        Raises:
+            SquirrelException: If rosters were requested and none could be loaded
+        """
+        keys = {self._roster_cache_key(team_id): team_id for team_id in team_ids}
+        failed: Dict[str, Exception] = {}
+        
+        rosters = self.fetch_with_cache_many(
+            cache_keys=list(keys),
+            fetch_func=lambda cache_key: self._fetch_team_roster(
+                keys[cache_key], self._cached_roster(cache_key)
+            ),
+            tags=lambda cache_key: self._roster_tags(keys[cache_key]),
+            on_error=failed.__setitem__,
+            **self._PLAYER_CACHE_POLICY
+        )
+        return self._collect_rosters(keys, rosters, failed)
+    
+    async def aget_team_rosters(self, team_ids: List[str]) -> Dict[str, List[Player]]:
+        """Async variant of get_team_rosters for use from async request handlers."""
+        keys = {self._roster_cache_key(team_id): team_id for team_id in team_ids}
+        failed: Dict[str, Exception] = {}
+        
+        async def fetch_roster(cache_key: str) -> List[Player]:
+            return await self._afetch_team_roster(
+                keys[cache_key], await self._acached_roster(cache_key)
+            )
         
-        return players_data
+        rosters = await self.afetch_with_cache_many(
+            cache_keys=list(keys),
+            fetch_func=fetch_roster,
+            tags=lambda cache_key: self._roster_tags(keys[cache_key]),
+            on_error=failed.__setitem__,
+            **self._PLAYER_CACHE_POLICY
+        )
+        return self._collect_rosters(keys, rosters, failed)
+    
+    def _collect_rosters(
+        self,
+        keys: Dict[str, str],
+        rosters: Dict[str, List[Player]],
+        failed: Dict[str, Exception]
+    ) -> Dict[str, List[Player]]:
+        """
+        Map rosters back to team IDs and index them, failing only if every
+        roster failed.
+        """
+        if failed:
+            if not rosters:
+                raise next(iter(failed.values()))
+            logger.warning(
+                f"Roster fetch failed for teams {sorted(keys[cache_key] for cache_key in failed)}, "
+                f"returning {len(rosters)} of {len(keys)} rosters"
+            )
+        collected = {}
+        for cache_key, roster in rosters.items():
+            team_id = keys[cache_key]
+            if isinstance(roster, dict):
+                collected[team_id] = roster['players']
+                self.player_index.index_roster(team_id, roster['players'], roster.get('digest'))
+            else:
+                collected[team_id] = roster
+                self.player_index.index_roster(team_id, roster)
+        return collected
     
     def get_player(self, player_id: str) -> Player:
         """
@@ -194,32 +446,22 @@ class FoolsballSquirrel(BaseSquirrel):
         Returns:
             Player object
         """
-        cache_key = self._get_cache_key("foolsball", "player", self.source, player_id)
-        
-        def fetch_player():
-            logger.info(f"Fetching player: {player_id}")
-            
-            if self.source == "espn":
-                url = self.api_endpoints.get("player_stats")
-                if not url:
-                    raise DataNotFoundException("Player stats endpoint not configured")
-                
-                url = url.format(player_id=player_id)
-                response = self._make_request(url)
-                data = response.json()
-                return self._parse_espn_player(data)
-            
-            else:
-                raise SquirrelException(f"Player endpoint not implemented for source: {self.source}")
-        
         # Use cache with 5-minute TTL
-        player_data = self.fetch_with_cache(
-            cache_key=cache_key,
-            fetch_func=fetch_player,
-            ttl=CACHE_TTL_PLAYER_DATA
+        return self.fetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "player", self.source, player_id),
+            fetch_func=lambda: self._fetch_player(player_id),
+            tags=["type:player", "players", f"player:{player_id}"],
+            **self._PLAYER_CACHE_POLICY
+        )
+    
+    async def aget_player(self, player_id: str) -> Player:
+        """Async variant of get_player for use from async request handlers."""
+        return await self.afetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "player", self.source, player_id),
+            fetch_func=partial(self._afetch_player, player_id),
+            tags=["type:player", "players", f"player:{player_id}"],
+            **self._PLAYER_CACHE_POLICY
         )
-        
-        return player_data
     
     def get_player_stats(self, player_id: str, season: Optional[int] = None) -> PlayerStats:
         """
@@ -233,41 +475,156 @@ class FoolsballSquirrel(BaseSquirrel):
             PlayerStats object
         """
         season = season or datetime.now().year
-        cache_key = self._get_cache_key("foolsball", "stats", self.source, player_id, season)
         
-        def fetch_stats():
-            logger.info(f"Fetching stats for player: {player_id}, season: {season}")
+        # Use cache with 5-minute TTL
+        return self.fetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "stats", self.source, player_id, season),
+            fetch_func=lambda: self._fetch_player_stats(player_id, season),
+            tags=["type:stats", "players", f"player:{player_id}"],
+            **self._PLAYER_CACHE_POLICY
+        )
+    
+    async def aget_player_stats(self, player_id: str, season: Optional[int] = None) -> PlayerStats:
+        """Async variant of get_player_stats for use from async request handlers."""
+        season = season or datetime.now().year
+        return await self.afetch_with_cache(
+            cache_key=self._get_cache_key("foolsball", "stats", self.source, player_id, season),
+            fetch_func=partial(self._afetch_player_stats, player_id, season),
+            tags=["type:stats", "players", f"player:{player_id}"],
+            **self._PLAYER_CACHE_POLICY
+        )
+    
+    # Upstream fetchers. Each has a blocking and an awaitable variant sharing
+    # the request and parsing steps.
+    def _fetch_teams(self) -> List[Team]:
+        """Fetch all teams from the configured source."""
+        response = self._make_request(self._teams_url())
+        return self._parse_teams(response.json())
+    
+    async def _afetch_teams(self) -> List[Team]:
+        response = await self._amake_request(self._teams_url())
+        return self._parse_teams(response.json())
+    
+    def _teams_url(self) -> str:
+        logger.info("Fetching NFL teams from API")
+        url = self.api_endpoints.get("teams")
+        if not url:
+            raise DataNotFoundException("Teams endpoint not configured")
+        return url
+    
+    def _parse_teams(self, data: Dict) -> List[Team]:
+        # Parse based on source
+        if self.source == "espn":
+            return self._parse_espn_teams(data)
+        elif self.source == "nfl":
+            return self._parse_nfl_teams(data)
+        else:
+            raise SquirrelException(f"Unknown source: {self.source}")
+    
+    def _fetch_players(self, team_id: Optional[str]) -> List[Player]:
+        """Fetch players from sources with a players endpoint (not ESPN)."""
+        url, params = self._players_request(team_id)
+        response = self._make_request(url, params=params)
+        return self._parse_nfl_players(response.json())
+    
+    async def _afetch_players(self, team_id: Optional[str]) -> List[Player]:
+        url, params = self._players_request(team_id)
+        response = await self._amake_request(url, params=params)
+        return self._parse_nfl_players(response.json())
+    
+    def _players_request(self, team_id: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        logger.info(f"Fetching NFL players (team: {team_id or 'all'})")
+        
+        if self.source == "nfl":
+            url = self.api_endpoints.get("players")
+            if not url:
+                raise DataNotFoundException("Players endpoint not configured")
             
-            if self.source == "espn":
-                url = self.api_endpoints.get("player_stats")
-                if not url:
-                    raise DataNotFoundException("Player stats endpoint not configured")
-                
-                url = url.format(player_id=player_id)
-                response = self._make_request(url, params={"season": season})
-                data = response.json()
-                return self._parse_espn_player_stats(data, season)
+            params = {"team": team_id} if team_id else {}
+            return url, params
+        
+        else:
+            raise SquirrelException(f"Unknown source: {self.source}")
+    
+    def _fetch_player(self, player_id: str) -> Player:
+        """Fetch a single player's details."""
+        response = self._make_request(self._player_url(player_id))
+        return self._parse_espn_player(response.json())
+    
+    async def _afetch_player(self, player_id: str) -> Player:
+        response = await self._amake_request(self._player_url(player_id))
+        return self._parse_espn_player(response.json())
+    
+    def _player_url(self, player_id: str) -> str:
+        logger.info(f"Fetching player: {player_id}")
+        
+        if self.source == "espn":
+            url = self.api_endpoints.get("player_stats")
+            if not url:
+                raise DataNotFoundException("Player stats endpoint not configured")
             
-            else:
-                raise SquirrelException(f"Stats endpoint not implemented for source: {self.source}")
+            return url.format(player_id=player_id)
         
-        # Use cache with 5-minute TTL
-        stats_data = self.fetch_with_cache(
-            cache_key=cache_key,
-            fetch_func=fetch_stats,
-            ttl=CACHE_TTL_PLAYER_DATA
-        )
+        else:
+            raise SquirrelException(f"Player endpoint not implemented for source: {self.source}")
+    
+    def _fetch_player_stats(self, player_id: str, season: int) -> PlayerStats:
+        """Fetch a player's statistics for a season."""
+        url = self._player_stats_url(player_id, season)
+        response = self._make_request(url, params={"season": season})
+        return self._parse_espn_player_stats(response.json(), season)
+    
+    async def _afetch_player_stats(self, player_id: str, season: int) -> PlayerStats:
+        url = self._player_stats_url(player_id, season)
+        response = await self._amake_request(url, params={"season": season})
+        return self._parse_espn_player_stats(response.json(), season)
+    
+    def _player_stats_url(self, player_id: str, season: int) -> str:
+        logger.info(f"Fetching stats for player: {player_id}, season: {season}")
+        
+        if self.source == "espn":
+            url = self.api_endpoints.get("player_stats")
+            if not url:
+                raise DataNotFoundException("Player stats endpoint not configured")
+            
+            return url.format(player_id=player_id)
         
-        return stats_data
+        else:
+            raise SquirrelException(f"Stats endpoint not implemented for source: {self.source}")
+    
+    @staticmethod
+    def _players_tags(team_id: Optional[str]) -> List[str]:
+        return ["type:players", "players"] + ([f"team:{team_id}"] if team_id else [])
+    
+    @staticmethod
+    def _roster_tags(team_id: str) -> List[str]:
+        return ["type:roster", "players", f"team:{team_id}"]
+    
+    @staticmethod
+    def _merge_rosters(teams: List[Team], rosters: Dict[str, List[Player]]) -> List[Player]:
+        """Flatten rosters into one player list in team order."""
+        all_players = []
+        for team in teams:
+            all_players.extend(rosters.get(team.id, []))
+        return all_players
     
     def get_live_scores(self) -> List[GameScore]:
         """
         Fetch live game scores.
-        No caching for live data - always fetch fresh.
+        Live data skips the regular cache; scoreboards are only reused for the
+        source's SCORES_MICRO_CACHE_TTL (a second or two), and concurrent
+        callers share one upstream request.
         
         Returns:
             List of GameScore objects
         """
+        return self.scores_cache.get("scoreboard", self._fetch_live_scores)
+    
+    async def aget_live_scores(self) -> List[GameScore]:
+        """Async variant of get_live_scores; rate limiting never blocks the event loop."""
+        return await self.scores_cache.aget("scoreboard", self._afetch_live_scores)
+    
+    def _fetch_live_scores(self) -> List[GameScore]:
         logger.info("Fetching live scores")
         
         if self.source == "espn":
@@ -275,13 +632,30 @@ class FoolsballSquirrel(BaseSquirrel):
             if not url:
                 raise DataNotFoundException("Scoreboard endpoint not configured")
             
-            response = self._make_request(url)
+            # Live lane: bulk refreshes can't hold up score polling
+            with use_priority(PRIORITY_LIVE):
+                response = self._make_request(url)
             data = response.json()
             return self._parse_espn_scores(data)
         
         else:
             raise SquirrelException(f"Scoreboard not implemented for source: {self.source}")
     
+    async def _afetch_live_scores(self) -> List[GameScore]:
+        logger.info("Fetching live scores")
+        
+        if self.source == "espn":
+            url = self.api_endpoints.get("scoreboard")
+            if not url:
+                raise DataNotFoundException("Scoreboard endpoint not configured")
+            
+            with use_priority(PRIORITY_LIVE):
+                response = await self._amake_request(url)
+            return self._parse_espn_scores(response.json())
+        
+        else:
+            raise SquirrelException(f"Scoreboard not implemented for source: {self.source}")
+    
     # Parsing methods for ESPN API
     def _parse_espn_teams(self, data: Dict) -> List[Team]:
         """Parse ESPN teams API response."""
@@ -315,12 +689,95 @@ class FoolsballSquirrel(BaseSquirrel):
         logger.warning("NFL API parsing not fully implemented")
         return teams
     
-    def _fetch_team_roster(self, team_id: str) -> List[Player]:
-        """Fetch roster for a specific team from ESPN."""
-        roster_url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams/{team_id}/roster"
-        response = self._make_request(roster_url)
-        data = response.json()
+    def _roster_cache_key(self, team_id: str) -> str:
+        """Cache key for a single team's roster."""
+        return self._get_cache_key("foolsball", "roster", self.source, team_id)
+    
+    @staticmethod
+    def _roster_url(team_id: str) -> str:
+        return f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams/{team_id}/roster"
+    
+    def _cached_roster(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get the cached roster snapshot to revalidate, even if stale."""
+        if not self.cache:
+            return None
+        entry = self.cache.get_entry(cache_key)
+        return entry.value if entry is not None and isinstance(entry.value, dict) else None
+    
+    async def _acached_roster(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if not self.async_cache:
+            return None
+        entry = (await self.async_cache.get_entries([cache_key])).get(cache_key)
+        return entry.value if entry is not None and isinstance(entry.value, dict) else None
+    
+    def _fetch_team_roster(self, team_id: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fetch roster for a specific team from ESPN.
+        
+        Args:
+            team_id: Team ID
+            previous: Cached roster snapshot to revalidate, if any
         
+        Returns:
+            Roster snapshot: players plus the validators to revalidate it with
+        """
+        response = self._make_request(
+            self._roster_url(team_id), headers=self._roster_validators(previous)
+        )
+        return self._roster_snapshot(team_id, response, previous)
+    
+    async def _afetch_team_roster(self, team_id: str,
+                                  previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = await self._amake_request(
+            self._roster_url(team_id), headers=self._roster_validators(previous)
+        )
+        return self._roster_snapshot(team_id, response, previous)
+    
+    @staticmethod
+    def _roster_validators(previous: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        """Conditional request headers for a cached roster snapshot."""
+        if not previous:
+            return None
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+        return headers or None
+    
+    def _roster_snapshot(self, team_id: str, response: Any,
+                         previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the roster snapshot to cache from a (possibly conditional) response.
+        A 304, or a body identical to the cached one, reuses the cached players
+        without parsing.
+        """
+        not_modified = previous is not None and response.status_code == 304
+        if not_modified:
+            digest = previous.get('digest')
+            changed = False
+        else:
+            digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+            changed = previous is None or digest != previous.get('digest')
+        players = self._parse_espn_roster(team_id, response.json()) if changed else previous['players']
+        if previous is not None:
+            self._roster_refresh.record(team_id, not_modified, changed)
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not_modified:
+            # A 304 may omit validators that haven't changed
+            etag = etag or previous.get('etag')
+            last_modified = last_modified or previous.get('last_modified')
+        return {
+            'players': players,
+            'etag': etag,
+            'last_modified': last_modified,
+            'digest': digest
+        }
+    
+    def _parse_espn_roster(self, team_id: str, data: Dict) -> List[Player]:
+        """Parse ESPN team roster response."""
         players = []
         athletes = data.get("athletes", [])
         
@@ -415,21 +872,42 @@ class FoolsballSquirrel(BaseSquirrel):
     def refresh_player_data(self, player_id: Optional[str] = None):
         """
         Force refresh player data by invalidating cache.
+        Refreshing a single player drops both its details and its stats;
+        refreshing all players also drops every cached roster.
         
         Args:
             player_id: Optional specific player to refresh, or None for all
         """
         if player_id:
-            cache_key = self._get_cache_key("foolsball", "player", self.source, player_id)
-            self.invalidate_cache(cache_key)
+            self.invalidate_cache_tags([f"player:{player_id}"])
             logger.info(f"Refreshed cache for player: {player_id}")
         else:
-            # Invalidate all player caches
-            logger.info("Refreshing all player data caches")
-            # Note: This is a simple implementation - could be more sophisticated
-    
-    def refresh_team_data(self):
-        """Force refresh team data by invalidating cache."""
-        cache_key = self._get_cache_key("foolsball", "teams", self.source)
-        self.invalidate_cache(cache_key)
-        logger.info("Refreshed team data cache")
+            count = self.invalidate_cache_tags(["players"])
+            logger.info(f"Refreshed all player data caches ({count} entries)")
+    
+    def refresh_team_data(self, team_id: Optional[str] = None):
+        """
+        Force refresh team data by invalidating cache.
+        
+        Args:
+            team_id: Optional team whose roster should be refreshed, or None
+                to refresh the team list
+        """
+        if team_id:
+            self.invalidate_cache_tags([f"team:{team_id}"])
+            logger.info(f"Refreshed cache for team: {team_id}")
+        else:
+            self.invalidate_cache_tags(["type:teams"])
+            logger.info("Refreshed team data cache")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get roster refresh statistics (teams checked and changed per refresh
+        cycle), live scores micro-cache statistics (client vs upstream QPS)
+        and player index statistics.
+        """
+        return {
+            'roster_refresh': self._roster_refresh.get_stats(),
+            'live_scores': self.scores_cache.get_stats(),
+            'player_index': self.player_index.get_stats()
+        }
@@ -29,6 +29,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+JSEARCH_URL = f"https://{JSEARCH_API_HOST}/search"
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+
 
 class JobsSquirrel(BaseSquirrel):
     """
@@ -52,7 +55,9 @@ class JobsSquirrel(BaseSquirrel):
         """
         super().__init__(
             cache_enabled=cache_enabled,
-            rate_limit_enabled=rate_limit_enabled
+            rate_limit_enabled=rate_limit_enabled,
+            cache_namespace="jobs",
+            upstream_host=JSEARCH_API_HOST
         )
         
         self.api_key = api_key or JSEARCH_API_KEY or os.getenv("JSEARCH_API_KEY")
@@ -78,30 +83,80 @@ class JobsSquirrel(BaseSquirrel):
         Raises:
             SquirrelException: If search fails
         """
-        cache_key = f"job_search:{query.keywords}:{query.location}:{query.page}"
+        cache_key = self._search_cache_key(query)
         
         # Check cache first
         if self.cache_enabled:
             cached = self.cache.get(cache_key)
             if cached:
                 logger.info(f"Cache hit for job search: {cache_key}")
-                return [JobPosting.from_dict(job) for job in cached]
+                return self._to_postings(cached)
         
         # Rate limiting
-        if self.rate_limit_enabled:
-            self.rate_limiter.wait_if_needed()
+        rate_limiter = self._get_rate_limiter(JSEARCH_URL)
+        if rate_limiter:
+            rate_limiter.wait_if_needed()
         
-        # Make API request
-        url = f"https://{JSEARCH_API_HOST}/search"
-        headers = {
+        return self._fetch_jobs(query, cache_key)
+    
+    async def asearch_jobs(self, query: JobSearchQuery) -> List[JobPosting]:
+        """
+        Async variant of search_jobs. The cache lookup, rate limiting and the
+        API call are all awaited, so a slow search never blocks the event loop.
+        """
+        cache_key = self._search_cache_key(query)
+        
+        if self.cache_enabled:
+            cached = await self.async_cache.get(cache_key)
+            if cached:
+                logger.info(f"Cache hit for job search: {cache_key}")
+                return self._to_postings(cached)
+        
+        params = query.to_params()
+        logger.info(f"Searching jobs: {params['query']}")
+        try:
+            response = await self._amake_request(JSEARCH_URL, headers=self._jsearch_headers(), params=params)
+        except SquirrelException as e:
+            logger.error(f"Job search failed: {e}")
+            raise
+        
+        jobs = self._parse_job_response(response.json())
+        if self.cache_enabled:
+            await self.async_cache.set(cache_key, jobs, ttl=CACHE_TTL_JOB_DATA, tags=["type:search"])
+        
+        logger.info(f"Found {len(jobs)} job postings")
+        return jobs
+    
+    def _jsearch_headers(self) -> Dict[str, str]:
+        return {
             "x-rapidapi-key": self.api_key,
             "x-rapidapi-host": JSEARCH_API_HOST
         }
+    
+    def _search_cache_key(self, query: JobSearchQuery) -> str:
+        return self._get_cache_key("jobs", "search", query.keywords, query.location, query.page)
+    
+    @staticmethod
+    def _to_postings(cached: List[Any]) -> List[JobPosting]:
+        """Restore cached results (JSON codecs return plain dicts)."""
+        return [
+            job if isinstance(job, JobPosting) else JobPosting.from_dict(job)
+            for job in cached
+        ]
+    
+    def _fetch_jobs(self, query: JobSearchQuery, cache_key: str) -> List[JobPosting]:
+        """Call the JSearch API (already rate limited) and cache the results."""
+        # Make API request
+        url = JSEARCH_URL
+        headers = self._jsearch_headers()
         params = query.to_params()
         
         try:
             logger.info(f"Searching jobs: {params['query']}")
             response = self.session.get(url, headers=headers, params=params)
+            rate_limiter = self._get_rate_limiter(url)
+            if rate_limiter:
+                rate_limiter.observe_headers(response.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -109,11 +164,7 @@ class JobsSquirrel(BaseSquirrel):
             
             # Cache results
             if self.cache_enabled:
-                self.cache.set(
-                    cache_key,
-                    [job.to_dict() for job in jobs],
-                    ttl=CACHE_TTL_JOB_DATA
-                )
+                self.cache.set(cache_key, jobs, ttl=CACHE_TTL_JOB_DATA, tags=["type:search"])
             
             logger.info(f"Found {len(jobs)} job postings")
             return jobs
@@ -411,6 +462,11 @@ Make the letter concise, enthusiastic, and tailored to the role.
             
             logger.info(f"Generating cover letter for {job.title} at {job.company}")
             
+            # The OpenAI client has its own connection pool, but shares our budget for the host
+            rate_limiter = self._get_rate_limiter(OPENAI_URL)
+            if rate_limiter:
+                rate_limiter.wait_if_needed()
+            
             response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
@@ -1,14 +1,50 @@
 """
 Utils module for caching and rate limiting.
 """
-from .cache import Cache, InMemoryCache, RedisCache, CacheBackend
-from .rate_limiter import RateLimiter, AdaptiveRateLimiter
+from .cache import (
+    Cache, CacheEntry, InMemoryCache, StripedInMemoryCache, RedisCache, TieredCache, CacheBackend
+)
+from .async_cache import AsyncCache, AsyncCacheBackend, AsyncRedisCache
+from .metrics import CacheMetrics, LatencyHistogram, RateMeter, track_cache_lookups
+from .codec import Codec, JsonCodec, MsgpackCodec, CodecError, create_codec
+from .rate_limiter import (
+    RateLimiter, AdaptiveRateLimiter, parse_rate_limit_headers, request_priority, use_priority,
+    PRIORITY_INTERACTIVE, PRIORITY_LIVE, PRIORITY_BACKGROUND
+)
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .fanout import FanOut
+from .micro_cache import MicroCache
 
 __all__ = [
     'Cache',
+    'CacheEntry',
     'InMemoryCache', 
+    'StripedInMemoryCache',
     'RedisCache',
+    'TieredCache',
     'CacheBackend',
+    'AsyncCache',
+    'AsyncCacheBackend',
+    'AsyncRedisCache',
+    'CacheMetrics',
+    'LatencyHistogram',
+    'RateMeter',
+    'track_cache_lookups',
+    'Codec',
+    'JsonCodec',
+    'MsgpackCodec',
+    'CodecError',
+    'create_codec',
     'RateLimiter',
     'AdaptiveRateLimiter',
+    'parse_rate_limit_headers',
+    'request_priority',
+    'use_priority',
+    'PRIORITY_INTERACTIVE',
+    'PRIORITY_LIVE',
+    'PRIORITY_BACKGROUND',
+    'SingleFlight',
+    'AsyncSingleFlight',
+    'FanOut',
+    'MicroCache',
 ]
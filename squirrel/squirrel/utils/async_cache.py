@@ -0,0 +1,751 @@
+"""
+Async caching utilities for squirrel service.
+Lets async request handlers read and write the cache without blocking the
+event loop. Redis access goes through redis.asyncio with a pooled client.
+"""
+import asyncio
+import json
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Tuple
+import logging
+
+from .cache import (
+    Cache, CacheBackend, CacheEntry, InMemoryCache, RedisCache, StripedInMemoryCache,
+    TieredCache
+)
+from .codec import Codec, JsonCodec
+from .fanout import FanOut
+from .rate_limiter import PRIORITY_BACKGROUND, use_priority
+from .singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCacheBackend:
+    """Base class for async cache backends."""
+    
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+    
+    async def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        raise NotImplementedError
+    
+    async def delete(self, key: str) -> bool:
+        raise NotImplementedError
+    
+    async def clear(self) -> bool:
+        raise NotImplementedError
+    
+    async def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags and return the deleted keys."""
+        raise NotImplementedError
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values. Missing keys are omitted from the result."""
+        result = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+    
+    async def set_many(self, items: Dict[str, Any], ttl: float,
+                       tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values with the same TTL and optional per-key tags."""
+        tags = tags or {}
+        ok = True
+        for key, value in items.items():
+            ok = await self.set(key, value, ttl, tags.get(key)) and ok
+        return ok
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys and return how many existed."""
+        return sum([await self.delete(key) for key in keys])
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+    
+    async def close(self):
+        """Release resources held by the backend."""
+        pass
+
+
+class AsyncMemoryCache(AsyncCacheBackend):
+    """
+    Async view of an in-process cache backend.
+    In-process operations never wait on I/O, so they run inline. The wrapped
+    backend is shared with the sync Cache, so both see the same entries.
+    """
+    
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+    
+    async def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+    
+    async def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        return self.backend.set(key, value, ttl, tags)
+    
+    async def delete(self, key: str) -> bool:
+        return self.backend.delete(key)
+    
+    async def clear(self) -> bool:
+        return self.backend.clear()
+    
+    async def invalidate_tags(self, tags: List[str]) -> List[str]:
+        return self.backend.invalidate_tags(tags)
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        return self.backend.get_many(keys)
+    
+    async def set_many(self, items: Dict[str, Any], ttl: float,
+                       tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        return self.backend.set_many(items, ttl, tags)
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        return self.backend.delete_many(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'memory'}
+
+
+class AsyncThreadedCache(AsyncMemoryCache):
+    """
+    Async view of a blocking backend (e.g. the on-disk tier).
+    Operations run in worker threads so slow disk I/O or lock waits never
+    stall the event loop.
+    """
+    
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.backend.get, key)
+    
+    async def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        return await asyncio.to_thread(self.backend.set, key, value, ttl, tags)
+    
+    async def delete(self, key: str) -> bool:
+        return await asyncio.to_thread(self.backend.delete, key)
+    
+    async def clear(self) -> bool:
+        return await asyncio.to_thread(self.backend.clear)
+    
+    async def invalidate_tags(self, tags: List[str]) -> List[str]:
+        return await asyncio.to_thread(self.backend.invalidate_tags, tags)
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.backend.get_many, keys)
+    
+    async def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        return await asyncio.to_thread(self.backend.get_many_with_ttl, keys)
+    
+    async def set_many(self, items: Dict[str, Any], ttl: float,
+                       tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        return await asyncio.to_thread(self.backend.set_many, items, ttl, tags)
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        return await asyncio.to_thread(self.backend.delete_many, keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'threaded'}
+
+
+class AsyncRedisCache(AsyncCacheBackend):
+    """
+    Redis cache on redis.asyncio with a bounded connection pool.
+    Uses the same key layout, tag sets and codec as RedisCache, so sync and
+    async callers share entries.
+    """
+    
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 codec: Optional[Codec] = None, key_prefix: str = 'squirrel:',
+                 tag_ttl: int = 172800, max_connections: int = 50):
+        """
+        Initialize async Redis cache. Connections are opened lazily.
+        
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Redis database number
+            codec: Value codec (JSON if not provided)
+            key_prefix: Prefix for every key written by this cache
+            tag_ttl: Minimum lifetime of tag sets; should cover the longest entry TTL
+            max_connections: Maximum pooled connections
+        """
+        import redis.asyncio as aioredis
+        
+        self.codec = codec or JsonCodec()
+        self.key_prefix = key_prefix
+        self.tag_ttl = tag_ttl
+        self.max_connections = max_connections
+        self.pool = aioredis.ConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=max_connections,
+            decode_responses=False
+        )
+        self.redis_client = aioredis.Redis(connection_pool=self.pool)
+        self._invalidate_tags = self.redis_client.register_script(
+            RedisCache._INVALIDATE_TAGS_SCRIPT
+        )
+    
+    @classmethod
+    def from_sync(cls, cache: RedisCache, max_connections: int = 50) -> 'AsyncRedisCache':
+        """Create an async client for the same Redis database and key layout."""
+        return cls(
+            cache.host, cache.port, cache.db,
+            codec=cache.codec,
+            key_prefix=cache.key_prefix,
+            tag_ttl=cache.tag_ttl,
+            max_connections=max_connections
+        )
+    
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}tag:{tag}"
+    
+    def _add_tags(self, pipe, key: str, tags: Optional[List[str]], ttl: float):
+        """Queue tag set updates for a key on a pipeline."""
+        for tag in tags or ():
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, self._key(key))
+            pipe.expire(tag_key, max(int(ttl), self.tag_ttl))
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from Redis cache."""
+        try:
+            value = await self.redis_client.get(self._key(key))
+            if value:
+                logger.debug(f"Cache hit: {key}")
+                return self.codec.decode(value)
+            return None
+        except Exception as e:
+            logger.error(f"Redis get error: {e}")
+            return None
+    
+    async def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        """Set value in Redis cache with TTL and optional tags."""
+        # SETEX only takes whole seconds, at least one
+        ttl = max(1, int(ttl))
+        try:
+            serialized = self.codec.encode(value)
+            if tags:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.setex(self._key(key), ttl, serialized)
+                    self._add_tags(pipe, key, tags, ttl)
+                    await pipe.execute()
+            else:
+                await self.redis_client.setex(self._key(key), ttl, serialized)
+            logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
+            return True
+        except Exception as e:
+            logger.error(f"Redis set error: {e}")
+            return False
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values with a single MGET."""
+        if not keys:
+            return {}
+        try:
+            values = await self.redis_client.mget([self._key(key) for key in keys])
+            return {
+                key: self.codec.decode(value)
+                for key, value in zip(keys, values) if value
+            }
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return {}
+    
+    async def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """Get multiple values and their remaining TTLs in one pipelined round trip."""
+        if not keys:
+            return {}
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(self._key(key))
+                    pipe.pttl(self._key(key))
+                replies = await pipe.execute()
+            result = {}
+            for i, key in enumerate(keys):
+                value, pttl = replies[2 * i], replies[2 * i + 1]
+                if value:
+                    ttl = pttl / 1000.0 if pttl and pttl > 0 else None
+                    result[key] = (self.codec.decode(value), ttl)
+            return result
+        except Exception as e:
+            logger.error(f"Redis pipelined get error: {e}")
+            return {}
+    
+    async def set_many(self, items: Dict[str, Any], ttl: float,
+                       tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values (and their tags) in one pipelined round trip."""
+        if not items:
+            return True
+        tags = tags or {}
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(self._key(key), max(1, int(ttl)), self.codec.encode(value))
+                    self._add_tags(pipe, key, tags.get(key), ttl)
+                await pipe.execute()
+            logger.debug(f"Cache set: {len(items)} keys (TTL: {ttl}s)")
+            return True
+        except Exception as e:
+            logger.error(f"Redis pipelined set error: {e}")
+            return False
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys with a single DEL."""
+        if not keys:
+            return 0
+        try:
+            return int(await self.redis_client.delete(*[self._key(key) for key in keys]))
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+            return 0
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from Redis cache."""
+        return bool(await self.delete_many([key]))
+    
+    async def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags in one atomic script call."""
+        if not tags:
+            return []
+        try:
+            deleted = await self._invalidate_tags(keys=[self._tag_key(tag) for tag in tags])
+            prefix_length = len(self.key_prefix)
+            return list({
+                (member.decode() if isinstance(member, bytes) else member)[prefix_length:]
+                for member in deleted
+            })
+        except Exception as e:
+            logger.error(f"Redis tag invalidation error: {e}")
+            return []
+    
+    async def clear(self) -> bool:
+        """Clear all keys under this cache's prefix (never the whole database)."""
+        try:
+            if not self.key_prefix:
+                await self.redis_client.flushdb()
+                return True
+            batch = []
+            async for redis_key in self.redis_client.scan_iter(
+                match=f"{self.key_prefix}*", count=1000
+            ):
+                batch.append(redis_key)
+                if len(batch) >= 1000:
+                    await self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                await self.redis_client.unlink(*batch)
+            return True
+        except Exception as e:
+            logger.error(f"Redis clear error: {e}")
+            return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics."""
+        return {
+            'backend': 'redis',
+            'max_connections': self.max_connections,
+            'pool_connections': len(getattr(self.pool, '_in_use_connections', ()))
+            + len(getattr(self.pool, '_available_connections', ()))
+        }
+    
+    async def close(self):
+        """Close the Redis connection pool."""
+        try:
+            await self.redis_client.aclose()
+        except AttributeError:
+            await self.redis_client.close()
+        except Exception as e:
+            logger.error(f"Redis close error: {e}")
+
+
+class AsyncTieredCache(AsyncCacheBackend):
+    """
+    Async view of a TieredCache.
+    Shares the sync tier's in-process L1, so the sync tier's invalidation
+    listener keeps it coherent. With a Redis L2 it publishes its own writes
+    with the sync tier's origin id so this worker does not process them twice.
+    """
+    
+    def __init__(self, tiered: TieredCache, l2: AsyncCacheBackend):
+        """
+        Initialize async tiered cache.
+        
+        Args:
+            tiered: Sync tiered cache whose L1 and channel are shared
+            l2: Async view of the shared L2 providing get_many_with_ttl
+        """
+        self.tiered = tiered
+        self.l1 = tiered.l1
+        self.l2 = l2
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from L1, falling back to L2 and filling L1."""
+        return (await self.get_many([key])).get(key)
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values, reading L1 first and L2 for the rest in one round trip."""
+        result = self.l1.get_many(keys)
+        self.tiered.l1_hits += len(result)
+        
+        missing = [key for key in keys if key not in result]
+        if missing:
+            found = await self.l2.get_many_with_ttl(missing)
+            self.tiered.l2_hits += len(found)
+            self.tiered.misses += len(missing) - len(found)
+            for key, (value, ttl) in found.items():
+                self.l1.set(key, value, self.tiered._l1_ttl(ttl))
+                result[key] = value
+        return result
+    
+    async def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        """Write value through to L2 and L1."""
+        return await self.set_many({key: value}, ttl, {key: tags} if tags else None)
+    
+    async def set_many(self, items: Dict[str, Any], ttl: float,
+                       tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Write multiple values through to L2 and L1."""
+        if not await self.l2.set_many(items, ttl, tags):
+            self.l1.delete_many(list(items))
+            return False
+        self.l1.set_many(items, self.tiered._l1_ttl(ttl))
+        await self._publish({'keys': list(items)})
+        return True
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys from both tiers."""
+        self.l1.delete_many(keys)
+        result = await self.l2.delete_many(keys)
+        await self._publish({'keys': list(keys)})
+        return result
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from both tiers."""
+        return bool(await self.delete_many([key]))
+    
+    async def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete tagged keys from L2 and drop them from every worker's L1."""
+        keys = await self.l2.invalidate_tags(tags)
+        if keys:
+            self.l1.delete_many(keys)
+            await self._publish({'keys': keys})
+        return keys
+    
+    async def clear(self) -> bool:
+        """Clear both tiers."""
+        self.l1.clear()
+        result = await self.l2.clear()
+        await self._publish({'clear': True})
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': 'tiered', 'l2': self.l2.get_stats()}
+    
+    async def close(self):
+        await self.l2.close()
+    
+    async def _publish(self, message: Dict[str, Any]):
+        """Tell other workers to drop their L1 copies."""
+        if not isinstance(self.l2, AsyncRedisCache):
+            return
+        message['origin'] = self.tiered.origin
+        try:
+            await self.l2.redis_client.publish(self.tiered.channel, json.dumps(message))
+            self.tiered.invalidations_sent += 1
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+
+class AsyncCache:
+    """
+    Async cache facade over the same storage as a sync Cache.
+    Shares the sync cache's namespace, tags and stale-value envelopes, so
+    entries written by either side are served by both. Misses are coalesced
+    per key with AsyncSingleFlight; sync and async callers coalesce
+    separately.
+    """
+    
+    def __init__(self, cache: Cache, max_connections: int = 50):
+        """
+        Initialize async cache.
+        
+        Args:
+            cache: Sync cache whose backend and namespace are shared
+            max_connections: Maximum pooled Redis connections
+        """
+        self.cache = cache
+        self.metrics = cache.metrics
+        self.backend = self._create_backend(cache.backend, max_connections)
+        self._flight = AsyncSingleFlight()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stale_served = 0
+        self.stale_if_error_served = 0
+        self.background_refreshes = 0
+        self.refresh_errors = 0
+    
+    @staticmethod
+    def _create_backend(backend: CacheBackend, max_connections: int) -> AsyncCacheBackend:
+        """Pick the async counterpart of a sync backend."""
+        if isinstance(backend, TieredCache):
+            if isinstance(backend.l2, RedisCache):
+                l2 = AsyncRedisCache.from_sync(backend.l2, max_connections)
+            else:
+                l2 = AsyncThreadedCache(backend.l2)
+            return AsyncTieredCache(backend, l2)
+        if isinstance(backend, RedisCache):
+            return AsyncRedisCache.from_sync(backend, max_connections)
+        if isinstance(backend, (InMemoryCache, StripedInMemoryCache)):
+            return AsyncMemoryCache(backend)
+        return AsyncThreadedCache(backend)
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if it is fresh."""
+        entry = await self.get_entry(key)
+        if entry is None or not entry.is_fresh:
+            self.metrics.record_lookup(key, 'misses')
+            return None
+        self.metrics.record_lookup(key, 'hits')
+        return entry.value
+    
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get value from cache with its freshness metadata, including stale values."""
+        with self.metrics.timed('get'):
+            stored = await self.backend.get(key)
+        if stored is None:
+            return None
+        return CacheEntry.from_stored(stored)
+    
+    async def get_entries(self, keys: List[str]) -> Dict[str, CacheEntry]:
+        """Get multiple entries with their freshness metadata in one backend call."""
+        with self.metrics.timed('get'):
+            stored_items = await self.backend.get_many(keys)
+        return {
+            key: CacheEntry.from_stored(stored)
+            for key, stored in stored_items.items()
+        }
+    
+    async def set(self, key: str, value: Any, ttl: int,
+                  stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                  tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with TTL (seconds); see Cache.set."""
+        stored, backend_ttl = self.cache._wrap(value, ttl, stale_while_revalidate, stale_if_error)
+        self.metrics.record(key, 'sets')
+        with self.metrics.timed('set'):
+            return await self.backend.set(key, stored, backend_ttl, self.cache._scope_tags(tags))
+    
+    async def set_many(self, items: Dict[str, Any], ttl: int,
+                       stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                       tags: Optional[Callable[[str], List[str]]] = None) -> bool:
+        """Set multiple values with the same TTL and stale windows; see Cache.set_many."""
+        if not items:
+            return True
+        backend_ttl = ttl
+        stored_items = {}
+        stored_tags = {}
+        for key, value in items.items():
+            stored_items[key], backend_ttl = self.cache._wrap(
+                value, ttl, stale_while_revalidate, stale_if_error
+            )
+            stored_tags[key] = self.cache._scope_tags(tags(key) if tags else None)
+            self.metrics.record(key, 'sets')
+        with self.metrics.timed('set'):
+            return await self.backend.set_many(stored_items, backend_ttl, stored_tags)
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache."""
+        return await self.backend.delete(key)
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every entry in this namespace carrying any of the tags."""
+        keys = await self.backend.invalidate_tags(
+            self.cache._scope_tags(tags, include_namespace=False)
+        )
+        return len(keys)
+    
+    async def get_or_set(self, key: str, func: Callable[[], Awaitable[Any]], ttl: int,
+                         stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                         tags: Optional[List[str]] = None) -> Any:
+        """
+        Get from cache or await func() and cache the result.
+        Same semantics as Cache.get_or_set: concurrent misses share one call,
+        None results are not cached, and stale values are served inside the
+        stale_while_revalidate and stale_if_error windows.
+        """
+        entry = await self.get_entry(key)
+        if entry is not None:
+            if entry.is_fresh:
+                self.metrics.record_lookup(key, 'hits')
+                return entry.value
+            if entry.can_revalidate:
+                self.stale_served += 1
+                self.metrics.record_lookup(key, 'stale_hits')
+                self._refresh_in_background(
+                    key, func, ttl, stale_while_revalidate, stale_if_error, tags
+                )
+                return entry.value
+        
+        async def load():
+            # A previous flight may have filled the cache since our lookup
+            current = await self.get_entry(key)
+            if current is not None and current.is_fresh:
+                return current.value
+            
+            value = await func()
+            if value is not None:
+                await self.set(key, value, ttl, stale_while_revalidate, stale_if_error, tags)
+            return value
+        
+        try:
+            value, shared = await self._flight.do(key, load)
+        except Exception as e:
+            if entry is None:
+                self.metrics.record_lookup(key, 'misses')
+                raise
+            self.stale_if_error_served += 1
+            self.metrics.record_lookup(key, 'stale_on_error')
+            logger.warning(f"Serving stale value for {key} after refresh error: {e}")
+            return entry.value
+        self.metrics.record_lookup(key, 'coalesced' if shared else 'misses')
+        return value
+    
+    async def get_or_set_many(self, keys: List[str], func: Callable[[str], Awaitable[Any]],
+                              ttl: int, stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                              tags: Optional[Callable[[str], List[str]]] = None,
+                              fanout: Optional[FanOut] = None,
+                              on_error: Optional[Callable[[str, Exception], None]] = None
+                              ) -> Dict[str, Any]:
+        """
+        Bulk variant of get_or_set; see Cache.get_or_set_many.
+        
+        Returns:
+            Mapping of key to value for every key with a non-None value
+        """
+        entries = await self.get_entries(keys)
+        result: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            entry = entries.get(key)
+            if entry is not None and entry.is_fresh:
+                self.metrics.record_lookup(key, 'hits')
+                result[key] = entry.value
+            elif entry is not None and entry.can_revalidate:
+                self.stale_served += 1
+                self.metrics.record_lookup(key, 'stale_hits')
+                self._refresh_in_background(
+                    key, lambda k=key: func(k), ttl, stale_while_revalidate, stale_if_error,
+                    tags(key) if tags else None
+                )
+                result[key] = entry.value
+            else:
+                missing.append(key)
+        
+        async def load(key: str) -> Tuple[Any, bool]:
+            async def fetch():
+                # A previous flight may have filled the cache since our lookup
+                current = await self.get_entry(key)
+                if current is not None and current.is_fresh:
+                    return current.value
+                
+                value = await func(key)
+                if value is not None:
+                    await self.set(key, value, ttl, stale_while_revalidate, stale_if_error,
+                                   tags(key) if tags else None)
+                return value
+            
+            return await self._flight.do(key, fetch)
+        
+        if fanout is not None:
+            loaded, failed = await fanout.amap(missing, load)
+        else:
+            loaded, failed = {}, {}
+            for key in missing:
+                try:
+                    loaded[key] = await load(key)
+                except Exception as e:
+                    failed[key] = e
+                    # Nothing to fall back on, so the batch fails here
+                    if on_error is None and key not in entries:
+                        break
+        
+        error: Optional[Exception] = None
+        for key in missing:
+            if key in failed:
+                e = failed[key]
+                entry = entries.get(key)
+                if entry is None:
+                    self.metrics.record_lookup(key, 'misses')
+                    if on_error is None:
+                        error = error or e
+                    else:
+                        on_error(key, e)
+                    continue
+                self.stale_if_error_served += 1
+                self.metrics.record_lookup(key, 'stale_on_error')
+                logger.warning(f"Serving stale value for {key} after refresh error: {e}")
+                result[key] = entry.value
+            elif key in loaded:
+                value, shared = loaded[key]
+                self.metrics.record_lookup(key, 'coalesced' if shared else 'misses')
+                if value is not None:
+                    result[key] = value
+        
+        if error is not None:
+            raise error
+        return result
+    
+    def _refresh_in_background(self, key: str, func: Callable[[], Awaitable[Any]], ttl: int,
+                               stale_while_revalidate: int, stale_if_error: int,
+                               tags: Optional[List[str]] = None):
+        """Schedule a single background refresh task for a stale key."""
+        if key in self._refreshing:
+            return
+        
+        async def load():
+            value = await func()
+            if value is not None:
+                await self.set(key, value, ttl, stale_while_revalidate, stale_if_error, tags)
+            return value
+        
+        async def refresh():
+            try:
+                # The task runs in a copy of the caller's context, so this stays local to it
+                with use_priority(PRIORITY_BACKGROUND):
+                    await self._flight.do(key, load)
+                self.background_refreshes += 1
+                logger.debug(f"Background refresh complete: {key}")
+            except Exception as e:
+                # The stale value stays in place until its hard TTL
+                self.refresh_errors += 1
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+        
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get async backend, request coalescing and staleness statistics.
+        Hit/miss metrics are shared with the sync Cache and reported there.
+        """
+        return {
+            'backend': self.backend.get_stats(),
+            'singleflight': self._flight.get_stats(),
+            'stale': {
+                'served_while_revalidating': self.stale_served,
+                'served_on_error': self.stale_if_error_served,
+                'background_refreshes': self.background_refreshes,
+                'refresh_errors': self.refresh_errors
+            }
+        }
+    
+    async def close(self):
+        """Cancel pending background refreshes and release the backend."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        await self.backend.close()
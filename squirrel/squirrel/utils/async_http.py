@@ -0,0 +1,263 @@
+"""
+Async HTTP transport for squirrel service.
+Lets async request handlers call upstream APIs on the event loop instead of
+tying up a worker thread per request. Built on httpx, with HTTP/2 when the
+h2 package is installed.
+"""
+import asyncio
+import importlib.util
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from typing import Optional, Any, Dict, Iterable, Mapping
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose Retry-After header is honoured between retries (as in urllib3)
+_RETRY_AFTER_STATUSES = frozenset({413, 429, 503})
+
+# Longest backoff between retries, in seconds (as in urllib3)
+_BACKOFF_MAX = 120.0
+
+
+class AsyncHttpClient:
+    """
+    Pooled async HTTP client with the retry policy of the blocking session.
+    
+    Failed connections and responses in status_forcelist are retried up to
+    `retries` times, waiting backoff_factor * 2 ** (n - 1) seconds before the
+    n-th retry (none before the first) or the response's Retry-After.
+    Connections are kept alive in one pool; hosts in host_limits are also
+    capped at that many requests in flight, mirroring the per-host pool
+    sizes of the blocking session.
+    
+    httpx clients are tied to the event loop they first run on, so the
+    underlying client is recreated if used from a different loop, and the
+    old one is closed on its own loop. A client whose loop has already
+    closed can no longer be closed, so call aclose() before the loop ends
+    (the app does so on shutdown).
+    """
+    
+    def __init__(
+        self,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff_factor: float = 0.0,
+        status_forcelist: Iterable[int] = (500, 502, 503, 504),
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        host_limits: Optional[Dict[str, int]] = None,
+        transport: Any = None
+    ):
+        """
+        Initialize async HTTP client.
+        
+        Args:
+            headers: Default headers sent with every request
+            timeout: Default timeout in seconds (connect, read, write and pool wait)
+            retries: Maximum number of retries per request
+            backoff_factor: Base of the exponential backoff between retries
+            status_forcelist: Response statuses that are retried
+            max_connections: Maximum open connections across all hosts
+            max_keepalive_connections: Maximum idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept alive
+            http2: Negotiate HTTP/2 where the server supports it (needs h2)
+            host_limits: Maximum requests in flight per host
+            transport: httpx transport to use instead of the network (for tests)
+        
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        import httpx
+        self._httpx = httpx
+        
+        if http2 and importlib.util.find_spec('h2') is None:
+            logger.warning("h2 package not installed. Async HTTP client uses HTTP/1.1.")
+            http2 = False
+        
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = frozenset(status_forcelist)
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.host_limits = dict(host_limits or {})
+        self._transport = transport
+        
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.http_versions: Dict[str, int] = {}
+    
+    def _get_client(self):
+        """Get the client for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                self._retire_client(self._client, self._loop)
+            self._client = self._httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                follow_redirects=True,
+                transport=self._transport
+            )
+            self._loop = loop
+            self._host_semaphores = {}
+        return self._client
+    
+    def _retire_client(self, client, loop: asyncio.AbstractEventLoop):
+        """Close a client created on another event loop, on that loop."""
+        if loop.is_closed():
+            # Its connections can only be closed on the loop that opened them
+            logger.warning(
+                "Async HTTP client dropped after its event loop closed, leaking its connections; "
+                "call aclose() before the loop ends"
+            )
+            return
+        # Runs now if the loop is running in another thread, else when it next runs
+        asyncio.run_coroutine_threadsafe(self._close_client(client), loop)
+    
+    @staticmethod
+    async def _close_client(client):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.error(f"Async HTTP client close error: {e}")
+    
+    def _host_semaphore(self, host: str) -> Optional[asyncio.Semaphore]:
+        limit = self.host_limits.get(host)
+        if limit is None:
+            return None
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+    
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Send a request, retrying failed connections and retryable statuses.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: URL to request
+            headers: Additional headers (None values are dropped)
+            params: Query parameters (None values are dropped)
+            json: JSON request body
+            timeout: Request timeout in seconds (overrides the default)
+        
+        Returns:
+            httpx.Response of the last attempt, whatever its status
+        
+        Raises:
+            httpx.TransportError: If the last attempt failed to get a response
+        """
+        client = self._get_client()
+        request_timeout = timeout or self.timeout
+        # requests drops None values, so callers written for it may send them
+        if headers:
+            headers = {name: value for name, value in headers.items() if value is not None}
+        if params:
+            params = {name: value for name, value in params.items() if value is not None}
+        semaphore = self._host_semaphore(self._httpx.URL(url).host)
+        
+        attempt = 0
+        while True:
+            self.requests += 1
+            try:
+                async with semaphore or nullcontext():
+                    response = await client.request(
+                        method, url, headers=headers, params=params, json=json,
+                        timeout=request_timeout
+                    )
+            except self._httpx.TransportError as e:
+                if attempt >= self.retries:
+                    self.failures += 1
+                    raise
+                attempt += 1
+                self.retried += 1
+                logger.debug(f"Retrying {method} {url} after {e!r} (retry {attempt}/{self.retries})")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+            if response.status_code not in self.status_forcelist or attempt >= self.retries:
+                return response
+            
+            attempt += 1
+            self.retried += 1
+            delay = self._backoff(attempt)
+            if response.status_code in _RETRY_AFTER_STATUSES:
+                delay = self._retry_after(response.headers.get('Retry-After'), delay)
+            logger.debug(
+                f"Retrying {method} {url} after status {response.status_code} "
+                f"(retry {attempt}/{self.retries}, waiting {delay:.2f}s)"
+            )
+            await asyncio.sleep(delay)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Delay before the given retry: none before the first, then exponential."""
+        if attempt <= 1:
+            return 0.0
+        return min(_BACKOFF_MAX, self.backoff_factor * 2 ** (attempt - 1))
+    
+    @staticmethod
+    def _retry_after(value: Optional[str], default: float) -> float:
+        """Seconds to wait from a Retry-After header (seconds or HTTP date)."""
+        if not value:
+            return default
+        try:
+            return min(_BACKOFF_MAX, max(0.0, float(value)))
+        except ValueError:
+            pass
+        try:
+            return min(_BACKOFF_MAX, max(0.0, parsedate_to_datetime(value).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return default
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transport statistics."""
+        return {
+            'transport': 'httpx',
+            'http2': self.http2,
+            'requests': self.requests,
+            'retries': self.retried,
+            'failures': self.failures,
+            'http_versions': dict(self.http_versions),
+            'max_connections': self.limits.max_connections,
+            'host_limits': self.host_limits
+        }
+    
+    async def aclose(self):
+        """Close the pooled connections."""
+        if self._client is None:
+            return
+        client, loop = self._client, self._loop
+        self._client = None
+        self._loop = None
+        if loop is asyncio.get_running_loop():
+            await self._close_client(client)
+        else:
+            self._retire_client(client, loop)
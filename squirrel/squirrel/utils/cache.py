@@ -2,22 +2,98 @@
 Caching utilities for squirrel service.
 Supports both in-memory and Redis caching.
 """
+import asyncio
+import heapq
 import json
+import sys
+import threading
 import time
-from typing import Optional, Any, Dict
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Any, Callable, Dict, List, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from .codec import Codec, JsonCodec
+from .fanout import FanOut
+from .metrics import CacheMetrics
+from .rate_limiter import PRIORITY_BACKGROUND, use_priority
+from .singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+# Marker for values stored with stale-while-revalidate metadata
+_ENVELOPE_KEY = '__squirrel_swr__'
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its freshness metadata."""
+    value: Any
+    fresh_until: Optional[float] = None
+    revalidate_until: Optional[float] = None
+    
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the value is within its soft TTL."""
+        return self.fresh_until is None or time.time() < self.fresh_until
+    
+    @property
+    def can_revalidate(self) -> bool:
+        """Whether the stale value may be served while refreshing in the background."""
+        return self.revalidate_until is not None and time.time() < self.revalidate_until
+    
+    @classmethod
+    def from_stored(cls, stored: Any) -> 'CacheEntry':
+        """Build an entry from a raw backend value."""
+        if isinstance(stored, dict) and stored.get(_ENVELOPE_KEY):
+            return cls(
+                value=stored['value'],
+                fresh_until=stored['fresh_until'],
+                revalidate_until=stored['revalidate_until']
+            )
+        return cls(value=stored)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the resident size of a value in bytes.
+    Walks containers, dataclasses and pydantic models recursively.
+    """
+    seen = set()
+    
+    def _size(obj: Any) -> int:
+        obj_id = id(obj)
+        if obj_id in seen:
+            return 0
+        seen.add(obj_id)
+        
+        size = sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            return size
+        if isinstance(obj, dict):
+            size += sum(_size(k) + _size(v) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sum(_size(item) for item in obj)
+        elif hasattr(obj, '__dict__'):
+            size += _size(vars(obj))
+        return size
+    
+    return _size(value)
+
 
 class CacheBackend:
     """Abstract cache backend interface."""
     
+    # Called with (key, 'evicted' | 'expired') when the backend drops an entry
+    eviction_listener: Optional[Callable[[str, str], None]] = None
+    
     def get(self, key: str) -> Optional[Any]:
         raise NotImplementedError
     
-    def set(self, key: str, value: Any, ttl: int) -> bool:
+    def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
         raise NotImplementedError
     
     def delete(self, key: str) -> bool:
@@ -25,82 +101,610 @@ class CacheBackend:
     
     def clear(self) -> bool:
         raise NotImplementedError
+    
+    def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags. Returns the deleted keys."""
+        raise NotImplementedError
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values; missing keys are omitted from the result."""
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+    
+    def set_many(self, items: Dict[str, Any], ttl: float,
+                 tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values with the same TTL and optional per-key tags."""
+        tags = tags or {}
+        return all([
+            self.set(key, value, ttl, tags.get(key))
+            for key, value in items.items()
+        ])
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys. Returns the number of keys deleted."""
+        return sum(1 for key in keys if self.delete(key))
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """Remove expired entries. Backends with native expiry have nothing to do."""
+        return 0
+    
+    def has_expired(self) -> bool:
+        """Whether expired entries are still waiting for cleanup_expired."""
+        return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': self.__class__.__name__}
+    
+    def resident_bytes(self) -> Optional[int]:
+        """Bytes currently held by the backend, if it can tell."""
+        return None
+    
+    def close(self):
+        """Release backend resources."""
+        pass
+    
+    def _notify_eviction(self, key: str, reason: str):
+        if self.eviction_listener is not None:
+            self.eviction_listener(key, reason)
 
 
 class InMemoryCache(CacheBackend):
-    """Simple in-memory cache implementation."""
+    """
+    Bounded in-memory cache implementation.
+    Evicts entries by LRU or LFU once the entry or byte budget is exceeded.
+    All operations hold a re-entrant lock, so the cache can be shared by the
+    event loop, the threadpool and background refresh threads.
+    """
     
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    EVICTION_POLICIES = ('lru', 'lfu')
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired."""
-        if key not in self._cache:
-            return None
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: str = 'lru'
+    ):
+        """
+        Initialize in-memory cache.
         
-        entry = self._cache[key]
-        if time.time() > entry['expires_at']:
-            del self._cache[key]
-            return None
+        Args:
+            max_entries: Maximum number of entries (None for unbounded)
+            max_bytes: Maximum estimated size of all values in bytes (None for unbounded)
+            eviction_policy: 'lru' (least recently used) or 'lfu' (least frequently used)
+        """
+        if eviction_policy not in self.EVICTION_POLICIES:
+            raise ValueError(
+                f"Invalid eviction policy '{eviction_policy}'. "
+                f"Valid policies: {list(self.EVICTION_POLICIES)}"
+            )
         
-        logger.debug(f"Cache hit: {key}")
-        return entry['value']
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction_policy = eviction_policy
+        
+        # Insertion/access ordered; the front is the LRU victim
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._bytes = 0
+        
+        # LFU bookkeeping: access count -> keys with that count (oldest first)
+        self._freq: Dict[int, 'OrderedDict[str, None]'] = {}
+        self._min_freq = 0
+        
+        # Expiry index: min-heap of (expires_at, key). Entries are never removed
+        # eagerly; stale heap items are skipped when their entry has changed.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        
+        # Tag index: tag -> keys carrying it
+        self._tags: Dict[str, set] = {}
+        
+        self._lock = threading.RLock()
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
     
-    def set(self, key: str, value: Any, ttl: int) -> bool:
-        """Set value in cache with TTL (in seconds)."""
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if not expired."""
+        with self._lock:
+            return self._get(key, time.time())
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values under a single lock acquisition."""
+        result = {}
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    result[key] = value
+        return result
+    
+    def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with TTL (in seconds) and optional tags."""
         try:
-            self._cache[key] = {
-                'value': value,
-                'expires_at': time.time() + ttl,
-                'created_at': time.time()
-            }
-            logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
-            return True
+            # Sizing walks the value, so do it before taking the lock
+            size = estimate_size(value)
+            with self._lock:
+                return self._set(key, value, ttl, tags, size)
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return False
+    
+    def set_many(self, items: Dict[str, Any], ttl: float,
+                 tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values under a single lock acquisition."""
+        tags = tags or {}
+        try:
+            sizes = {key: estimate_size(value) for key, value in items.items()}
+            with self._lock:
+                return all([
+                    self._set(key, value, ttl, tags.get(key), sizes[key])
+                    for key, value in items.items()
+                ])
         except Exception as e:
             logger.error(f"Cache set error: {e}")
             return False
     
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
-        if key in self._cache:
-            del self._cache[key]
-            logger.debug(f"Cache delete: {key}")
-            return True
-        return False
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+                logger.debug(f"Cache delete: {key}")
+                return True
+            return False
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys under a single lock acquisition."""
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if key in self._cache:
+                    self._remove(key)
+                    removed += 1
+            return removed
     
     def clear(self) -> bool:
         """Clear all cache entries."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._freq.clear()
+            self._min_freq = 0
+            self._bytes = 0
+            self._expiry_heap.clear()
+            self._tags.clear()
         logger.info("Cache cleared")
         return True
     
-    def cleanup_expired(self):
-        """Remove expired entries."""
+    def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags."""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+        if keys:
+            logger.debug(f"Cache invalidated {len(keys)} keys for tags: {tags}")
+        return list(keys)
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """
+        Remove expired entries using the expiry index.
+        Runs in O(expired * log n) instead of scanning every entry.
+        
+        Args:
+            max_items: Maximum number of heap items to process (None for all)
+        
+        Returns:
+            Number of entries removed
+        """
         current_time = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if current_time > entry['expires_at']
+        removed = 0
+        processed = 0
+        
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= current_time:
+                if max_items is not None and processed >= max_items:
+                    break
+                expires_at, key = heapq.heappop(heap)
+                processed += 1
+                
+                entry = self._cache.get(key)
+                # Skip items superseded by a later set() or already removed
+                if entry is None or entry['expires_at'] != expires_at:
+                    continue
+                self._remove(key)
+                self._notify_eviction(key, 'expired')
+                removed += 1
+            
+            self._compact_expiry_heap()
+            self.expirations += removed
+        
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired cache entries")
+        return removed
+    
+    def has_expired(self) -> bool:
+        """Whether the expiry index still holds items due for cleanup."""
+        with self._lock:
+            return bool(self._expiry_heap) and self._expiry_heap[0][0] <= time.time()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current cache statistics."""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'eviction_policy': self.eviction_policy,
+                'entries': len(self._cache),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'rejections': self.rejections,
+                'expiry_index_size': len(self._expiry_heap),
+                'tags': len(self._tags)
+            }
+    
+    def resident_bytes(self) -> Optional[int]:
+        return self._bytes
+    
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        """Look up a key; caller must hold the lock."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        if now > entry['expires_at']:
+            self._remove(key)
+            self.expirations += 1
+            self._notify_eviction(key, 'expired')
+            return None
+        
+        self._touch(key, entry)
+        logger.debug(f"Cache hit: {key}")
+        return entry['value']
+    
+    def _set(self, key: str, value: Any, ttl: float, tags: Optional[List[str]], size: int) -> bool:
+        """Store a pre-sized value; caller must hold the lock."""
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.rejections += 1
+            logger.warning(
+                f"Cache set rejected: {key} ({size} bytes exceeds "
+                f"max_bytes={self.max_bytes})"
+            )
+            return False
+        
+        if key in self._cache:
+            self._remove(key)
+        
+        now = time.time()
+        self._cache[key] = {
+            'value': value,
+            'expires_at': now + ttl,
+            'created_at': now,
+            'size': size,
+            'hits': 1,
+            'tags': tuple(tags) if tags else ()
+        }
+        self._bytes += size
+        for tag in tags or ():
+            self._tags.setdefault(tag, set()).add(key)
+        heapq.heappush(self._expiry_heap, (now + ttl, key))
+        if self.eviction_policy == 'lfu':
+            self._freq.setdefault(1, OrderedDict())[key] = None
+            self._min_freq = 1
+        
+        self._enforce_limits()
+        logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
+        return True
+    
+    def _compact_expiry_heap(self):
+        """Rebuild the expiry index once stale items dominate it."""
+        if len(self._expiry_heap) <= 2 * len(self._cache) + 64:
+            return
+        self._expiry_heap = [
+            (entry['expires_at'], key) for key, entry in self._cache.items()
         ]
-        for key in expired_keys:
-            del self._cache[key]
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+        heapq.heapify(self._expiry_heap)
+    
+    def _touch(self, key: str, entry: Dict[str, Any]):
+        """Record an access for the eviction policy."""
+        if self.eviction_policy == 'lru':
+            self._cache.move_to_end(key)
+            return
+        
+        freq = entry['hits']
+        bucket = self._freq[freq]
+        del bucket[key]
+        if not bucket:
+            del self._freq[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        entry['hits'] = freq + 1
+        self._freq.setdefault(freq + 1, OrderedDict())[key] = None
+    
+    def _remove(self, key: str):
+        """Remove an entry and its policy bookkeeping."""
+        entry = self._cache.pop(key)
+        self._bytes -= entry['size']
+        for tag in entry['tags']:
+            tagged = self._tags.get(tag)
+            if tagged is not None:
+                tagged.discard(key)
+                if not tagged:
+                    del self._tags[tag]
+        if self.eviction_policy == 'lfu':
+            bucket = self._freq.get(entry['hits'])
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._freq[entry['hits']]
+    
+    def _next_victim(self) -> str:
+        """Pick the key to evict according to the eviction policy."""
+        if self.eviction_policy == 'lru':
+            return next(iter(self._cache))
+        
+        if self._min_freq not in self._freq:
+            self._min_freq = min(self._freq)
+        return next(iter(self._freq[self._min_freq]))
+    
+    def _over_budget(self) -> bool:
+        """Check whether the cache exceeds its entry or byte budget."""
+        if self.max_entries is not None and len(self._cache) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            return True
+        return False
+    
+    def _enforce_limits(self):
+        """Evict entries until the cache fits its budget."""
+        while self._cache and self._over_budget():
+            victim = self._next_victim()
+            self._remove(victim)
+            self.evictions += 1
+            self._notify_eviction(victim, 'evicted')
+            logger.debug(f"Cache evict ({self.eviction_policy}): {victim}")
+
+
+class StripedInMemoryCache(CacheBackend):
+    """
+    In-memory cache split into independently locked shards.
+    Each key hashes to one InMemoryCache shard holding 1/shards of the entry
+    and byte budget, so threads touching different keys rarely contend for the
+    same lock. Eviction order is per shard, which approximates global LRU/LFU.
+    """
+    
+    def __init__(
+        self,
+        shards: int = 8,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: str = 'lru'
+    ):
+        """
+        Initialize striped in-memory cache.
+        
+        Args:
+            shards: Number of shards (locks)
+            max_entries: Maximum number of entries across all shards (None for unbounded)
+            max_bytes: Maximum estimated size of all values in bytes (None for unbounded)
+            eviction_policy: 'lru' (least recently used) or 'lfu' (least frequently used)
+        """
+        if shards < 1:
+            raise ValueError(f"shards must be at least 1, got {shards}")
+        
+        def per_shard(limit: Optional[int]) -> Optional[int]:
+            return -(-limit // shards) if limit is not None else None
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction_policy = eviction_policy
+        self._shards = [
+            InMemoryCache(per_shard(max_entries), per_shard(max_bytes), eviction_policy)
+            for _ in range(shards)
+        ]
+    
+    @property
+    def eviction_listener(self) -> Optional[Callable[[str, str], None]]:
+        return self._shards[0].eviction_listener
+    
+    @eviction_listener.setter
+    def eviction_listener(self, listener: Optional[Callable[[str, str], None]]):
+        for shard in self._shards:
+            shard.eviction_listener = listener
+    
+    def _shard(self, key: str) -> InMemoryCache:
+        return self._shards[hash(key) % len(self._shards)]
+    
+    def _group(self, keys) -> Dict[int, List[str]]:
+        """Group keys by shard index."""
+        groups: Dict[int, List[str]] = {}
+        count = len(self._shards)
+        for key in keys:
+            groups.setdefault(hash(key) % count, []).append(key)
+        return groups
+    
+    def get(self, key: str) -> Optional[Any]:
+        return self._shard(key).get(key)
+    
+    def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        return self._shard(key).set(key, value, ttl, tags)
+    
+    def delete(self, key: str) -> bool:
+        return self._shard(key).delete(key)
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values, taking each shard's lock once."""
+        result = {}
+        for index, shard_keys in self._group(keys).items():
+            result.update(self._shards[index].get_many(shard_keys))
+        return result
+    
+    def set_many(self, items: Dict[str, Any], ttl: float,
+                 tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values, taking each shard's lock once."""
+        tags = tags or {}
+        return all([
+            self._shards[index].set_many(
+                {key: items[key] for key in shard_keys}, ttl,
+                {key: tags[key] for key in shard_keys if key in tags}
+            )
+            for index, shard_keys in self._group(items).items()
+        ])
+    
+    def delete_many(self, keys: List[str]) -> int:
+        return sum(
+            self._shards[index].delete_many(shard_keys)
+            for index, shard_keys in self._group(keys).items()
+        )
+    
+    def clear(self) -> bool:
+        for shard in self._shards:
+            shard.clear()
+        return True
+    
+    def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags, in every shard."""
+        keys = []
+        for shard in self._shards:
+            keys.extend(shard.invalidate_tags(tags))
+        return keys
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """
+        Remove expired entries from every shard.
+        
+        Args:
+            max_items: Maximum number of heap items to process, split evenly
+                across shards (None for all)
+        
+        Returns:
+            Number of entries removed
+        """
+        per_shard = -(-max_items // len(self._shards)) if max_items is not None else None
+        return sum(shard.cleanup_expired(per_shard) for shard in self._shards)
+    
+    def has_expired(self) -> bool:
+        return any(shard.has_expired() for shard in self._shards)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics summed over all shards."""
+        shard_stats = [shard.get_stats() for shard in self._shards]
+        
+        def total(name: str) -> int:
+            return sum(stats[name] for stats in shard_stats)
+        
+        return {
+            'backend': 'memory',
+            'eviction_policy': self.eviction_policy,
+            'shards': len(self._shards),
+            'entries': total('entries'),
+            'max_entries': self.max_entries,
+            'bytes': total('bytes'),
+            'max_bytes': self.max_bytes,
+            'evictions': total('evictions'),
+            'expirations': total('expirations'),
+            'rejections': total('rejections'),
+            'expiry_index_size': total('expiry_index_size'),
+            'tags': total('tags'),
+            'shard_entries': [stats['entries'] for stats in shard_stats]
+        }
+    
+    def resident_bytes(self) -> Optional[int]:
+        return sum(shard.resident_bytes() for shard in self._shards)
 
 
 class RedisCache(CacheBackend):
-    """Redis cache implementation."""
+    """
+    Redis cache implementation. Values are serialized with a pluggable codec.
+    All keys live under key_prefix so clearing never touches other data in the
+    database, and each tag is a Redis set of the keys carrying it.
     
-    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0):
+    Redis expires the keys but not their tag set memberships, so
+    cleanup_expired sweeps the tag sets incrementally and drops members
+    whose keys are gone; otherwise a tag that keeps receiving new keys
+    (one per distinct job search, say) would never expire and grow forever.
+    """
+    
+    # Atomically delete every key in the given tag sets plus the sets themselves
+    _INVALIDATE_TAGS_SCRIPT = """
+    local deleted = {}
+    for _, tag_key in ipairs(KEYS) do
+        for _, member in ipairs(redis.call('SMEMBERS', tag_key)) do
+            if redis.call('UNLINK', member) == 1 then
+                table.insert(deleted, member)
+            end
+        end
+        redis.call('UNLINK', tag_key)
+    end
+    return deleted
+    """
+    
+    # Atomically drop the given members of a tag set whose keys no longer exist
+    # (checked and removed in one step, so a key re-set meanwhile keeps its tag)
+    _PRUNE_TAG_SCRIPT = """
+    local pruned = 0
+    for _, member in ipairs(ARGV) do
+        if redis.call('EXISTS', member) == 0 then
+            pruned = pruned + redis.call('SREM', KEYS[1], member)
+        end
+    end
+    return pruned
+    """
+    
+    # Tag set members checked per script call
+    _PRUNE_CHUNK_SIZE = 200
+    
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 codec: Optional[Codec] = None, key_prefix: str = 'squirrel:',
+                 tag_ttl: int = 172800):
+        """
+        Initialize Redis cache.
+        
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Redis database number
+            codec: Value codec (JSON if not provided)
+            key_prefix: Prefix for every key written by this cache
+            tag_ttl: Minimum lifetime of tag sets; should cover the longest entry TTL
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.codec = codec or JsonCodec()
+        self.key_prefix = key_prefix
+        self.tag_ttl = tag_ttl
+        
+        # Tag sweep position: SCAN cursor, tag sets still to sweep from its last
+        # batch, and the tag set being swept with its SSCAN cursor
+        self._sweep_cursor = 0
+        self._sweep_queue: List[bytes] = []
+        self._sweep_tag: Optional[bytes] = None
+        self._sweep_tag_cursor = 0
+        self.tag_sweeps = 0
+        self.tag_members_pruned = 0
         try:
             import redis
             self.redis_client = redis.Redis(
                 host=host,
                 port=port,
                 db=db,
-                decode_responses=True
+                decode_responses=False
             )
             # Test connection
             self.redis_client.ping()
+            self._invalidate_tags = self.redis_client.register_script(
+                self._INVALIDATE_TAGS_SCRIPT
+            )
+            self._prune_tag = self.redis_client.register_script(self._PRUNE_TAG_SCRIPT)
             logger.info(f"Connected to Redis at {host}:{port}")
         except ImportError:
             logger.warning("Redis package not installed. Falling back to in-memory cache.")
@@ -109,33 +713,127 @@ class RedisCache(CacheBackend):
             logger.error(f"Failed to connect to Redis: {e}")
             raise
     
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}tag:{tag}"
+    
+    def _add_tags(self, pipe, key: str, tags: Optional[List[str]], ttl: float):
+        """Queue tag set updates for a key on a pipeline."""
+        for tag in tags or ():
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, self._key(key))
+            pipe.expire(tag_key, max(int(ttl), self.tag_ttl))
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value from Redis cache."""
         try:
-            value = self.redis_client.get(key)
+            value = self.redis_client.get(self._key(key))
             if value:
                 logger.debug(f"Cache hit: {key}")
-                return json.loads(value)
+                return self.codec.decode(value)
             return None
         except Exception as e:
             logger.error(f"Redis get error: {e}")
             return None
     
-    def set(self, key: str, value: Any, ttl: int) -> bool:
-        """Set value in Redis cache with TTL."""
+    def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        """Set value in Redis cache with TTL and optional tags."""
+        # SETEX only takes whole seconds, at least one
+        ttl = max(1, int(ttl))
         try:
-            serialized = json.dumps(value, default=str)
-            self.redis_client.setex(key, ttl, serialized)
+            serialized = self.codec.encode(value)
+            if tags:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.setex(self._key(key), ttl, serialized)
+                self._add_tags(pipe, key, tags, ttl)
+                pipe.execute()
+            else:
+                self.redis_client.setex(self._key(key), ttl, serialized)
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
             return True
         except Exception as e:
             logger.error(f"Redis set error: {e}")
             return False
     
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get value and its remaining TTL in one round trip.
+        
+        Returns:
+            Tuple of (value, remaining TTL in seconds); (None, None) on miss
+        """
+        found = self.get_many_with_ttl([key])
+        return found.get(key, (None, None))
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values with a single MGET."""
+        if not keys:
+            return {}
+        try:
+            values = self.redis_client.mget([self._key(key) for key in keys])
+            return {
+                key: self.codec.decode(value)
+                for key, value in zip(keys, values) if value
+            }
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return {}
+    
+    def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """Get multiple values and their remaining TTLs in one pipelined round trip."""
+        if not keys:
+            return {}
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(self._key(key))
+                pipe.pttl(self._key(key))
+            replies = pipe.execute()
+            result = {}
+            for i, key in enumerate(keys):
+                value, pttl = replies[2 * i], replies[2 * i + 1]
+                if value:
+                    ttl = pttl / 1000.0 if pttl and pttl > 0 else None
+                    result[key] = (self.codec.decode(value), ttl)
+            return result
+        except Exception as e:
+            logger.error(f"Redis pipelined get error: {e}")
+            return {}
+    
+    def set_many(self, items: Dict[str, Any], ttl: float,
+                 tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values (and their tags) in one pipelined round trip."""
+        if not items:
+            return True
+        tags = tags or {}
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(self._key(key), max(1, int(ttl)), self.codec.encode(value))
+                self._add_tags(pipe, key, tags.get(key), ttl)
+            pipe.execute()
+            logger.debug(f"Cache set: {len(items)} keys (TTL: {ttl}s)")
+            return True
+        except Exception as e:
+            logger.error(f"Redis pipelined set error: {e}")
+            return False
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys with a single DEL."""
+        if not keys:
+            return 0
+        try:
+            return int(self.redis_client.delete(*[self._key(key) for key in keys]))
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+            return 0
+    
     def delete(self, key: str) -> bool:
         """Delete key from Redis cache."""
         try:
-            result = self.redis_client.delete(key)
+            result = self.redis_client.delete(self._key(key))
             if result:
                 logger.debug(f"Cache delete: {key}")
             return bool(result)
@@ -143,57 +841,893 @@ class RedisCache(CacheBackend):
             logger.error(f"Redis delete error: {e}")
             return False
     
+    def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags in one atomic script call."""
+        if not tags:
+            return []
+        try:
+            deleted = self._invalidate_tags(keys=[self._tag_key(tag) for tag in tags])
+            prefix_length = len(self.key_prefix)
+            keys = list({
+                (member.decode() if isinstance(member, bytes) else member)[prefix_length:]
+                for member in deleted
+            })
+            if keys:
+                logger.debug(f"Redis invalidated {len(keys)} keys for tags: {tags}")
+            return keys
+        except Exception as e:
+            logger.error(f"Redis tag invalidation error: {e}")
+            return []
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """
+        Sweep tag sets for members whose keys have expired or been deleted.
+        Each call resumes where the last one stopped, even inside a tag set,
+        and checks about max_items members in SSCAN steps; with no limit it
+        finishes the current pass over every tag set. Emptied tag sets
+        disappear with their last member.
+        
+        Args:
+            max_items: Approximate number of tag set members to check (None for the rest of the pass)
+        
+        Returns:
+            0, since Redis expires the entries themselves
+        """
+        checked = 0
+        pruned = 0
+        try:
+            while max_items is None or checked < max_items:
+                if self._sweep_tag is None and not self._sweep_queue:
+                    if self._sweep_cursor == 0 and checked:
+                        # Pass finished; the next call starts a new one
+                        break
+                    self._sweep_cursor, tag_keys = self.redis_client.scan(
+                        self._sweep_cursor, match=f"{self.key_prefix}tag:*", count=100
+                    )
+                    self._sweep_queue.extend(tag_keys)
+                    if self._sweep_cursor == 0:
+                        self.tag_sweeps += 1
+                    if not self._sweep_queue:
+                        if self._sweep_cursor == 0:
+                            break
+                        continue
+                
+                if self._sweep_tag is None:
+                    self._sweep_tag = self._sweep_queue.pop()
+                    self._sweep_tag_cursor = 0
+                count = self._PRUNE_CHUNK_SIZE
+                if max_items is not None:
+                    count = max(1, min(count, max_items - checked))
+                self._sweep_tag_cursor, members = self.redis_client.sscan(
+                    self._sweep_tag, self._sweep_tag_cursor, count=count
+                )
+                if members:
+                    pruned += int(self._prune_tag(keys=[self._sweep_tag], args=members))
+                if self._sweep_tag_cursor == 0:
+                    self._sweep_tag = None
+                # Count at least one per step so empty sets still use up the budget
+                checked += max(1, len(members))
+        except Exception as e:
+            logger.error(f"Redis tag sweep error: {e}")
+        
+        self.tag_members_pruned += pruned
+        if pruned:
+            logger.debug(f"Pruned {pruned} expired keys from Redis tag sets")
+        return 0
+    
     def clear(self) -> bool:
-        """Clear all keys in Redis database."""
+        """Clear all keys under this cache's prefix (never the whole database)."""
         try:
-            self.redis_client.flushdb()
+            if not self.key_prefix:
+                self.redis_client.flushdb()
+            else:
+                batch = []
+                for redis_key in self.redis_client.scan_iter(
+                    match=f"{self.key_prefix}*", count=1000
+                ):
+                    batch.append(redis_key)
+                    if len(batch) >= 1000:
+                        self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    self.redis_client.unlink(*batch)
             logger.info("Redis cache cleared")
             return True
         except Exception as e:
             logger.error(f"Redis clear error: {e}")
             return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current cache statistics."""
+        try:
+            return {
+                'backend': 'redis',
+                'codec': self.codec.name,
+                'compression': self.codec.compression,
+                'key_prefix': self.key_prefix,
+                # Every key in the database (other apps, tag sets, rate limits), not just this cache's
+                'db_keys': self.redis_client.dbsize(),
+                'tag_sweeps': self.tag_sweeps,
+                'tag_members_pruned': self.tag_members_pruned
+            }
+        except Exception as e:
+            logger.error(f"Redis stats error: {e}")
+            return {'backend': 'redis'}
+    
+    def resident_bytes(self) -> Optional[int]:
+        """Memory used by the Redis server (shared by every namespace)."""
+        try:
+            return int(self.redis_client.info('memory')['used_memory'])
+        except Exception as e:
+            logger.error(f"Redis memory info error: {e}")
+            return None
+    
+    def close(self):
+        """Close the Redis connection pool."""
+        try:
+            self.redis_client.close()
+        except Exception as e:
+            logger.error(f"Redis close error: {e}")
+
+
+class TieredCache(CacheBackend):
+    """
+    Two-tier cache: a small in-process L1 in front of a shared L2 (Redis or
+    the on-disk cache). Reads go through L1 and fill it from L2; writes go
+    through to both. L1 entries never outlive the L2 entry they were copied
+    from. With a Redis L2 every write or delete is published so other
+    workers drop their L1 copies; otherwise L1 copies expire after
+    l1_max_ttl.
+    """
+    
+    def __init__(
+        self,
+        l1: CacheBackend,
+        l2: CacheBackend,
+        l1_max_ttl: float = 60,
+        channel: str = 'squirrel:cache:invalidate'
+    ):
+        """
+        Initialize tiered cache.
+        
+        Args:
+            l1: In-process cache tier
+            l2: Shared cache tier providing get_with_ttl/get_many_with_ttl
+            l1_max_ttl: Maximum TTL for L1 copies in seconds
+            channel: Redis pub/sub channel for invalidation messages (Redis L2 only)
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_max_ttl = l1_max_ttl
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+        
+        self._pubsub = None
+        self._listener = None
+        if not isinstance(self.l2, RedisCache):
+            return
+        try:
+            self._pubsub = self.l2.redis_client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.channel: self._on_invalidation})
+            self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            logger.info(f"Subscribed to cache invalidations on {self.channel}")
+        except Exception as e:
+            logger.warning(f"Cache invalidation subscription failed, L1 relies on TTL: {e}")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from L1, falling back to L2 and filling L1."""
+        value = self.l1.get(key)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+        
+        value, ttl = self.l2.get_with_ttl(key)
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self.l2_hits += 1
+        self.l1.set(key, value, self._l1_ttl(ttl))
+        return value
+    
+    def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        """Write value through to L2 and L1. Tags are tracked in L2."""
+        if not self.l2.set(key, value, ttl, tags):
+            self.l1.delete(key)
+            return False
+        self.l1.set(key, value, self._l1_ttl(ttl))
+        self._publish({'keys': [key]})
+        return True
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values, reading L1 first and L2 for the rest in one round trip."""
+        result = self.l1.get_many(keys)
+        self.l1_hits += len(result)
+        
+        missing = [key for key in keys if key not in result]
+        if missing:
+            found = self.l2.get_many_with_ttl(missing)
+            self.l2_hits += len(found)
+            self.misses += len(missing) - len(found)
+            for key, (value, ttl) in found.items():
+                self.l1.set(key, value, self._l1_ttl(ttl))
+                result[key] = value
+        return result
+    
+    def set_many(self, items: Dict[str, Any], ttl: float,
+                 tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Write multiple values through to L2 and L1."""
+        if not self.l2.set_many(items, ttl, tags):
+            self.l1.delete_many(list(items))
+            return False
+        self.l1.set_many(items, self._l1_ttl(ttl))
+        self._publish({'keys': list(items)})
+        return True
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys from both tiers."""
+        self.l1.delete_many(keys)
+        result = self.l2.delete_many(keys)
+        self._publish({'keys': list(keys)})
+        return result
+    
+    def delete(self, key: str) -> bool:
+        """Delete key from both tiers."""
+        self.l1.delete(key)
+        result = self.l2.delete(key)
+        self._publish({'keys': [key]})
+        return result
+    
+    def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete tagged keys from L2 and drop them from every worker's L1."""
+        keys = self.l2.invalidate_tags(tags)
+        if keys:
+            self.l1.delete_many(keys)
+            self._publish({'keys': keys})
+        return keys
+    
+    def clear(self) -> bool:
+        """Clear both tiers."""
+        self.l1.clear()
+        result = self.l2.clear()
+        self._publish({'clear': True})
+        return result
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """
+        Remove expired entries from L1 and sweep expired keys out of L2 (Redis) tag sets.
+        With a limit, L2 is swept once L1 has nothing left to remove, so a
+        cleanup pass over L1 in several batches advances the L2 sweep once.
+        """
+        removed = self.l1.cleanup_expired(max_items)
+        if max_items is None or not self.l1.has_expired():
+            self.l2.cleanup_expired(max_items)
+        return removed
+    
+    def has_expired(self) -> bool:
+        return self.l1.has_expired() or self.l2.has_expired()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics for both tiers."""
+        return {
+            'backend': 'tiered',
+            'l1_hits': self.l1_hits,
+            'l2_hits': self.l2_hits,
+            'misses': self.misses,
+            'invalidations_sent': self.invalidations_sent,
+            'invalidations_received': self.invalidations_received,
+            'subscribed': self._listener is not None and self._listener.is_alive(),
+            'l1': self.l1.get_stats(),
+            'l2': self.l2.get_stats()
+        }
+    
+    def resident_bytes(self) -> Optional[int]:
+        """Bytes held by this worker's L1."""
+        return self.l1.resident_bytes()
+    
+    def close(self):
+        """Stop the invalidation listener and close L2."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except Exception as e:
+                logger.error(f"Redis pubsub close error: {e}")
+            self._pubsub = None
+        self.l2.close()
+    
+    def _l1_ttl(self, l2_ttl: Optional[float]) -> float:
+        """Cap the L1 TTL by the remaining L2 TTL."""
+        if l2_ttl is None:
+            return self.l1_max_ttl
+        return min(l2_ttl, self.l1_max_ttl)
+    
+    def _publish(self, message: Dict[str, Any]):
+        """Tell other workers to drop their L1 copies."""
+        if not isinstance(self.l2, RedisCache):
+            return
+        message['origin'] = self.origin
+        try:
+            self.l2.redis_client.publish(self.channel, json.dumps(message))
+            self.invalidations_sent += 1
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+    
+    def _on_invalidation(self, message: Dict[str, Any]):
+        """Handle an invalidation message from another worker."""
+        try:
+            payload = json.loads(message['data'])
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed cache invalidation: {e}")
+            return
+        
+        if payload.get('origin') == self.origin:
+            return
+        
+        self.invalidations_received += 1
+        if payload.get('clear'):
+            self.l1.clear()
+        for key in payload.get('keys', []):
+            self.l1.delete(key)
 
 
 class Cache:
-    """Unified cache interface that automatically selects backend."""
+    """
+    Unified cache interface that automatically selects backend.
+    
+    Values may be stored with a soft TTL (ttl) and two stale windows past it:
+    stale_while_revalidate serves the old value while a background refresh
+    runs, stale_if_error serves the old value only when the refresh fails.
+    The backend keeps the entry until the longer of the two windows ends.
+    
+    Every key written through a namespaced Cache is tagged with its namespace,
+    and caller tags are scoped to it, so invalidating a namespace or tag only
+    drops that namespace's entries.
+    
+    Without Redis, use_disk persists entries to SQLite behind the bounded
+    in-memory tier, so a restarted worker refills memory from disk lazily
+    instead of from upstream.
+    
+    With shards > 1 the in-process tier is a StripedInMemoryCache, so worker
+    threads contend on one of several locks instead of a single one.
+    """
     
     def __init__(self, use_redis: bool = False, redis_host: str = 'localhost',
-                 redis_port: int = 6379, redis_db: int = 0):
+                 redis_port: int = 6379, redis_db: int = 0,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 eviction_policy: str = 'lru', refresh_workers: int = 4,
+                 tiered: bool = False, l1_max_entries: Optional[int] = 1000,
+                 l1_max_bytes: Optional[int] = None, l1_max_ttl: float = 60,
+                 invalidation_channel: str = 'squirrel:cache:invalidate',
+                 codec: Optional[Codec] = None, namespace: Optional[str] = None,
+                 key_prefix: str = 'squirrel:', tag_ttl: int = 172800,
+                 use_disk: bool = False, disk_path: str = '.cache/squirrel.sqlite3',
+                 shards: int = 1):
         self.backend: CacheBackend
+        self.namespace = namespace
+        self.metrics = CacheMetrics(namespace)
+        self._flight = SingleFlight()
+        
+        # Background refreshes for stale-while-revalidate entries
+        self.refresh_workers = refresh_workers
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.stale_served = 0
+        self.stale_if_error_served = 0
+        self.background_refreshes = 0
+        self.refresh_errors = 0
         
         if use_redis:
             try:
-                self.backend = RedisCache(redis_host, redis_port, redis_db)
-                logger.info("Using Redis cache backend")
+                redis_cache = RedisCache(
+                    redis_host, redis_port, redis_db, codec=codec,
+                    key_prefix=key_prefix, tag_ttl=tag_ttl
+                )
+                if tiered:
+                    self.backend = TieredCache(
+                        self._memory_backend(l1_max_entries, l1_max_bytes, eviction_policy, shards),
+                        redis_cache,
+                        l1_max_ttl=l1_max_ttl,
+                        channel=invalidation_channel
+                    )
+                    logger.info("Using tiered in-memory + Redis cache backend")
+                else:
+                    self.backend = redis_cache
+                    logger.info("Using Redis cache backend")
             except Exception as e:
                 logger.warning(f"Failed to initialize Redis, using in-memory cache: {e}")
-                self.backend = InMemoryCache()
+                self.backend = self._memory_backend(max_entries, max_bytes, eviction_policy, shards)
+        elif use_disk:
+            from .disk_cache import DiskCache
+            try:
+                self.backend = TieredCache(
+                    self._memory_backend(max_entries, max_bytes, eviction_policy, shards),
+                    DiskCache(disk_path, codec=codec),
+                    l1_max_ttl=l1_max_ttl
+                )
+                logger.info(f"Using in-memory cache backend persisted to {disk_path}")
+            except Exception as e:
+                logger.warning(f"Failed to open disk cache, using in-memory cache: {e}")
+                self.backend = self._memory_backend(max_entries, max_bytes, eviction_policy, shards)
         else:
-            self.backend = InMemoryCache()
-            logger.info("Using in-memory cache backend")
+            self.backend = self._memory_backend(max_entries, max_bytes, eviction_policy, shards)
+            logger.info(
+                f"Using in-memory cache backend ({eviction_policy}, "
+                f"max_entries={max_entries}, max_bytes={max_bytes}, shards={shards})"
+            )
+        
+        # In-process tiers report evictions and expirations per key type
+        local_tier = self.backend.l1 if isinstance(self.backend, TieredCache) else self.backend
+        local_tier.eviction_listener = self.metrics.record_eviction
+    
+    @staticmethod
+    def _memory_backend(max_entries: Optional[int], max_bytes: Optional[int],
+                        eviction_policy: str, shards: int) -> CacheBackend:
+        """Create a single-lock or lock-striped in-memory backend."""
+        if shards > 1:
+            return StripedInMemoryCache(shards, max_entries, max_bytes, eviction_policy)
+        return InMemoryCache(max_entries, max_bytes, eviction_policy)
     
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        return self.backend.get(key)
+        """Get value from cache if it is fresh."""
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh:
+            self.metrics.record_lookup(key, 'misses')
+            return None
+        self.metrics.record_lookup(key, 'hits')
+        return entry.value
     
-    def set(self, key: str, value: Any, ttl: int) -> bool:
-        """Set value in cache with TTL (seconds)."""
-        return self.backend.set(key, value, ttl)
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get value from cache with its freshness metadata, including stale values."""
+        with self.metrics.timed('get'):
+            stored = self.backend.get(key)
+        if stored is None:
+            return None
+        return CacheEntry.from_stored(stored)
+    
+    def set(self, key: str, value: Any, ttl: int,
+            stale_while_revalidate: int = 0, stale_if_error: int = 0,
+            tags: Optional[List[str]] = None) -> bool:
+        """
+        Set value in cache with TTL (seconds).
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Soft TTL; the value is fresh until it passes
+            stale_while_revalidate: Seconds past ttl the value may be served while refreshing
+            stale_if_error: Seconds past ttl the value may be served if refreshing fails
+            tags: Tags for group invalidation (e.g. 'type:roster', 'team:12')
+        """
+        stored, backend_ttl = self._wrap(value, ttl, stale_while_revalidate, stale_if_error)
+        self.metrics.record(key, 'sets')
+        with self.metrics.timed('set'):
+            return self.backend.set(key, stored, backend_ttl, self._scope_tags(tags))
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple fresh values; missing or stale keys are omitted."""
+        entries = self.get_entries(keys)
+        result = {}
+        for key in keys:
+            entry = entries.get(key)
+            if entry is not None and entry.is_fresh:
+                result[key] = entry.value
+                self.metrics.record_lookup(key, 'hits')
+            else:
+                self.metrics.record_lookup(key, 'misses')
+        return result
+    
+    def get_entries(self, keys: List[str]) -> Dict[str, CacheEntry]:
+        """Get multiple values with their freshness metadata, including stale values."""
+        with self.metrics.timed('get'):
+            stored_items = self.backend.get_many(keys)
+        return {
+            key: CacheEntry.from_stored(stored)
+            for key, stored in stored_items.items()
+        }
+    
+    def set_many(self, items: Dict[str, Any], ttl: int,
+                 stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                 tags: Optional[Callable[[str], List[str]]] = None) -> bool:
+        """
+        Set multiple values with the same TTL and stale windows.
+        tags, if given, is a function returning the tags for a key.
+        """
+        if not items:
+            return True
+        backend_ttl = ttl
+        stored_items = {}
+        stored_tags = {}
+        for key, value in items.items():
+            stored_items[key], backend_ttl = self._wrap(
+                value, ttl, stale_while_revalidate, stale_if_error
+            )
+            stored_tags[key] = self._scope_tags(tags(key) if tags else None)
+            self.metrics.record(key, 'sets')
+        with self.metrics.timed('set'):
+            return self.backend.set_many(stored_items, backend_ttl, stored_tags)
     
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
         return self.backend.delete(key)
     
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys from cache."""
+        return self.backend.delete_many(keys)
+    
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """
+        Delete every entry in this namespace carrying any of the tags.
+        
+        Returns:
+            Number of entries deleted
+        """
+        keys = self.backend.invalidate_tags(self._scope_tags(tags, include_namespace=False))
+        logger.info(f"Cache invalidated {len(keys)} entries for tags: {tags}")
+        return len(keys)
+    
+    def invalidate_namespace(self) -> int:
+        """
+        Delete every entry written through this cache's namespace.
+        Without a namespace the whole cache is cleared.
+        
+        Returns:
+            Number of entries deleted (-1 if the whole cache was cleared)
+        """
+        if self.namespace is None:
+            self.clear()
+            return -1
+        keys = self.backend.invalidate_tags([self._namespace_tag()])
+        logger.info(f"Cache invalidated {len(keys)} entries in namespace: {self.namespace}")
+        return len(keys)
+    
+    def _namespace_tag(self) -> str:
+        return f"ns:{self.namespace}"
+    
+    def _scope_tags(self, tags: Optional[List[str]],
+                    include_namespace: bool = True) -> Optional[List[str]]:
+        """Scope caller tags to this namespace and add the namespace tag."""
+        if self.namespace is None:
+            return list(tags) if tags else None
+        scoped = [f"ns:{self.namespace}:{tag}" for tag in tags or ()]
+        if include_namespace:
+            scoped.append(self._namespace_tag())
+        return scoped
+    
+    def _wrap(self, value: Any, ttl: int, stale_while_revalidate: int,
+              stale_if_error: int) -> Tuple[Any, int]:
+        """Build the stored value and backend (hard) TTL for a cache write."""
+        stale_window = max(stale_while_revalidate, stale_if_error)
+        if not stale_window:
+            return value, ttl
+        
+        now = time.time()
+        envelope = {
+            _ENVELOPE_KEY: True,
+            'value': value,
+            'fresh_until': now + ttl,
+            'revalidate_until': now + ttl + stale_while_revalidate
+        }
+        return envelope, ttl + stale_window
+    
     def clear(self) -> bool:
         """Clear all cache."""
         return self.backend.clear()
     
-    def get_or_set(self, key: str, func, ttl: int) -> Any:
-        """Get from cache or execute function and cache result."""
-        cached_value = self.get(key)
-        if cached_value is not None:
-            return cached_value
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """Remove expired entries from the backend."""
+        return self.backend.cleanup_expired(max_items)
+    
+    def has_expired(self) -> bool:
+        """Whether the backend has expired entries waiting for cleanup."""
+        return self.backend.has_expired()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache backend, metrics, request coalescing and staleness statistics."""
+        stats = dict(self.backend.get_stats())
+        stats['metrics'] = self.metrics.snapshot(self.backend.resident_bytes())
+        stats['singleflight'] = self._flight.get_stats()
+        stats['stale'] = {
+            'served_while_revalidating': self.stale_served,
+            'served_on_error': self.stale_if_error_served,
+            'background_refreshes': self.background_refreshes,
+            'refresh_errors': self.refresh_errors
+        }
+        return stats
+    
+    def get_or_set(self, key: str, func, ttl: int,
+                   stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                   tags: Optional[List[str]] = None) -> Any:
+        """
+        Get from cache or execute function and cache result.
+        Concurrent misses for the same key share a single call to func.
+        None results are returned but not cached; results are stored with tags.
+        
+        Stale values inside the stale_while_revalidate window are returned
+        immediately and refreshed in the background. Inside the stale_if_error
+        window the refresh is synchronous and the stale value is returned only
+        if func raises.
+        """
+        entry = self.get_entry(key)
+        if entry is not None:
+            if entry.is_fresh:
+                self.metrics.record_lookup(key, 'hits')
+                return entry.value
+            if entry.can_revalidate:
+                self.stale_served += 1
+                self.metrics.record_lookup(key, 'stale_hits')
+                self._refresh_in_background(
+                    key, func, ttl, stale_while_revalidate, stale_if_error, tags
+                )
+                return entry.value
+        
+        def load():
+            # A previous flight may have filled the cache since our lookup
+            current = self.get_entry(key)
+            if current is not None and current.is_fresh:
+                return current.value
+            
+            value = func()
+            if value is not None:
+                self.set(key, value, ttl, stale_while_revalidate, stale_if_error, tags)
+            return value
         
-        value = func()
-        self.set(key, value, ttl)
+        try:
+            value, shared = self._flight.do(key, load)
+        except Exception as e:
+            if entry is None:
+                self.metrics.record_lookup(key, 'misses')
+                raise
+            self.stale_if_error_served += 1
+            self.metrics.record_lookup(key, 'stale_on_error')
+            logger.warning(f"Serving stale value for {key} after refresh error: {e}")
+            return entry.value
+        self.metrics.record_lookup(key, 'coalesced' if shared else 'misses')
         return value
+    
+    def get_or_set_many(self, keys: List[str], func: Callable[[str], Any], ttl: int,
+                        stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                        tags: Optional[Callable[[str], List[str]]] = None,
+                        fanout: Optional[FanOut] = None,
+                        on_error: Optional[Callable[[str, Exception], None]] = None) -> Dict[str, Any]:
+        """
+        Bulk variant of get_or_set.
+        All keys are looked up in a single backend call; misses are fetched
+        through func(key), coalesced per key, and each is written back as soon
+        as it loads, so concurrent callers find it without waiting for the
+        whole batch. Stale handling matches get_or_set; tags, if given, is a
+        function returning the tags for a key.
+        
+        Misses are fetched one key at a time, or concurrently through fanout
+        if given. A failed key with no stale value raises, unless on_error is
+        given: then on_error(key, error) is called and the key is left out of
+        the result while the other keys are still returned and cached.
+        
+        Returns:
+            Mapping of key to value for every key with a non-None value
+        """
+        entries = self.get_entries(keys)
+        result: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            entry = entries.get(key)
+            if entry is not None and entry.is_fresh:
+                self.metrics.record_lookup(key, 'hits')
+                result[key] = entry.value
+            elif entry is not None and entry.can_revalidate:
+                self.stale_served += 1
+                self.metrics.record_lookup(key, 'stale_hits')
+                self._refresh_in_background(
+                    key, lambda k=key: func(k), ttl, stale_while_revalidate, stale_if_error,
+                    tags(key) if tags else None
+                )
+                result[key] = entry.value
+            else:
+                missing.append(key)
+        
+        def load(key: str) -> Tuple[Any, bool]:
+            def fetch():
+                # A previous flight may have filled the cache since our lookup
+                current = self.get_entry(key)
+                if current is not None and current.is_fresh:
+                    return current.value
+                
+                value = func(key)
+                if value is not None:
+                    self.set(key, value, ttl, stale_while_revalidate, stale_if_error,
+                             tags(key) if tags else None)
+                return value
+            
+            return self._flight.do(key, fetch)
+        
+        if fanout is not None:
+            loaded, failed = fanout.map(missing, load)
+        else:
+            loaded, failed = {}, {}
+            for key in missing:
+                try:
+                    loaded[key] = load(key)
+                except Exception as e:
+                    failed[key] = e
+                    # Nothing to fall back on, so the batch fails here
+                    if on_error is None and key not in entries:
+                        break
+        
+        error: Optional[Exception] = None
+        for key in missing:
+            if key in failed:
+                e = failed[key]
+                entry = entries.get(key)
+                if entry is None:
+                    self.metrics.record_lookup(key, 'misses')
+                    if on_error is None:
+                        error = error or e
+                    else:
+                        on_error(key, e)
+                    continue
+                self.stale_if_error_served += 1
+                self.metrics.record_lookup(key, 'stale_on_error')
+                logger.warning(f"Serving stale value for {key} after refresh error: {e}")
+                result[key] = entry.value
+            elif key in loaded:
+                value, shared = loaded[key]
+                self.metrics.record_lookup(key, 'coalesced' if shared else 'misses')
+                if value is not None:
+                    result[key] = value
+        
+        if error is not None:
+            raise error
+        return result
+    
+    def _refresh_in_background(self, key: str, func, ttl: int,
+                               stale_while_revalidate: int, stale_if_error: int,
+                               tags: Optional[List[str]] = None):
+        """Schedule a single background refresh for a stale key."""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix="cache-refresh"
+                )
+        
+        def load():
+            value = func()
+            if value is not None:
+                self.set(key, value, ttl, stale_while_revalidate, stale_if_error, tags)
+            return value
+        
+        def refresh():
+            try:
+                # Upstream calls made by the refresh yield to user requests
+                with use_priority(PRIORITY_BACKGROUND):
+                    self._flight.do(key, load)
+                self.background_refreshes += 1
+                logger.debug(f"Background refresh complete: {key}")
+            except Exception as e:
+                # The stale value stays in place until its hard TTL
+                self.refresh_errors += 1
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        self._refresher.submit(refresh)
+    
+    def close(self):
+        """Stop background refresh workers and release the backend."""
+        with self._refresh_lock:
+            if self._refresher is not None:
+                self._refresher.shutdown(wait=False)
+                self._refresher = None
+        self.backend.close()
+
+
+class CacheReaper:
+    """
+    Background task that periodically frees expired cache entries.
+    Work is done in small batches on a worker thread, so a slow backend (a
+    locked disk cache, a Redis sweep) never blocks the event loop.
+    """
+    
+    def __init__(
+        self,
+        cleanup: Callable[[Optional[int]], int],
+        interval: float = 30.0,
+        batch_size: int = 500,
+        pending: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Initialize cache reaper.
+        
+        Args:
+            cleanup: Callable processing up to N expired items and returning the entries removed
+            interval: Seconds between reaping passes
+            batch_size: Maximum entries processed per batch
+            pending: Callable telling whether expired items remain after a batch.
+                Without it a pass continues while batches remove batch_size entries.
+                Either way a pass ends at the first batch that removes nothing or
+                fails, so a backend that can't make progress is retried next pass
+                instead of spinning.
+        """
+        self.cleanup = cleanup
+        self.pending = pending
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.reaped = 0
+        self.last_run: Optional[float] = None
+    
+    def start(self):
+        """Start the reaper on the running event loop."""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Cache reaper started (interval: {self.interval}s)")
+    
+    async def stop(self):
+        """Stop the reaper and wait for it to finish."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Cache reaper stopped")
+    
+    async def reap(self) -> int:
+        """Run one reaping pass, one batch at a time on a worker thread."""
+        total = 0
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.cleanup, self.batch_size)
+            except Exception as e:
+                logger.error(f"Cache reaper batch failed: {e}")
+                break
+            total += removed
+            if not removed:
+                break
+            if self.pending:
+                more = await asyncio.to_thread(self.pending)
+            else:
+                more = removed >= self.batch_size
+            if not more:
+                break
+        
+        self.runs += 1
+        self.reaped += total
+        self.last_run = time.time()
+        return total
+    
+    async def _run(self):
+        """Reaper loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error(f"Cache reaper error: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reaper statistics."""
+        return {
+            'running': bool(self._task and not self._task.done()),
+            'interval': self.interval,
+            'runs': self.runs,
+            'reaped': self.reaped,
+            'last_run': self.last_run
+        }
@@ -0,0 +1,270 @@
+"""
+Serialization codecs for cache backends.
+Supports JSON and a typed msgpack format with optional compression.
+"""
+import dataclasses
+import importlib
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple, Type
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Frame header: first byte identifies the compression used for the payload
+_COMPRESSION_IDS = {None: 0, 'zlib': 1, 'zstd': 2, 'lz4': 3}
+_COMPRESSION_NAMES = {v: k for k, v in _COMPRESSION_IDS.items()}
+
+# msgpack extension type codes
+_EXT_MODEL = 1
+_EXT_DATACLASS = 2
+_EXT_DATETIME = 3
+_EXT_DATE = 4
+_EXT_SET = 5
+
+
+class CodecError(Exception):
+    """Raised when a value cannot be encoded or decoded."""
+    pass
+
+
+def _compressor(name: Optional[str]):
+    """
+    Get (compress, decompress) functions for a compression algorithm.
+    zstd and lz4 are optional dependencies.
+    """
+    if name is None:
+        return None
+    if name == 'zlib':
+        return zlib.compress, zlib.decompress
+    if name == 'zstd':
+        import zstandard
+        return (
+            lambda data: zstandard.ZstdCompressor().compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data)
+        )
+    if name == 'lz4':
+        import lz4.frame
+        return lz4.frame.compress, lz4.frame.decompress
+    raise ValueError(f"Unknown compression: {name}")
+
+
+class Codec:
+    """
+    Base codec. Subclasses implement _dumps/_loads; the base class frames the
+    payload with a one-byte header and compresses payloads above a threshold.
+    """
+    
+    name = 'base'
+    
+    def __init__(self, compression: Optional[str] = None, compression_threshold: int = 1024):
+        """
+        Initialize codec.
+        
+        Args:
+            compression: 'zstd', 'lz4', 'zlib' or None
+            compression_threshold: Minimum payload size in bytes before compressing
+        """
+        try:
+            funcs = _compressor(compression)
+        except ImportError:
+            logger.warning(f"{compression} not installed, using zlib compression")
+            compression = 'zlib'
+            funcs = _compressor(compression)
+        
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self._compress = funcs[0] if funcs else None
+        self._decompressors: Dict[int, Any] = {}
+    
+    def encode(self, value: Any) -> bytes:
+        """Encode a value to bytes."""
+        payload = self._dumps(value)
+        if self._compress and len(payload) >= self.compression_threshold:
+            return bytes([_COMPRESSION_IDS[self.compression]]) + self._compress(payload)
+        return b'\x00' + payload
+    
+    def decode(self, data: bytes) -> Any:
+        """Decode bytes produced by encode()."""
+        if not data:
+            raise CodecError("Empty payload")
+        
+        compression_id = data[0]
+        payload = data[1:]
+        if compression_id:
+            payload = self._decompressor(compression_id)(payload)
+        return self._loads(payload)
+    
+    def _decompressor(self, compression_id: int):
+        """Get (and memoize) the decompress function for a header byte."""
+        if compression_id not in self._decompressors:
+            name = _COMPRESSION_NAMES.get(compression_id)
+            if name is None:
+                raise CodecError(f"Unknown compression id: {compression_id}")
+            self._decompressors[compression_id] = _compressor(name)[1]
+        return self._decompressors[compression_id]
+    
+    def _dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+    
+    def _loads(self, payload: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """
+    JSON codec. Models and dataclasses are stored as plain dicts and other
+    unknown types are stringified, so values do not keep their original types.
+    """
+    
+    name = 'json'
+    
+    def _dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=self._to_jsonable).encode('utf-8')
+    
+    @staticmethod
+    def _to_jsonable(obj: Any) -> Any:
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        if hasattr(obj, 'model_dump'):
+            return obj.model_dump()
+        if hasattr(obj, 'dict') and hasattr(type(obj), '__fields__'):
+            return obj.dict()
+        return str(obj)
+    
+    def _loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class MsgpackCodec(Codec):
+    """
+    Typed msgpack codec.
+    Pydantic models, dataclasses, datetimes and sets are tagged with
+    msgpack extension types and restored to their original types. Classes are
+    only resolved from trusted module prefixes; nothing is unpickled.
+    """
+    
+    name = 'msgpack'
+    
+    def __init__(
+        self,
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+        trusted_modules: Tuple[str, ...] = ('squirrel.models',)
+    ):
+        """
+        Initialize msgpack codec.
+        
+        Args:
+            compression: 'zstd', 'lz4', 'zlib' or None
+            compression_threshold: Minimum payload size in bytes before compressing
+            trusted_modules: Module prefixes classes may be loaded from when decoding
+        """
+        import msgpack
+        super().__init__(compression, compression_threshold)
+        self._msgpack = msgpack
+        self.trusted_modules = tuple(trusted_modules)
+        self._types: Dict[str, Type] = {}
+    
+    def _dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, default=self._encode_ext, use_bin_type=True)
+    
+    def _loads(self, payload: bytes) -> Any:
+        return self._msgpack.unpackb(payload, ext_hook=self._decode_ext, raw=False)
+    
+    def _encode_ext(self, obj: Any):
+        """Encode types msgpack does not support natively."""
+        if isinstance(obj, datetime):
+            return self._msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode('utf-8'))
+        if isinstance(obj, date):
+            return self._msgpack.ExtType(_EXT_DATE, obj.isoformat().encode('utf-8'))
+        if isinstance(obj, (set, frozenset)):
+            return self._msgpack.ExtType(_EXT_SET, self._dumps(list(obj)))
+        
+        cls = type(obj)
+        field_names = None
+        code = None
+        if dataclasses.is_dataclass(obj):
+            field_names = [f.name for f in dataclasses.fields(obj) if f.init]
+            code = _EXT_DATACLASS
+        elif hasattr(cls, 'model_fields'):
+            field_names = list(cls.model_fields)
+            code = _EXT_MODEL
+        elif hasattr(cls, '__fields__'):
+            field_names = list(cls.__fields__)
+            code = _EXT_MODEL
+        
+        if code is None:
+            raise CodecError(f"Cannot encode object of type {cls.__name__}")
+        
+        type_path = f"{cls.__module__}:{cls.__qualname__}"
+        fields = {name: getattr(obj, name) for name in field_names}
+        return self._msgpack.ExtType(code, self._dumps([type_path, fields]))
+    
+    def _decode_ext(self, code: int, data: bytes) -> Any:
+        """Restore values tagged by _encode_ext."""
+        if code == _EXT_DATETIME:
+            return datetime.fromisoformat(data.decode('utf-8'))
+        if code == _EXT_DATE:
+            return date.fromisoformat(data.decode('utf-8'))
+        if code == _EXT_SET:
+            return set(self._loads(data))
+        if code in (_EXT_MODEL, _EXT_DATACLASS):
+            type_path, fields = self._loads(data)
+            cls = self._resolve_type(type_path)
+            if code == _EXT_DATACLASS:
+                return cls(**fields)
+            # Fields were validated when the model was first built
+            if hasattr(cls, 'model_construct'):
+                return cls.model_construct(**fields)
+            return cls.construct(**fields)
+        return self._msgpack.ExtType(code, data)
+    
+    def _resolve_type(self, type_path: str) -> Type:
+        """Resolve a 'module:qualname' path, restricted to trusted modules."""
+        cls = self._types.get(type_path)
+        if cls is not None:
+            return cls
+        
+        module_name, _, qualname = type_path.partition(':')
+        if not any(
+            module_name == prefix or module_name.startswith(prefix + '.')
+            for prefix in self.trusted_modules
+        ):
+            raise CodecError(f"Refusing to decode untrusted type: {type_path}")
+        
+        obj: Any = importlib.import_module(module_name)
+        for part in qualname.split('.'):
+            obj = getattr(obj, part)
+        self._types[type_path] = obj
+        return obj
+
+
+def create_codec(
+    name: str = 'msgpack',
+    compression: Optional[str] = None,
+    compression_threshold: int = 1024,
+    trusted_modules: Tuple[str, ...] = ('squirrel.models',)
+) -> Codec:
+    """
+    Create a codec by name, falling back to JSON if msgpack is not installed.
+    
+    Args:
+        name: 'msgpack' or 'json'
+        compression: 'zstd', 'lz4', 'zlib' or None
+        compression_threshold: Minimum payload size in bytes before compressing
+        trusted_modules: Module prefixes classes may be loaded from (msgpack only)
+    
+    Returns:
+        Codec instance
+    """
+    if name == 'msgpack':
+        try:
+            return MsgpackCodec(compression, compression_threshold, trusted_modules)
+        except ImportError:
+            logger.warning("msgpack package not installed. Falling back to JSON codec.")
+            return JsonCodec(compression, compression_threshold)
+    if name == 'json':
+        return JsonCodec(compression, compression_threshold)
+    raise ValueError(f"Unknown codec: {name}")
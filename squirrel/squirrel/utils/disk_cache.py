@@ -0,0 +1,332 @@
+"""
+Persistent SQLite cache backend for squirrel service.
+Entries survive restarts and are shared by every worker process on the host.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Any, Dict, Iterator, List, Tuple
+import logging
+
+from .cache import CacheBackend
+from .codec import Codec, JsonCodec
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_key ON tags (key);
+"""
+
+
+def _chunks(items: List[Any], size: int = _MAX_PARAMS):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class DiskCache(CacheBackend):
+    """
+    SQLite-backed cache.
+    Each row stores the encoded value with its expiry time, so entries keep
+    their remaining TTL across restarts. Nothing is loaded at startup; rows
+    are read on demand (put a TieredCache in front to keep hot entries in
+    memory). The database runs in WAL mode so readers never block the
+    writer, and SQLite's file locking makes it safe to share between worker
+    processes. Expired rows are ignored on read and deleted by
+    cleanup_expired.
+    """
+    
+    def __init__(self, path: str, codec: Optional[Codec] = None, busy_timeout: float = 5.0):
+        """
+        Initialize disk cache.
+        
+        Args:
+            path: SQLite database file (created with its directory if missing)
+            codec: Value codec (JSON if not provided)
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self.codec = codec or JsonCodec()
+        self.busy_timeout = busy_timeout
+        self.expirations = 0
+        
+        # sqlite3 connections must not be shared between threads
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+        logger.info(f"Using disk cache at {path}")
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,  # autocommit; transactions are explicit
+                check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout * 1000)}')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from disk if not expired."""
+        value, _ = self.get_with_ttl(key)
+        return value
+    
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get value and its remaining TTL.
+        
+        Returns:
+            Tuple of (value, remaining TTL in seconds); (None, None) on miss
+        """
+        found = self.get_many_with_ttl([key])
+        return found.get(key, (None, None))
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values; missing or expired keys are omitted."""
+        return {key: value for key, (value, _) in self.get_many_with_ttl(keys).items()}
+    
+    def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """Get multiple values and their remaining TTLs."""
+        if not keys:
+            return {}
+        now = time.time()
+        result = {}
+        try:
+            conn = self._conn()
+            for chunk in _chunks(list(keys)):
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f'SELECT key, value, expires_at FROM entries '
+                    f'WHERE key IN ({placeholders}) AND expires_at > ?',
+                    (*chunk, now)
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    result[key] = (self.codec.decode(value), expires_at - now)
+        except Exception as e:
+            logger.error(f"Disk cache get error: {e}")
+            return {}
+        return result
+    
+    def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
+        """Set value on disk with TTL and optional tags."""
+        return self.set_many({key: value}, ttl, {key: tags} if tags else None)
+    
+    def set_many(self, items: Dict[str, Any], ttl: float,
+                 tags: Optional[Dict[str, List[str]]] = None) -> bool:
+        """Set multiple values (and their tags) in a single transaction."""
+        if not items:
+            return True
+        tags = tags or {}
+        now = time.time()
+        try:
+            rows = [
+                (key, self.codec.encode(value), now + ttl, now)
+                for key, value in items.items()
+            ]
+            tag_rows = [
+                (tag, key) for key in items for tag in tags.get(key) or ()
+            ]
+            conn = self._conn()
+            with self._transaction(conn):
+                conn.executemany(
+                    'INSERT OR REPLACE INTO entries (key, value, expires_at, created_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    rows
+                )
+                self._delete_tags(conn, list(items))
+                conn.executemany('INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)', tag_rows)
+            logger.debug(f"Disk cache set: {len(items)} keys (TTL: {ttl}s)")
+            return True
+        except Exception as e:
+            logger.error(f"Disk cache set error: {e}")
+            return False
+    
+    def delete(self, key: str) -> bool:
+        """Delete key from disk."""
+        return bool(self.delete_many([key]))
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete multiple keys in a single transaction."""
+        if not keys:
+            return 0
+        try:
+            conn = self._conn()
+            with self._transaction(conn):
+                return self._delete_keys(conn, list(keys))
+        except Exception as e:
+            logger.error(f"Disk cache delete error: {e}")
+            return 0
+    
+    def invalidate_tags(self, tags: List[str]) -> List[str]:
+        """Delete every key carrying any of the tags in a single transaction."""
+        if not tags:
+            return []
+        try:
+            conn = self._conn()
+            with self._transaction(conn):
+                keys = set()
+                for chunk in _chunks(list(tags)):
+                    placeholders = ','.join('?' * len(chunk))
+                    keys.update(row[0] for row in conn.execute(
+                        f'SELECT DISTINCT key FROM tags WHERE tag IN ({placeholders})', chunk
+                    ))
+                keys = list(keys)
+                existing = set()
+                for chunk in _chunks(keys):
+                    placeholders = ','.join('?' * len(chunk))
+                    existing.update(row[0] for row in conn.execute(
+                        f'SELECT key FROM entries WHERE key IN ({placeholders})', chunk
+                    ))
+                self._delete_keys(conn, keys)
+            if existing:
+                logger.debug(f"Disk cache invalidated {len(existing)} keys for tags: {tags}")
+            return list(existing)
+        except Exception as e:
+            logger.error(f"Disk cache tag invalidation error: {e}")
+            return []
+    
+    def clear(self) -> bool:
+        """Delete every entry."""
+        try:
+            conn = self._conn()
+            with self._transaction(conn):
+                conn.execute('DELETE FROM entries')
+                conn.execute('DELETE FROM tags')
+            logger.info("Disk cache cleared")
+            return True
+        except Exception as e:
+            logger.error(f"Disk cache clear error: {e}")
+            return False
+    
+    def cleanup_expired(self, max_items: Optional[int] = None) -> int:
+        """
+        Delete expired rows, oldest expiry first.
+        
+        Args:
+            max_items: Maximum number of rows to delete (None for all)
+        
+        Returns:
+            Number of entries removed
+        """
+        try:
+            conn = self._conn()
+            with self._transaction(conn):
+                keys = [row[0] for row in conn.execute(
+                    'SELECT key FROM entries WHERE expires_at <= ? ORDER BY expires_at LIMIT ?',
+                    (time.time(), -1 if max_items is None else max_items)
+                )]
+                removed = self._delete_keys(conn, keys)
+        except Exception as e:
+            logger.error(f"Disk cache cleanup error: {e}")
+            return 0
+        
+        self.expirations += removed
+        for key in keys:
+            self._notify_eviction(key, 'expired')
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired disk cache entries")
+        return removed
+    
+    def has_expired(self) -> bool:
+        """Whether any row has expired."""
+        try:
+            return self._conn().execute(
+                'SELECT 1 FROM entries WHERE expires_at <= ? LIMIT 1', (time.time(),)
+            ).fetchone() is not None
+        except Exception as e:
+            logger.error(f"Disk cache expiry check error: {e}")
+            return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current cache statistics."""
+        try:
+            entries = self._conn().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        except Exception as e:
+            logger.error(f"Disk cache stats error: {e}")
+            entries = None
+        return {
+            'backend': 'disk',
+            'path': self.path,
+            'codec': self.codec.name,
+            'entries': entries,
+            'bytes': self.resident_bytes(),
+            'expirations': self.expirations
+        }
+    
+    def resident_bytes(self) -> Optional[int]:
+        """Size of the database file and its write-ahead log."""
+        total = 0
+        for path in (self.path, f"{self.path}-wal"):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+    
+    def close(self):
+        """Close every thread's connection."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Disk cache close error: {e}")
+        self._local = threading.local()
+    
+    def _delete_keys(self, conn: sqlite3.Connection, keys: List[str]) -> int:
+        """Delete entries and their tag rows; must run inside a transaction."""
+        removed = 0
+        for chunk in _chunks(keys):
+            placeholders = ','.join('?' * len(chunk))
+            removed += conn.execute(
+                f'DELETE FROM entries WHERE key IN ({placeholders})', chunk
+            ).rowcount
+        self._delete_tags(conn, keys)
+        return removed
+    
+    @staticmethod
+    def _delete_tags(conn: sqlite3.Connection, keys: List[str]):
+        for chunk in _chunks(keys):
+            placeholders = ','.join('?' * len(chunk))
+            conn.execute(f'DELETE FROM tags WHERE key IN ({placeholders})', chunk)
+    
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the write lock up front (BEGIN IMMEDIATE)."""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
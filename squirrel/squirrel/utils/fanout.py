@@ -0,0 +1,183 @@
+"""
+Bounded-concurrency fan-out for squirrel service.
+Runs one call per key (e.g. one roster request per team) with at most
+max_concurrency calls in flight, collecting results and failures per key
+instead of failing the whole batch on the first error.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FanOut:
+    """
+    Fans calls out over a bounded thread pool (map) or bounded tasks (amap).
+    
+    Calls run in the caller's context, so context variables such as the
+    request priority lane carry over into worker threads. Upstream rate
+    limits still apply: each call waits on the rate limiter as usual, the
+    fan-out only overlaps the round trips the budget allows.
+    """
+    
+    def __init__(self, max_concurrency: int = 8):
+        """
+        Initialize fan-out.
+        
+        Args:
+            max_concurrency: Maximum calls in flight (threads in the pool, tasks per amap batch)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        
+        self.batches = 0
+        self.calls = 0
+        self.failures = 0
+        self.peak_in_flight = 0
+        self.total_time = 0.0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="squirrel-fanout"
+                )
+            return self._executor
+    
+    def _started(self):
+        with self._lock:
+            self._in_flight += 1
+            self.calls += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+    
+    def _finished(self, failed: bool):
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self.failures += 1
+    
+    def _record_batch(self, elapsed: float):
+        with self._lock:
+            self.batches += 1
+            self.total_time += elapsed
+    
+    def map(
+        self,
+        keys: Iterable[str],
+        func: Callable[[str], Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """
+        Call func(key) for every key on the thread pool.
+        
+        Args:
+            keys: Keys to fan out over
+            func: Function taking a key
+        
+        Returns:
+            Tuple of (results, errors), each mapping key to its return value or exception
+        """
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        if not keys:
+            return results, errors
+        
+        def call(key: str) -> Any:
+            self._started()
+            failed = True
+            try:
+                result = func(key)
+                failed = False
+                return result
+            finally:
+                self._finished(failed)
+        
+        start = time.perf_counter()
+        if len(keys) == 1 or self.max_concurrency == 1:
+            # Not worth a hop to the pool
+            for key in keys:
+                try:
+                    results[key] = call(key)
+                except Exception as e:
+                    errors[key] = e
+        else:
+            executor = self._get_executor()
+            futures = {
+                key: executor.submit(contextvars.copy_context().run, call, key)
+                for key in keys
+            }
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    errors[key] = e
+        self._record_batch(time.perf_counter() - start)
+        return results, errors
+    
+    async def amap(
+        self,
+        keys: Iterable[str],
+        func: Callable[[str], Awaitable[Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """
+        Await func(key) for every key, at most max_concurrency at a time.
+        
+        Args:
+            keys: Keys to fan out over
+            func: Coroutine function taking a key
+        
+        Returns:
+            Tuple of (results, errors), each mapping key to its return value or exception
+        """
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        if not keys:
+            return results, errors
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def call(key: str):
+            async with semaphore:
+                self._started()
+                failed = True
+                try:
+                    results[key] = await func(key)
+                    failed = False
+                except Exception as e:
+                    errors[key] = e
+                finally:
+                    self._finished(failed)
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(call(key) for key in keys))
+        self._record_batch(time.perf_counter() - start)
+        return results, errors
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fan-out statistics."""
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'batches': self.batches,
+                'calls': self.calls,
+                'failures': self.failures,
+                'in_flight': self._in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'avg_batch_time': round(self.total_time / self.batches, 4) if self.batches else None
+            }
+    
+    def close(self):
+        """Shut down the thread pool, waiting for running calls."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
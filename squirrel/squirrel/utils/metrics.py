@@ -0,0 +1,298 @@
+"""
+Cache instrumentation for squirrel service.
+Counts lookups and evictions per key type, records backend latency, and
+tracks whether the lookups made while serving a request hit the cache.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+# Lookup outcomes served from the cache vs. from the upstream source
+HIT_OUTCOMES = ('hits', 'stale_hits', 'stale_on_error')
+MISS_OUTCOMES = ('misses', 'coalesced')
+
+
+def key_type(key: str) -> str:
+    """Metrics label for a cache key: its first two segments (e.g. 'foolsball:roster')."""
+    return ':'.join(key.split(':', 2)[:2])
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, safe to share between threads."""
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize histogram.
+        
+        Args:
+            buckets: Sorted bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, seconds: float):
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+    
+    def _copy(self) -> Tuple[list, int, float, float]:
+        """Consistent (counts, count, sum, max)."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile as the upper bound of the bucket containing it.
+        
+        Args:
+            q: Percentile between 0 and 100
+        
+        Returns:
+            Latency in seconds, or None without observations
+        """
+        counts, total, _, maximum = self._copy()
+        return self._percentile(counts, total, maximum, q)
+    
+    def _percentile(self, counts: list, total: int, maximum: float, q: float) -> Optional[float]:
+        if not total:
+            return None
+        rank = q / 100.0 * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return maximum
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get summary statistics and cumulative bucket counts."""
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return round(seconds * 1000, 3) if seconds is not None else None
+        
+        counts, total, seconds, maximum = self._copy()
+        cumulative = {}
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            cumulative[f"le_{ms(bound)}ms"] = seen
+        cumulative['le_inf'] = total
+        
+        return {
+            'count': total,
+            'avg_ms': ms(seconds / total) if total else None,
+            'p50_ms': ms(self._percentile(counts, total, maximum, 50)),
+            'p95_ms': ms(self._percentile(counts, total, maximum, 95)),
+            'p99_ms': ms(self._percentile(counts, total, maximum, 99)),
+            'max_ms': ms(maximum),
+            'buckets': cumulative
+        }
+
+
+class CacheLookups:
+    """
+    Cache lookup outcomes recorded while serving one request. Fan-out worker
+    threads copy the request's context and so share one instance.
+    """
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def record(self, outcome: str):
+        """Count one lookup outcome (one of HIT_OUTCOMES or MISS_OUTCOMES)."""
+        with self._lock:
+            if outcome in HIT_OUTCOMES:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    @property
+    def cached(self) -> bool:
+        """True if the request made cache lookups and all of them were served from cache."""
+        return self.hits > 0 and self.misses == 0
+
+
+_current_lookups: ContextVar[Optional[CacheLookups]] = ContextVar(
+    'squirrel_cache_lookups', default=None
+)
+
+
+@contextmanager
+def track_cache_lookups() -> Iterator[CacheLookups]:
+    """
+    Record the outcome of every cache lookup made inside the block.
+    Works across awaits and worker threads started with asyncio.to_thread.
+    
+    Example:
+        with track_cache_lookups() as lookups:
+            teams = await squirrel.aget_teams()
+        response.cached = lookups.cached
+    """
+    lookups = CacheLookups()
+    token = _current_lookups.set(lookups)
+    try:
+        yield lookups
+    finally:
+        _current_lookups.reset(token)
+
+
+def record_request_lookup(outcome: str):
+    """Count a lookup outcome in the current request's tracker, if any (see track_cache_lookups)."""
+    lookups = _current_lookups.get()
+    if lookups is not None:
+        lookups.record(outcome)
+
+
+class RateMeter:
+    """
+    Events per second over a sliding window, kept in one-second buckets so
+    memory stays constant however many events are marked.
+    """
+    
+    def __init__(self, window: int = 60):
+        """
+        Initialize rate meter.
+        
+        Args:
+            window: Seconds the rate is averaged over
+        """
+        self.window = window
+        self._counts = [0] * window
+        self._seconds = [0] * window
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self.total = 0
+    
+    def mark(self, count: int = 1):
+        """Record count events now."""
+        second = int(time.time())
+        index = second % self.window
+        with self._lock:
+            if self._seconds[index] != second:
+                self._seconds[index] = second
+                self._counts[index] = 0
+            self._counts[index] += count
+            self.total += count
+    
+    def rate(self) -> float:
+        """Average events per second over the window (or since creation, if shorter)."""
+        now = time.time()
+        second = int(now)
+        with self._lock:
+            events = sum(
+                count for count, start in zip(self._counts, self._seconds)
+                if second - start < self.window
+            )
+        return events / min(self.window, max(1.0, now - self._started))
+
+
+class CacheMetrics:
+    """
+    Counters and latency histograms for one cache namespace.
+    Lookups and evictions are broken down by key type (see key_type).
+    Safe to update from several threads.
+    """
+    
+    COUNTERS = HIT_OUTCOMES + MISS_OUTCOMES + ('sets', 'evictions', 'expirations')
+    
+    def __init__(self, namespace: Optional[str] = None):
+        """
+        Initialize cache metrics.
+        
+        Args:
+            namespace: Cache namespace these metrics belong to
+        """
+        self.namespace = namespace
+        self.totals = dict.fromkeys(self.COUNTERS, 0)
+        self.by_key_type: Dict[str, Dict[str, int]] = {}
+        self.latency = {
+            'get': LatencyHistogram(),
+            'set': LatencyHistogram()
+        }
+        self._lock = threading.Lock()
+    
+    def record(self, key: str, counter: str, count: int = 1):
+        """Increment a counter for a key."""
+        label = key_type(key)
+        with self._lock:
+            self.totals[counter] += count
+            counters = self.by_key_type.get(label)
+            if counters is None:
+                counters = self.by_key_type[label] = dict.fromkeys(self.COUNTERS, 0)
+            counters[counter] += count
+    
+    def record_lookup(self, key: str, outcome: str):
+        """
+        Record the outcome of a lookup, including in the current request's tracker.
+        
+        Args:
+            key: Cache key
+            outcome: One of HIT_OUTCOMES or MISS_OUTCOMES
+        """
+        self.record(key, outcome)
+        record_request_lookup(outcome)
+    
+    def record_eviction(self, key: str, reason: str):
+        """Record an entry dropped by the backend ('evicted' or 'expired')."""
+        self.record(key, 'evictions' if reason == 'evicted' else 'expirations')
+    
+    @contextmanager
+    def timed(self, operation: str) -> Iterator[None]:
+        """Record the duration of a backend operation ('get' or 'set')."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latency[operation].observe(time.perf_counter() - start)
+    
+    def snapshot(self, resident_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get all counters, hit ratios and latency summaries.
+        
+        Args:
+            resident_bytes: Bytes currently held by the backend, if known
+        """
+        def with_ratio(counters: Dict[str, int]) -> Dict[str, Any]:
+            hits = sum(counters[name] for name in HIT_OUTCOMES)
+            lookups = hits + sum(counters[name] for name in MISS_OUTCOMES)
+            return {**counters, 'hit_ratio': round(hits / lookups, 4) if lookups else None}
+        
+        with self._lock:
+            totals = dict(self.totals)
+            by_key_type = {label: dict(counters) for label, counters in self.by_key_type.items()}
+        
+        return {
+            'namespace': self.namespace,
+            **with_ratio(totals),
+            'resident_bytes': resident_bytes,
+            'by_key_type': {
+                label: with_ratio(counters)
+                for label, counters in sorted(by_key_type.items())
+            },
+            'latency': {
+                operation: histogram.snapshot()
+                for operation, histogram in self.latency.items()
+            }
+        }
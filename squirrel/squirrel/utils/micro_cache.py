@@ -0,0 +1,130 @@
+"""
+Micro-cache for squirrel service.
+Holds hot, fast-changing values (such as the live scoreboard) in process for
+a second or two and collapses concurrent misses into one upstream call.
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+import logging
+
+from .metrics import RateMeter, record_request_lookup
+from .singleflight import SingleFlight, AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class MicroCache:
+    """
+    Very short-lived in-process cache with request collapsing.
+    
+    A fetched value is reused for `ttl` seconds, and callers arriving while
+    a fetch is in flight share its result, so any number of concurrent
+    clients cost at most one upstream call per key per ttl. Failures are
+    never cached. A ttl of 0 keeps the request collapsing only.
+    """
+    
+    def __init__(self, ttl: float, window: int = 60):
+        """
+        Initialize micro-cache.
+        
+        Args:
+            ttl: Seconds a fetched value is served to later callers
+            window: Seconds the client and upstream rates are averaged over
+        """
+        self.ttl = ttl
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        
+        self.requests = RateMeter(window)
+        self.upstream = RateMeter(window)
+        self.hits = 0
+        self.coalesced = 0
+        self.errors = 0
+    
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        """Count a client request and return (found, value) for a fresh value."""
+        self.requests.mark()
+        cached = self._values.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            self.hits += 1
+            record_request_lookup('hits')
+            return True, cached[1]
+        return False, None
+    
+    def _store(self, key: str, value: Any):
+        self._values[key] = (time.monotonic() + self.ttl, value)
+    
+    def _record_fetch(self, shared: bool):
+        if shared:
+            self.coalesced += 1
+        record_request_lookup('coalesced' if shared else 'misses')
+    
+    def get(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Get a fresh value, or fetch it once for all concurrent callers.
+        
+        Args:
+            key: Cache key
+            func: Function fetching the value
+        
+        Returns:
+            Cached or fetched value
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+        
+        def load():
+            self.upstream.mark()
+            try:
+                value = func()
+            except Exception:
+                self.errors += 1
+                raise
+            self._store(key, value)
+            return value
+        
+        value, shared = self._flight.do(key, load)
+        self._record_fetch(shared)
+        return value
+    
+    async def aget(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of get; func is a coroutine function."""
+        found, value = self._lookup(key)
+        if found:
+            return value
+        
+        async def load():
+            self.upstream.mark()
+            try:
+                value = await func()
+            except Exception:
+                self.errors += 1
+                raise
+            self._store(key, value)
+            return value
+        
+        value, shared = await self._async_flight.do(key, load)
+        self._record_fetch(shared)
+        return value
+    
+    def invalidate(self, key: str):
+        """Drop a cached value so the next caller fetches it."""
+        self._values.pop(key, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit and collapsing counts, and client vs upstream request rates."""
+        client_qps = self.requests.rate()
+        upstream_qps = self.upstream.rate()
+        return {
+            'ttl': self.ttl,
+            'requests': self.requests.total,
+            'hits': self.hits,
+            'coalesced': self.coalesced,
+            'upstream_calls': self.upstream.total,
+            'errors': self.errors,
+            'client_qps': round(client_qps, 3),
+            'upstream_qps': round(upstream_qps, 3),
+            'requests_per_upstream_call': round(client_qps / upstream_qps, 1) if upstream_qps else None
+        }
@@ -1,72 +1,682 @@
 """
 Rate limiting utilities for squirrel service.
 """
+import asyncio
+import inspect
+import math
+import threading
 import time
 from collections import deque
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
 import logging
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Priority lanes, highest first (see RateLimiter lanes)
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_LIVE = 'live'
+PRIORITY_BACKGROUND = 'background'
+
+# Lane of the calls made by the current request or task. Worker threads started
+# with asyncio.to_thread inherit it; thread pools and new tasks set their own.
+request_priority: ContextVar[str] = ContextVar('request_priority', default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def use_priority(lane: str) -> Iterator[None]:
+    """
+    Run the enclosed calls in a priority lane.
+    
+    Example:
+        with use_priority(PRIORITY_BACKGROUND):
+            squirrel.get_players(team_id)
+    """
+    token = request_priority.set(lane)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+# Upper bound on a pause requested by an upstream, so a bogus header can't stall us for days
+_MAX_PAUSE = 600.0
+
+
+def _header_number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str], now: Optional[float] = None) -> Dict[str, Optional[float]]:
+    """
+    Read the throttling hints of an HTTP response.
+    Understands Retry-After (seconds or HTTP date) and the
+    X-RateLimit-Limit/-Remaining/-Reset family (also without the X- prefix).
+    Reset may be given in seconds from now or as an epoch timestamp.
+    
+    Args:
+        headers: Response headers
+        now: Current time (defaults to time.time())
+    
+    Returns:
+        Dict with 'retry_after' and 'reset' (seconds from now), 'limit' and
+        'remaining'; each None if absent or unparseable
+    """
+    now = time.time() if now is None else now
+    lowered = {name.lower(): value for name, value in headers.items()}
+    
+    retry_after = lowered.get('retry-after')
+    seconds = _header_number(retry_after)
+    if seconds is None and retry_after:
+        try:
+            seconds = parsedate_to_datetime(retry_after).timestamp() - now
+        except (TypeError, ValueError):
+            seconds = None
+    
+    def family(suffix: str) -> Optional[float]:
+        return _header_number(
+            lowered.get(f'x-ratelimit-{suffix}', lowered.get(f'ratelimit-{suffix}'))
+        )
+    
+    reset = family('reset')
+    if reset is not None and reset > now / 2:
+        # Epoch timestamp rather than a delay
+        reset -= now
+    return {
+        'retry_after': max(0.0, seconds) if seconds is not None else None,
+        'limit': family('limit'),
+        'remaining': family('remaining'),
+        'reset': max(0.0, reset) if reset is not None else None
+    }
+
+
+class _SlidingWindow:
+    """
+    Exact sliding window: at most max_calls start within any period.
+    Keeps one timestamp per call in the window, so memory and pruning work
+    grow with max_calls.
+    """
+    
+    name = 'sliding_window'
+    
+    def __init__(self):
+        # Start times of recent and reserved calls, in increasing order;
+        # entries in the future belong to callers still waiting for their slot
+        self.calls = deque()
+    
+    def _cleanup(self, now: float, period: float):
+        cutoff_time = now - period
+        while self.calls and self.calls[0] < cutoff_time:
+            self.calls.popleft()
+    
+    def reserve(self, now: float, max_calls: int, period: float) -> float:
+        self._cleanup(now, period)
+        slot = now
+        if len(self.calls) >= max_calls:
+            # Wait until the max_calls-th most recent call leaves the window
+            slot = max(now, self.calls[-max_calls] + period)
+        self.calls.append(slot)
+        return slot
+    
+    def cancel(self, slot: float, max_calls: int, period: float):
+        try:
+            self.calls.remove(slot)
+        except ValueError:
+            pass
+    
+    def available_at(self, now: float, max_calls: int, period: float, limit: int) -> float:
+        """Earliest time at which fewer than limit calls are in the window or waiting."""
+        self._cleanup(now, period)
+        if len(self.calls) < limit:
+            return now
+        # Once this call leaves the window only limit - 1 remain
+        return max(now, self.calls[-limit] + period + 1e-6)
+    
+    def usage(self, now: float, max_calls: int, period: float) -> Tuple[int, int]:
+        """Get (calls started in the window, callers waiting for a slot)."""
+        self._cleanup(now, period)
+        # Reservations are at the tail, so count from the right
+        waiting = 0
+        for call in reversed(self.calls):
+            if call <= now:
+                break
+            waiting += 1
+        return len(self.calls) - waiting, waiting
+    
+    def reset(self):
+        self.calls.clear()
+
+
+class _TokenBucket:
+    """
+    Token bucket holding up to max_calls tokens, refilled at max_calls per
+    period. Constant memory and O(1) per call. Allows a burst of max_calls,
+    then calls at the average rate, so a single period can see up to
+    2 * max_calls - 1 calls. Waiting callers drive the balance negative;
+    the deficit decides when each one's token arrives.
+    """
+    
+    name = 'token_bucket'
+    
+    def __init__(self):
+        self.tokens: Optional[float] = None
+        self.updated = 0.0
+    
+    def _refill(self, now: float, max_calls: int, period: float):
+        if self.tokens is None:
+            self.tokens = float(max_calls)
+        else:
+            self.tokens = min(
+                float(max_calls),
+                self.tokens + (now - self.updated) * max_calls / period
+            )
+        self.updated = now
+    
+    def reserve(self, now: float, max_calls: int, period: float) -> float:
+        self._refill(now, max_calls, period)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return now
+        return now + -self.tokens * period / max_calls
+    
+    def cancel(self, slot: float, max_calls: int, period: float):
+        if self.tokens is not None:
+            self.tokens = min(float(max_calls), self.tokens + 1)
+    
+    def available_at(self, now: float, max_calls: int, period: float, limit: int) -> float:
+        self._refill(now, max_calls, period)
+        return _bucket_available_at(now, self.tokens, max_calls, period, limit)
+    
+    def usage(self, now: float, max_calls: int, period: float) -> Tuple[int, int]:
+        self._refill(now, max_calls, period)
+        if self.tokens < 0:
+            return max_calls, math.ceil(-self.tokens)
+        return max_calls - math.floor(self.tokens), 0
+    
+    def reset(self):
+        self.tokens = None
+
+
+def _bucket_available_at(now: float, tokens: float, max_calls: int, period: float, limit: int) -> float:
+    """When a token bucket holding `tokens` has fewer than limit calls used or waiting."""
+    # used + waiting == max_calls - floor(tokens), so at least this many tokens are needed
+    needed = max_calls - limit + 1
+    if tokens >= needed:
+        return now
+    return now + (needed - tokens) * period / max_calls
+
+
+class _GCRA:
+    """
+    Generic cell rate algorithm: tracks a single theoretical arrival time
+    (TAT) that advances by period / max_calls per call. A call may start
+    once it is no more than period - period / max_calls ahead of the TAT.
+    Same limits as the token bucket with a single float of state.
+    """
+    
+    name = 'gcra'
+    
+    def __init__(self):
+        self.tat = 0.0
+    
+    def reserve(self, now: float, max_calls: int, period: float) -> float:
+        interval = period / max_calls
+        tat = max(self.tat, now)
+        slot = max(now, tat - (period - interval))
+        self.tat = tat + interval
+        return slot
+    
+    def cancel(self, slot: float, max_calls: int, period: float):
+        self.tat -= period / max_calls
+    
+    def available_at(self, now: float, max_calls: int, period: float, limit: int) -> float:
+        # Fewer than limit calls pending once the TAT is within limit - 1 intervals
+        return max(now, self.tat - (limit - 1) * period / max_calls)
+    
+    def usage(self, now: float, max_calls: int, period: float) -> Tuple[int, int]:
+        interval = period / max_calls
+        # Calls still counted against the burst allowance, including waiters
+        pending = max(0, math.ceil((self.tat - now) / interval - 1e-9))
+        waiting = max(0, pending - max_calls)
+        return pending - waiting, waiting
+    
+    def reset(self):
+        self.tat = 0.0
+
+
+ALGORITHMS = {
+    algorithm.name: algorithm for algorithm in (_SlidingWindow, _TokenBucket, _GCRA)
+}
+
+
+def _take(algorithm, now: float, max_calls: int, period: float, limit: int) -> Tuple[Optional[float], float]:
+    """
+    Reserve a slot unless limit calls are already in use or waiting.
+    
+    Returns:
+        (start time of the reserved slot, 0) or (None, time to try again)
+    """
+    if limit < max_calls:
+        retry_at = algorithm.available_at(now, max_calls, period, limit)
+        if retry_at > now:
+            return None, retry_at
+    return algorithm.reserve(now, max_calls, period), 0.0
+
+
+class _RedisTokenBucket:
+    """
+    Token bucket kept in a Redis hash and updated by an atomic Lua script,
+    so every process using the same key shares one budget. The script reads
+    the clock with TIME, so replicas with skewed clocks agree on refills.
+    While Redis is unreachable the wrapped local algorithm takes over; Redis
+    is retried every retry_interval seconds.
+    
+    Methods make a network round trip, so RateLimiter calls them outside its
+    lock (and acquire() on a worker thread); the fallback has its own lock.
+    """
+    
+    name = 'redis_token_bucket'
+    
+    # KEYS[1]: bucket hash; ARGV: capacity, period (s), tokens to take (-1 gives one back),
+    # optionally the tokens that must be left before taking (priority lane ceilings)
+    # Returns {tokens left, seconds to wait, 1 if taken} as strings (Lua numbers become integers)
+    _SCRIPT = """
+    if redis.replicate_commands then redis.replicate_commands() end
+    local capacity = tonumber(ARGV[1])
+    local period = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local needed = tonumber(ARGV[4])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local rate = capacity / period
+    
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1])
+    local updated = tonumber(state[2])
+    if tokens == nil or updated == nil then
+        tokens = capacity
+        updated = now
+    end
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    if needed and cost > 0 and tokens < needed then
+        -- Over the lane's ceiling: take nothing, report when enough tokens are back
+        return {tostring(tokens), tostring((needed - tokens) / rate), '0'}
+    end
+    tokens = tokens - cost
+    
+    if cost ~= 0 then
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+        -- An idle bucket is full again after one period
+        redis.call('PEXPIRE', KEYS[1], math.ceil(period * 2000))
+    end
+    
+    local wait = 0
+    if tokens < 0 then
+        wait = -tokens / rate
+    end
+    return {tostring(tokens), tostring(wait), '1'}
+    """
+    
+    def __init__(self, client, key: str, fallback, retry_interval: float = 5.0):
+        """
+        Initialize Redis token bucket.
+        
+        Args:
+            client: redis.Redis client (short socket timeouts recommended)
+            key: Redis key of the bucket, shared by all replicas
+            fallback: Local algorithm used while Redis is unreachable
+            retry_interval: Seconds to wait before trying Redis again after an error
+        """
+        self.key = key
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self._script = client.register_script(self._SCRIPT)
+        self._fallback_lock = threading.Lock()
+        self._retry_at = 0.0
+        self.fallbacks = 0
+    
+    @property
+    def available(self) -> bool:
+        return time.time() >= self._retry_at
+    
+    def _call(self, max_calls: int, period: float, cost: int,
+              needed: Optional[int] = None) -> Optional[Tuple[float, float, bool]]:
+        """Run the script; returns (tokens, wait, taken) or None if Redis is unreachable."""
+        if not self.available:
+            return None
+        args = [max_calls, period, cost] if needed is None else [max_calls, period, cost, needed]
+        try:
+            tokens, wait, taken = self._script(keys=[self.key], args=args)
+            return float(tokens), float(wait), int(taken) == 1
+        except Exception as e:
+            self._retry_at = time.time() + self.retry_interval
+            self.fallbacks += 1
+            logger.warning(
+                f"Distributed rate limiter unavailable, limiting locally for "
+                f"{self.retry_interval}s: {e}"
+            )
+            return None
+    
+    def take(self, now: float, max_calls: int, period: float, limit: int) -> Tuple[Optional[float], float]:
+        """Like _take, with the lane check and the reservation in one round trip."""
+        needed = max_calls - limit + 1 if limit < max_calls else None
+        result = self._call(max_calls, period, 1, needed)
+        if result is None:
+            with self._fallback_lock:
+                return _take(self.fallback, now, max_calls, period, limit)
+        tokens, wait, taken = result
+        if not taken:
+            return None, now + wait
+        return now + wait, 0.0
+    
+    def cancel(self, slot: float, max_calls: int, period: float):
+        if self._call(max_calls, period, -1) is None:
+            with self._fallback_lock:
+                self.fallback.cancel(slot, max_calls, period)
+    
+    def usage(self, now: float, max_calls: int, period: float) -> Tuple[int, int]:
+        result = self._call(max_calls, period, 0)
+        if result is None:
+            with self._fallback_lock:
+                return self.fallback.usage(now, max_calls, period)
+        tokens = result[0]
+        if tokens < 0:
+            return max_calls, math.ceil(-tokens)
+        return max_calls - math.floor(tokens), 0
+    
+    def reset(self):
+        with self._fallback_lock:
+            self.fallback.reset()
+
 
 class RateLimiter:
     """
-    Token bucket rate limiter implementation.
-    Limits the number of calls within a time period.
+    Rate limiter allowing max_calls per period.
+    
+    The limiting algorithm is pluggable: 'sliding_window' (exact, memory grows
+    with max_calls), 'token_bucket' or 'gcra' (constant memory, O(1) checks,
+    burst of max_calls followed by the average rate).
+    
+    Callers reserve a slot under a lock and then wait for it outside the lock,
+    so the limit holds across threads and tasks, and waiters proceed in the
+    order they arrived (FIFO). wait_if_needed() blocks the calling thread;
+    acquire() waits with asyncio.sleep so the event loop keeps running. Once
+    distribute()d, Redis round trips happen outside the lock, and acquire()
+    and aget_stats() make them on a worker thread.
+    
+    Upstream throttling hints passed to observe_headers() (Retry-After, or
+    X-RateLimit-Remaining: 0 with a reset time) pause every caller until the
+    upstream is ready again.
+    
+    Optional priority lanes, highest first, each reserve a share of the
+    budget that lower lanes may never use, so bulk work can't starve
+    latency-sensitive calls. A call in a lower lane waits without holding a
+    slot until usage is below its lane's ceiling; calls in the highest lane
+    (or in no configured lane) queue FIFO as usual. The lane comes from the
+    request_priority context variable unless passed explicitly.
+    
+    Every algorithm keeps the reserved calls available to start at once, but
+    they refill differently: with 'token_bucket' and 'gcra' a lower lane gets
+    the full average rate once the reserve is held back, while the
+    'sliding_window' can only hold it by leaving slots idle, capping each
+    lower lane at its ceiling per period. Prefer a bucket with lanes.
     """
     
-    def __init__(self, max_calls: int, period: int):
+    def __init__(self, max_calls: int, period: int, algorithm: str = 'sliding_window',
+                 lanes: Optional[Dict[str, float]] = None):
         """
         Initialize rate limiter.
         
         Args:
             max_calls: Maximum number of calls allowed
             period: Time period in seconds
+            algorithm: 'sliding_window', 'token_bucket' or 'gcra'
+            lanes: Priority lanes, highest first, mapped to the share of the
+                budget (0.0-1.0) reserved for them (e.g. {'interactive': 0.2,
+                'live': 0.3, 'background': 0.0})
+        
+        Raises:
+            ValueError: If the algorithm is unknown or the lane shares exceed 1.0
         """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Invalid rate limit algorithm '{algorithm}'. "
+                f"Valid algorithms: {list(ALGORITHMS)}"
+            )
+        if lanes and sum(lanes.values()) > 1.0:
+            raise ValueError(f"Rate limit lane shares add up to more than 1.0: {lanes}")
+        
+        # Share of the budget reserved for the lanes above each lane
+        self.lanes = dict(lanes or {})
+        self._reserved_above: Dict[str, float] = {}
+        above = 0.0
+        for lane, share in self.lanes.items():
+            self._reserved_above[lane] = above
+            above += share
+        self._lane_stats = {
+            lane: {'granted': 0, 'deferred': 0, 'deferred_time': 0.0} for lane in self.lanes
+        }
+        
         self.max_calls = max_calls
         self.period = period
-        self.calls = deque()
-        self._lock = False
+        self.algorithm = algorithm
+        if algorithm == 'sliding_window' and any(
+            self._lane_ceiling(lane) < max_calls for lane in self.lanes
+        ):
+            logger.info(
+                f"Sliding window rate limiter caps lower priority lanes at their ceiling "
+                f"per {period}s; token_bucket or gcra let them use the full rate"
+            )
+        self._algorithm = ALGORITHMS[algorithm]()
+        self._lock = threading.Lock()
+        self.total_waits = 0
+        self.total_wait_time = 0.0
+        self.pauses = 0
+        self.upstream_limits: Optional[Dict[str, Optional[float]]] = None
+        self._paused_until = 0.0
+    
+    def _lane_ceiling(self, lane: str) -> int:
+        """Calls a lane may have in use or waiting: the budget minus the higher lanes' share."""
+        reserved = self._reserved_above.get(lane, 0.0)
+        return max(1, math.floor(self.max_calls * (1.0 - reserved) + 1e-9))
     
-    def _cleanup_old_calls(self):
-        """Remove calls outside the current time window."""
-        current_time = time.time()
-        cutoff_time = current_time - self.period
+    def _reserve(self, lane: Optional[str] = None) -> Tuple[Optional[float], float]:
+        """
+        Reserve the next free slot if the lane may take one.
         
-        while self.calls and self.calls[0] < cutoff_time:
-            self.calls.popleft()
+        Args:
+            lane: Priority lane (the request_priority context variable if None)
+        
+        Returns:
+            (start time of the reserved slot, 0) - now if a call may proceed
+            immediately - or (None, time to try again) if the lane is over its ceiling
+        """
+        lane = lane or request_priority.get()
+        with self._lock:
+            now = time.time()
+            # While paused, calls are spaced out from the end of the pause
+            start = max(now, self._paused_until)
+            stats = self._lane_stats.get(lane)
+            limit = self._lane_ceiling(lane) if stats is not None else self.max_calls
+            algorithm = self._algorithm
+            if not self.distributed:
+                slot, retry_at = _take(algorithm, start, self.max_calls, self.period, limit)
+                self._count(stats, now, slot, retry_at)
+                return slot, retry_at
+        
+        # Redis round trip without holding the lock
+        slot, retry_at = algorithm.take(start, self.max_calls, self.period, limit)
+        with self._lock:
+            self._count(stats, now, slot, retry_at)
+        return slot, retry_at
+    
+    def _count(self, stats: Optional[dict], now: float, slot: Optional[float], retry_at: float):
+        """Record a reservation or lane deferral; called under the lock."""
+        if slot is None:
+            stats['deferred'] += 1
+            stats['deferred_time'] += retry_at - now
+            return
+        if stats is not None:
+            stats['granted'] += 1
+        if slot > now:
+            self.total_waits += 1
+            self.total_wait_time += slot - now
+    
+    @property
+    def distributed(self) -> bool:
+        """Whether the budget is shared through Redis (see distribute)."""
+        return isinstance(self._algorithm, _RedisTokenBucket)
     
-    def can_proceed(self) -> bool:
-        """Check if a call can proceed without blocking."""
-        self._cleanup_old_calls()
-        return len(self.calls) < self.max_calls
+    async def _offload(self, func, *args):
+        """Call func on a worker thread if it may make a Redis round trip, else inline."""
+        if self.distributed:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
     
-    def wait_if_needed(self) -> float:
+    def distribute(self, client, key: str, retry_interval: float = 5.0):
         """
-        Wait if rate limit is exceeded.
-        Returns the time waited in seconds.
+        Share this limiter's budget with every process using the same Redis key.
+        Calls are then limited by a token bucket in Redis; the configured
+        algorithm keeps limiting locally while Redis is unreachable.
+        
+        Args:
+            client: redis.Redis client
+            key: Redis key of the shared bucket (e.g. per upstream host)
+            retry_interval: Seconds to wait before trying Redis again after an error
         """
-        self._cleanup_old_calls()
+        with self._lock:
+            local = getattr(self._algorithm, 'fallback', self._algorithm)
+            self._algorithm = _RedisTokenBucket(client, key, local, retry_interval)
+        logger.info(f"Rate limiter distributed via Redis key {key}")
+    
+    def _cancel(self, slot: float):
+        """Give back a reserved slot that will not be used."""
+        if self.distributed:
+            self._algorithm.cancel(slot, self.max_calls, self.period)
+            return
+        with self._lock:
+            self._algorithm.cancel(slot, self.max_calls, self.period)
+    
+    def _usage(self, now: float) -> Tuple[int, int]:
+        """(calls in use, callers waiting); takes the lock unless the state is in Redis."""
+        if self.distributed:
+            return self._algorithm.usage(now, self.max_calls, self.period)
+        with self._lock:
+            return self._algorithm.usage(now, self.max_calls, self.period)
+    
+    def can_proceed(self, priority: Optional[str] = None) -> bool:
+        """Check if a call in the given lane (see acquire) can proceed without blocking."""
+        lane = priority or request_priority.get()
+        now = time.time()
+        if now < self._paused_until:
+            return False
+        limit = self._lane_ceiling(lane) if lane in self._lane_stats else self.max_calls
+        used, waiting = self._usage(now)
+        return used + waiting < limit
+    
+    def pause(self, seconds: float):
+        """Hold every call for the given number of seconds (capped at 10 minutes)."""
+        with self._lock:
+            self._pause(time.time(), seconds)
+    
+    def _pause(self, now: float, seconds: float):
+        until = now + min(seconds, _MAX_PAUSE)
+        if until > self._paused_until:
+            self._paused_until = until
+            self.pauses += 1
+            logger.warning(f"Rate limiter paused for {until - now:.1f}s by upstream")
+    
+    def observe_headers(self, headers: Mapping[str, str]):
+        """
+        Apply the throttling hints of an upstream response.
         
-        if len(self.calls) < self.max_calls:
-            self.calls.append(time.time())
-            return 0.0
+        Args:
+            headers: Response headers (see parse_rate_limit_headers)
+        """
+        now = time.time()
+        hints = parse_rate_limit_headers(headers, now)
+        with self._lock:
+            self._apply_hints(now, hints)
+    
+    def _apply_hints(self, now: float, hints: Dict[str, Optional[float]]):
+        """Pause for Retry-After or an exhausted upstream quota; called under the lock."""
+        if hints['limit'] is not None or hints['remaining'] is not None:
+            self.upstream_limits = {
+                'limit': hints['limit'],
+                'remaining': hints['remaining'],
+                'reset': hints['reset'],
+                'seen_at': now
+            }
+        hold = hints['retry_after']
+        if hints['remaining'] == 0 and hints['reset'] is not None:
+            hold = max(hold or 0.0, hints['reset'])
+        if hold:
+            self._pause(now, hold)
+    
+    def wait_if_needed(self, priority: Optional[str] = None) -> float:
+        """
+        Wait if rate limit is exceeded, blocking the calling thread.
+        Returns the time waited in seconds.
         
-        # Calculate wait time
-        oldest_call = self.calls[0]
-        wait_time = (oldest_call + self.period) - time.time()
+        Args:
+            priority: Priority lane (the request_priority context variable if None)
+        """
+        requested = time.time()
+        slot, retry_at = self._reserve(priority)
+        while slot is None:
+            time.sleep(max(0.0, retry_at - time.time()))
+            slot, retry_at = self._reserve(priority)
         
+        wait_time = slot - time.time()
         if wait_time > 0:
             logger.debug(f"Rate limit reached, waiting {wait_time:.2f}s")
             time.sleep(wait_time)
-            self._cleanup_old_calls()
+        return max(0.0, slot - requested)
+    
+    async def acquire(self, priority: Optional[str] = None) -> float:
+        """
+        Wait if rate limit is exceeded without blocking the event loop.
+        Returns the time waited in seconds. If the waiting task is cancelled
+        its slot is given back.
+        
+        Args:
+            priority: Priority lane (the request_priority context variable if None)
+        """
+        requested = time.time()
+        # The lane comes from the caller's context, which to_thread copies
+        slot, retry_at = await self._offload(self._reserve, priority)
+        while slot is None:
+            await asyncio.sleep(max(0.0, retry_at - time.time()))
+            slot, retry_at = await self._offload(self._reserve, priority)
         
-        self.calls.append(time.time())
-        return max(0, wait_time)
+        wait_time = slot - time.time()
+        if wait_time > 0:
+            logger.debug(f"Rate limit reached, waiting {wait_time:.2f}s")
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Give the slot back without awaiting, so cancellation is not delayed
+                if self.distributed:
+                    asyncio.get_running_loop().run_in_executor(None, self._cancel, slot)
+                else:
+                    self._cancel(slot)
+                raise
+        return max(0.0, slot - requested)
     
     def __call__(self, func):
-        """Decorator to apply rate limiting to a function."""
+        """Decorator to apply rate limiting to a function or coroutine function."""
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await self.acquire()
+                return await func(*args, **kwargs)
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             self.wait_if_needed()
@@ -75,76 +685,225 @@ class RateLimiter:
     
     def reset(self):
         """Reset the rate limiter."""
-        self.calls.clear()
+        with self._lock:
+            self._algorithm.reset()
+            self._paused_until = 0.0
         logger.debug("Rate limiter reset")
     
     def get_stats(self) -> dict:
         """Get current rate limiter statistics."""
-        self._cleanup_old_calls()
+        now = time.time()
+        used, waiting = self._usage(now)
+        with self._lock:
+            paused_for = max(0.0, self._paused_until - now)
+            lanes = {
+                lane: {
+                    'reserved': share,
+                    'ceiling': self._lane_ceiling(lane),
+                    'granted': self._lane_stats[lane]['granted'],
+                    'deferred': self._lane_stats[lane]['deferred'],
+                    'deferred_time': round(self._lane_stats[lane]['deferred_time'], 3)
+                }
+                for lane, share in self.lanes.items()
+            } or None
         return {
-            'current_calls': len(self.calls),
+            'algorithm': self.algorithm,
+            'current_calls': used,
             'max_calls': self.max_calls,
             'period': self.period,
-            'calls_remaining': self.max_calls - len(self.calls),
-            'percentage_used': (len(self.calls) / self.max_calls) * 100
+            'calls_remaining': max(0, self.max_calls - used - waiting),
+            'percentage_used': ((used + waiting) / self.max_calls) * 100,
+            'waiting': waiting,
+            'total_waits': self.total_waits,
+            'total_wait_time': round(self.total_wait_time, 3),
+            'paused_for': round(paused_for, 3),
+            'pauses': self.pauses,
+            'upstream_limits': self.upstream_limits,
+            'lanes': lanes,
+            'distributed': self._distributed_stats()
+        }
+    
+    async def aget_stats(self) -> dict:
+        """get_stats() for async callers; Redis is queried on a worker thread."""
+        return await self._offload(self.get_stats)
+    
+    def _distributed_stats(self) -> Optional[dict]:
+        if not self.distributed:
+            return None
+        return {
+            'key': self._algorithm.key,
+            'backend': 'redis' if self._algorithm.available else 'local',
+            'fallbacks': self._algorithm.fallbacks
         }
 
 
 class AdaptiveRateLimiter(RateLimiter):
     """
-    Adaptive rate limiter that adjusts based on success/failure rates.
-    Backs off on errors and recovers on successes.
+    Adaptive rate limiter that searches for the highest sustainable rate (AIMD).
+    
+    Every successful call adds increase_step / max_calls to the rate, so it
+    grows by increase_step calls per period while the upstream keeps up, up
+    to a ceiling above the initial rate. The rate is cut by backoff_factor
+    (at most once per call interval) when the smoothed error rate passes
+    error_threshold, when smoothed latency exceeds latency_tolerance times
+    its baseline, or at once on a 429 / Retry-After / exhausted quota.
     """
     
-    def __init__(self, max_calls: int, period: int, 
-                 backoff_factor: float = 0.5, recovery_factor: float = 1.1):
+    # Latency samples needed before latency is trusted as a congestion signal
+    MIN_LATENCY_SAMPLES = 5
+    
+    def __init__(self, max_calls: int, period: int,
+                 backoff_factor: float = 0.5, increase_step: float = 1.0,
+                 ceiling_factor: float = 2.0, min_calls: int = 1,
+                 error_threshold: float = 0.3, latency_tolerance: float = 2.0,
+                 smoothing: float = 0.2, algorithm: str = 'sliding_window',
+                 lanes: Optional[Dict[str, float]] = None):
         """
         Initialize adaptive rate limiter.
         
         Args:
             max_calls: Initial maximum calls
             period: Time period in seconds
-            backoff_factor: Factor to reduce rate on errors (0.0-1.0)
-            recovery_factor: Factor to increase rate on success (>1.0)
+            backoff_factor: Factor to reduce rate on congestion (0.0-1.0)
+            increase_step: Calls per period added for each period of successes
+            ceiling_factor: Highest rate as a multiple of max_calls (>= 1.0)
+            min_calls: Lowest rate in calls per period
+            error_threshold: Smoothed error rate (0.0-1.0) that triggers backoff
+            latency_tolerance: Backoff when smoothed latency exceeds this multiple of the baseline
+            smoothing: Weight of the newest sample in the moving averages (0.0-1.0)
+            algorithm: 'sliding_window', 'token_bucket' or 'gcra'
+            lanes: Priority lanes and their reserved shares (see RateLimiter)
         """
-        super().__init__(max_calls, period)
+        super().__init__(max_calls, period, algorithm, lanes)
         self.initial_max_calls = max_calls
         self.backoff_factor = backoff_factor
-        self.recovery_factor = recovery_factor
-        self.consecutive_errors = 0
-        self.consecutive_successes = 0
-    
-    def report_success(self):
-        """Report a successful call."""
-        self.consecutive_errors = 0
-        self.consecutive_successes += 1
-        
-        # Gradually recover rate limit after multiple successes
-        if self.consecutive_successes >= 5:
-            old_limit = self.max_calls
-            self.max_calls = min(
-                int(self.max_calls * self.recovery_factor),
-                self.initial_max_calls
-            )
-            if self.max_calls > old_limit:
-                logger.info(f"Rate limit increased: {old_limit} -> {self.max_calls}")
-            self.consecutive_successes = 0
-    
-    def report_error(self):
-        """Report a failed call (triggers backoff)."""
-        self.consecutive_successes = 0
-        self.consecutive_errors += 1
-        
-        # Back off after consecutive errors
-        if self.consecutive_errors >= 3:
-            old_limit = self.max_calls
-            self.max_calls = max(
-                int(self.max_calls * self.backoff_factor),
-                1  # Minimum 1 call
-            )
-            if self.max_calls < old_limit:
-                logger.warning(f"Rate limit decreased due to errors: {old_limit} -> {self.max_calls}")
-            self.consecutive_errors = 0
+        self.increase_step = increase_step
+        self.ceiling = max(max_calls, int(max_calls * ceiling_factor))
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        
+        self.rate = float(max_calls)
+        self.error_rate = 0.0
+        self.latency: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.latency_samples = 0
+        self.increases = 0
+        self.decreases = 0
+        self.last_decrease: Optional[Dict[str, Any]] = None
+        self._last_decrease_at = 0.0
+    
+    def report_success(self, latency: Optional[float] = None):
+        """
+        Report a successful call.
+        
+        Args:
+            latency: Response time in seconds, if measured
+        """
+        with self._lock:
+            now = time.time()
+            self._observe(error=False, latency=latency)
+            if self._latency_congested():
+                self._decrease(now, 'latency')
+            elif now >= self._paused_until and self.error_rate < self.error_threshold:
+                self._set_rate(self.rate + self.increase_step / self.max_calls)
+    
+    def report_error(self, latency: Optional[float] = None, throttled: bool = False):
+        """
+        Report a failed call (triggers backoff once errors pile up).
+        
+        Args:
+            latency: Response time in seconds, if a response arrived
+            throttled: The upstream rejected the call for its rate (429); backs off at once
+        """
+        with self._lock:
+            now = time.time()
+            self._observe(error=True, latency=latency)
+            if throttled:
+                self._decrease(now, 'throttled')
+            elif self.error_rate >= self.error_threshold:
+                self._decrease(now, 'errors')
+    
+    def _apply_hints(self, now: float, hints: Dict[str, Optional[float]]):
+        super()._apply_hints(now, hints)
+        if hints['retry_after'] is not None:
+            self._decrease(now, 'retry_after')
+        elif hints['remaining'] == 0:
+            self._decrease(now, 'quota_exhausted')
+    
+    def _observe(self, error: bool, latency: Optional[float]):
+        """Update the moving averages; called under the lock."""
+        alpha = self.smoothing
+        self.error_rate = alpha * (1.0 if error else 0.0) + (1 - alpha) * self.error_rate
+        if latency is None:
+            return
+        self.latency_samples += 1
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = alpha * latency + (1 - alpha) * self.latency
+        if self.latency_baseline is None:
+            self.latency_baseline = self.latency
+        else:
+            # Lowest smoothed latency seen, drifting up 1% per sample so a
+            # lasting change in the upstream becomes the new normal
+            self.latency_baseline = min(self.latency, self.latency_baseline * 1.01)
+    
+    def _latency_congested(self) -> bool:
+        return (
+            self.latency_samples >= self.MIN_LATENCY_SAMPLES
+            and self.latency > self.latency_baseline * self.latency_tolerance
+        )
+    
+    def _decrease(self, now: float, reason: str):
+        """Multiplicative decrease, at most once per call interval; called under the lock."""
+        if now - self._last_decrease_at < self.period / self.max_calls:
+            return
+        self._last_decrease_at = now
+        self.decreases += 1
+        self.last_decrease = {'at': now, 'reason': reason}
+        self._set_rate(self.rate * self.backoff_factor, reason)
+    
+    def _set_rate(self, rate: float, reason: Optional[str] = None):
+        self.rate = min(float(self.ceiling), max(float(self.min_calls), rate))
+        old_limit = self.max_calls
+        self.max_calls = int(self.rate)
+        if self.max_calls > old_limit:
+            self.increases += 1
+            logger.info(f"Rate limit increased: {old_limit} -> {self.max_calls}")
+        elif self.max_calls < old_limit:
+            logger.warning(f"Rate limit decreased ({reason}): {old_limit} -> {self.max_calls}")
+    
+    def _state(self, now: float) -> str:
+        if now < self._paused_until:
+            return 'paused'
+        if self._last_decrease_at and now - self._last_decrease_at < self.period:
+            return 'backoff'
+        if self.max_calls >= self.ceiling:
+            return 'ceiling'
+        return 'probing'
+    
+    def get_stats(self) -> dict:
+        """Get rate limiter statistics, including the adaptive rate and backoff state."""
+        stats = super().get_stats()
+        with self._lock:
+            stats['adaptive'] = {
+                'state': self._state(time.time()),
+                'rate': round(self.rate, 3),
+                'initial_max_calls': self.initial_max_calls,
+                'ceiling': self.ceiling,
+                'min_calls': self.min_calls,
+                'error_rate': round(self.error_rate, 3),
+                'latency': round(self.latency, 4) if self.latency is not None else None,
+                'latency_baseline': (
+                    round(self.latency_baseline, 4) if self.latency_baseline is not None else None
+                ),
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'last_decrease': self.last_decrease
+            }
+        return stats
 
 
 def rate_limit(max_calls: int, period: int):
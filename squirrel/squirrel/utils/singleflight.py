@@ -0,0 +1,149 @@
+"""
+Request coalescing utilities for squirrel service.
+Concurrent callers asking for the same key share a single in-flight call.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call shared by the leader and its waiters."""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+    The first caller (the leader) runs the function; callers arriving while
+    it is in flight block and receive the leader's result or exception.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Execute func once for all concurrent callers of key.
+        
+        Args:
+            key: Coalescing key
+            func: Function to execute
+        
+        Returns:
+            Tuple of (result, shared) where shared is True for waiters
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+        
+        if not leader:
+            logger.debug(f"Coalesced request: {key}")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        
+        return call.result, False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        with self._lock:
+            in_flight = len(self._calls)
+            waiting = sum(call.waiters for call in self._calls.values())
+        return {
+            'executions': self.executions,
+            'coalesced_waiters': self.coalesced,
+            'in_flight': in_flight,
+            'waiting': waiting
+        }
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight.
+    The leader starts func() as a task and every concurrent caller for the
+    key awaits that task. Callers await it through asyncio.shield, so one
+    cancelled request does not cancel the call the others are waiting on.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await func() once for all concurrent callers of key.
+        
+        Args:
+            key: Coalescing key
+            func: Coroutine function to execute
+        
+        Returns:
+            Tuple of (result, shared) where shared is True for waiters
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if shared:
+            self.coalesced += 1
+            logger.debug(f"Coalesced request: {key}")
+        else:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            self.executions += 1
+            call.add_done_callback(lambda done, key=key: self._finish(key, done))
+        
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(call), shared
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+    
+    def _finish(self, key: str, call: asyncio.Future):
+        """Forget a finished call, retrieving its exception if nobody is left to."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        return {
+            'executions': self.executions,
+            'coalesced_waiters': self.coalesced,
+            'in_flight': len(self._calls),
+            'waiting': max(0, sum(self._waiters.values()) - len(self._calls))
+        }
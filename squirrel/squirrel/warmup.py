@@ -0,0 +1,327 @@
+"""
+Cache warmup for squirrel service.
+Prefetches hot keys through the squirrel methods on startup and/or on a
+cron-like schedule, so game-day traffic starts on a warm cache.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from .squirrels import FoolsballSquirrel
+from .utils.rate_limiter import PRIORITY_BACKGROUND, use_priority
+
+logger = logging.getLogger(__name__)
+
+
+class CronSchedule:
+    """
+    Minimal five-field cron expression: minute hour day-of-month month day-of-week.
+    Each field accepts '*', numbers, ranges ('1-5'), steps ('*/15', '0-30/10')
+    and comma-separated lists. Day of week runs 0-6 from Sunday (7 is also
+    Sunday). As in cron, a day matches if either day field matches when both
+    are restricted. Times are local.
+    
+    Example:
+        CronSchedule("0 8 * * 0")  # Sundays at 08:00
+    """
+    
+    _FIELDS = (
+        ('minute', 0, 59),
+        ('hour', 0, 23),
+        ('day', 1, 31),
+        ('month', 1, 12),
+        ('weekday', 0, 7)
+    )
+    
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+        
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        parts = expression.split()
+        if len(parts) != len(self._FIELDS):
+            raise ValueError(
+                f"Invalid cron expression '{expression}': expected 5 fields, got {len(parts)}"
+            )
+        
+        self.expression = expression
+        fields = [
+            self._parse_field(part, name, low, high)
+            for part, (name, low, high) in zip(parts, self._FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+    
+    @staticmethod
+    def _parse_field(text: str, name: str, low: int, high: int) -> Set[int]:
+        """Expand one field into the set of values it matches."""
+        values = set()
+        for item in text.split(','):
+            spec, _, step = item.partition('/')
+            try:
+                step = int(step) if step else 1
+                if spec == '*':
+                    start, end = low, high
+                elif '-' in spec:
+                    start, end = (int(bound) for bound in spec.split('-', 1))
+                else:
+                    start = end = int(spec)
+            except ValueError:
+                raise ValueError(f"Invalid cron {name} field: '{text}'")
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f"Cron {name} field out of range ({low}-{high}): '{text}'")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, dt: datetime) -> bool:
+        day = dt.day in self.days
+        weekday = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+    
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        Get the first matching minute strictly after dt.
+        
+        Raises:
+            ValueError: If nothing matches within five years (e.g. Feb 30)
+        """
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(
+                    year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+class CacheWarmer:
+    """
+    Background task that prefetches configured key sets into the cache.
+    
+    Key sets are fetched through the squirrel's own methods, so entries get
+    the same keys, TTLs and tags as on-demand requests. Before every upstream
+    step the warmer checks the squirrel's rate limiter and waits while less
+    than `headroom` of the budget is left, so warming never starves live
+    requests.
+    """
+    
+    KEY_SETS = ('teams', 'players')
+    
+    def __init__(
+        self,
+        get_squirrel: Callable[[], FoolsballSquirrel],
+        key_sets: Tuple[str, ...] = KEY_SETS,
+        schedule: Optional[str] = None,
+        on_startup: bool = False,
+        headroom: float = 0.2
+    ):
+        """
+        Initialize cache warmer.
+        
+        Args:
+            get_squirrel: Callable returning the squirrel to warm (the active source)
+            key_sets: Key sets to prefetch ('teams', 'players')
+            schedule: Cron expression for periodic warmups (None for no schedule)
+            on_startup: Warm once as soon as the warmer starts
+            headroom: Share of the rate limit budget (0.0-1.0) left for live requests
+        
+        Raises:
+            ValueError: If a key set or the schedule is invalid
+        """
+        unknown = set(key_sets) - set(self.KEY_SETS)
+        if not key_sets or unknown:
+            raise ValueError(
+                f"Unknown warmup key sets: {sorted(unknown)}. "
+                f"Valid key sets: {list(self.KEY_SETS)}"
+            )
+        
+        self.get_squirrel = get_squirrel
+        self.key_sets = tuple(key_sets)
+        self.schedule = CronSchedule(schedule) if schedule else None
+        self.on_startup = on_startup
+        self.headroom = headroom
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        
+        self.runs = 0
+        self.next_run: Optional[float] = None
+        self.budget_waits = 0
+        self.budget_wait_time = 0.0
+        self.progress: Optional[Dict[str, Any]] = None
+        self.last_run: Optional[Dict[str, Any]] = None
+    
+    def start(self):
+        """Start the warmer on the running event loop."""
+        if not (self.on_startup or self.schedule):
+            logger.info("Cache warmer disabled (no schedule, not warming on startup)")
+            return
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"Cache warmer started (key sets: {list(self.key_sets)}, "
+            f"schedule: {self.schedule.expression if self.schedule else None}, "
+            f"on startup: {self.on_startup})"
+        )
+    
+    async def stop(self):
+        """Stop the warmer and wait for it to finish."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.next_run = None
+        logger.info("Cache warmer stopped")
+    
+    async def warm(self) -> Dict[str, Any]:
+        """
+        Run one warmup pass. Concurrent calls wait for the pass in progress.
+        
+        Returns:
+            Summary of the pass (see get_stats()['last_run'])
+        """
+        async with self._lock:
+            squirrel = self.get_squirrel()
+            started = time.time()
+            self.progress = {
+                'started_at': started,
+                'total': 1,
+                'completed': 0,
+                'failed': 0,
+                'current': None
+            }
+            errors: List[str] = []
+            
+            # Rosters are warmed per team, so the team list comes first
+            teams = await self._step(squirrel, 'teams', squirrel.aget_teams, errors)
+            if 'players' in self.key_sets:
+                if squirrel.source != 'espn':
+                    steps = [('players', squirrel.aget_players)]
+                else:
+                    # Without a team list (teams step failed) there is nothing to warm
+                    steps = [
+                        (f"roster:{team.id}", lambda team_id=team.id: squirrel.aget_players(team_id))
+                        for team in teams or ()
+                    ]
+                self.progress['total'] += len(steps)
+                for label, fetch in steps:
+                    await self._step(squirrel, label, fetch, errors)
+            
+            finished = time.time()
+            self.runs += 1
+            self.last_run = {
+                'started_at': started,
+                'finished_at': finished,
+                'duration': round(finished - started, 3),
+                'warmed': self.progress['completed'],
+                'failed': self.progress['failed'],
+                'errors': errors[-10:]
+            }
+            self.progress = None
+            logger.info(
+                f"Cache warmup finished: {self.last_run['warmed']} warmed, "
+                f"{self.last_run['failed']} failed in {self.last_run['duration']}s"
+            )
+            return self.last_run
+    
+    async def _step(
+        self,
+        squirrel: FoolsballSquirrel,
+        label: str,
+        fetch: Callable[[], Awaitable[Any]],
+        errors: List[str]
+    ) -> Any:
+        """Fetch one key set entry, recording progress. Failures are logged, not raised."""
+        self.progress['current'] = label
+        await self._wait_for_budget(squirrel)
+        try:
+            # Warmup calls only use the budget left over by user and live requests
+            with use_priority(PRIORITY_BACKGROUND):
+                result = await fetch()
+            self.progress['completed'] += 1
+            return result
+        except Exception as e:
+            self.progress['failed'] += 1
+            errors.append(f"{label}: {e}")
+            logger.warning(f"Cache warmup step {label} failed: {e}")
+            return None
+    
+    async def _wait_for_budget(self, squirrel: FoolsballSquirrel):
+        """Wait until more than `headroom` of the rate limit budget is free."""
+        limiter = squirrel.rate_limiter
+        if limiter is None:
+            return
+        while True:
+            stats = await limiter.aget_stats()
+            if stats['calls_remaining'] > stats['max_calls'] * self.headroom:
+                return
+            # Roughly the time for one call's slot to free up
+            delay = stats['period'] / stats['max_calls']
+            self.budget_waits += 1
+            self.budget_wait_time += delay
+            await asyncio.sleep(delay)
+    
+    async def _run(self):
+        """Warmer loop."""
+        if self.on_startup:
+            await self._safe_warm()
+        
+        while self.schedule:
+            next_run = self.schedule.next_after(datetime.now())
+            self.next_run = next_run.timestamp()
+            await asyncio.sleep(max(0.0, self.next_run - time.time()))
+            await self._safe_warm()
+        self.next_run = None
+    
+    async def _safe_warm(self):
+        try:
+            await self.warm()
+        except Exception as e:
+            self.progress = None
+            logger.error(f"Cache warmer error: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get warmer statistics and the progress of the pass in progress."""
+        progress = None
+        if self.progress is not None:
+            total = self.progress['total']
+            done = self.progress['completed'] + self.progress['failed']
+            progress = {
+                **self.progress,
+                'percent': round(100.0 * done / total, 1) if total else None
+            }
+        return {
+            'running': bool(self._task and not self._task.done()),
+            'key_sets': list(self.key_sets),
+            'schedule': self.schedule.expression if self.schedule else None,
+            'on_startup': self.on_startup,
+            'headroom': self.headroom,
+            'next_run': self.next_run,
+            'runs': self.runs,
+            'in_progress': progress,
+            'last_run': self.last_run,
+            'budget_waits': self.budget_waits,
+            'budget_wait_time': round(self.budget_wait_time, 3)
+        }
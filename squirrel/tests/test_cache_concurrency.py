@@ -0,0 +1,67 @@
+"""
+Concurrency stress tests for the in-memory cache backends.
+
+Reuses the workload of benchmarks/bench_cache_concurrency: worker threads
+hammer get/set/get_many/delete/invalidate_tags on a shared key space with
+TTLs short enough to expire mid-run while a reaper thread runs
+cleanup_expired. Throughput bounds are deliberately loose so the tests hold
+on a GIL build and on a single core; on a free-threaded build with several
+cores striping must also beat the single lock.
+
+Usage (from the squirrel service directory):
+    python -m pytest tests/test_cache_concurrency.py
+"""
+import os
+import sys
+
+import pytest
+
+from benchmarks.bench_cache_concurrency import run
+from squirrel.utils.cache import InMemoryCache, StripedInMemoryCache
+
+KEY_SPACE = 5000
+MAX_ENTRIES = 500
+THREADS = 8
+DURATION = 0.5
+
+BACKENDS = {
+    "single-lock": lambda: InMemoryCache(max_entries=MAX_ENTRIES),
+    "striped": lambda: StripedInMemoryCache(8, max_entries=MAX_ENTRIES),
+}
+
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def throughput(factory, threads: int, rounds: int = 3) -> float:
+    """Best ops/s over a few runs; run() checks the invariants after each."""
+    return max(run(factory, threads, DURATION, KEY_SPACE)[0] for _ in range(rounds))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("threads", [1, THREADS, 2 * THREADS])
+def test_invariants_hold_under_contention(backend, threads):
+    ops, stats = run(BACKENDS[backend], threads, DURATION, KEY_SPACE)
+    
+    assert ops > 0
+    assert stats["entries"] <= MAX_ENTRIES
+    # Entries were expired and evicted while the workers ran
+    assert stats["expirations"] > 0
+    assert stats["evictions"] > 0
+
+
+def test_striped_throughput_scales_with_threads():
+    single_one = throughput(BACKENDS["single-lock"], 1)
+    single_many = throughput(BACKENDS["single-lock"], THREADS)
+    striped_one = throughput(BACKENDS["striped"], 1)
+    striped_many = throughput(BACKENDS["striped"], THREADS)
+    
+    # More threads must not collapse throughput (lock convoys, livelock)
+    assert striped_many >= 0.4 * striped_one
+    assert single_many >= 0.4 * single_one
+    # Under the GIL striping only adds a hash and shard dispatch per call
+    # (0.5-0.8x of the single lock on one core); anything far below is a regression
+    assert striped_many >= 0.4 * single_many
+    
+    if FREE_THREADED and (os.cpu_count() or 1) >= 4:
+        # Threads really run in parallel, so separate locks must pay off
+        assert striped_many >= 1.2 * single_many
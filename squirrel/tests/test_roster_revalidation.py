@@ -0,0 +1,85 @@
+"""
+Roster revalidation over the async transport.
+
+Usage (from the squirrel service directory):
+    python -m pytest tests/test_roster_revalidation.py
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from squirrel.squirrels import FoolsballSquirrel
+from squirrel.utils.async_http import AsyncHttpClient
+from squirrel.utils.rate_limiter import RateLimiter
+
+
+class RosterUpstream:
+    """ESPN roster endpoint that honours If-None-Match."""
+    
+    def __init__(self):
+        self.version = 1
+        self.requests = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = f'"roster-{self.version}"'
+        if request.headers.get('If-None-Match') == etag:
+            return httpx.Response(304, headers={'ETag': etag})
+        athletes = [
+            {'id': f"{self.version}-{i}", 'fullName': f"Player {self.version}-{i}",
+             'position': {'abbreviation': 'WR'}}
+            for i in range(3)
+        ]
+        return httpx.Response(
+            200, json={'athletes': [{'items': athletes}]},
+            headers={'ETag': etag, 'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT'}
+        )
+
+
+@pytest.fixture
+def upstream():
+    return RosterUpstream()
+
+
+@pytest.fixture
+def squirrel(upstream):
+    squirrel = FoolsballSquirrel(source="espn", cache_enabled=False)
+    squirrel.async_http = AsyncHttpClient(retries=0, transport=httpx.MockTransport(upstream))
+    for host in list(squirrel.rate_limiters):
+        squirrel.rate_limiters[host] = RateLimiter(1000, 1)
+    yield squirrel
+    squirrel.close()
+
+
+def test_async_revalidation_200_304_200(squirrel, upstream):
+    async def revalidate():
+        first = await squirrel._afetch_team_roster('1')
+        unchanged = await squirrel._afetch_team_roster('1', first)
+        upstream.version = 2
+        changed = await squirrel._afetch_team_roster('1', unchanged)
+        await squirrel.async_http.aclose()
+        return first, unchanged, changed
+    
+    first, unchanged, changed = asyncio.run(revalidate())
+    
+    assert [player.id for player in first['players']] == ['1-0', '1-1', '1-2']
+    assert first['etag'] == '"roster-1"'
+    
+    # The 304 keeps the cached players and validators
+    assert upstream.requests[1].headers['If-None-Match'] == '"roster-1"'
+    assert upstream.requests[1].headers['If-Modified-Since'] == 'Sat, 17 Oct 2026 10:00:00 GMT'
+    assert unchanged['players'] is first['players']
+    assert unchanged['etag'] == '"roster-1"'
+    assert unchanged['digest'] == first['digest']
+    
+    # A new roster replaces players and validators
+    assert upstream.requests[2].headers['If-None-Match'] == '"roster-1"'
+    assert [player.id for player in changed['players']] == ['2-0', '2-1', '2-2']
+    assert changed['etag'] == '"roster-2"'
+    assert changed['digest'] != first['digest']
+    
+    cycle = squirrel.get_stats()['roster_refresh']['current']
+    assert cycle['checked'] == 2
+    assert cycle['not_modified'] == 1
+    assert cycle['changed'] == 1